@@ -0,0 +1,78 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark filling a ListField and a DictField item by item and in bulk.
+
+Each field is filled once with one ``append`` or ``__setitem__`` per item
+and once with a single ``extend`` or ``update``; the time taken and the
+number of history events recorded are reported for both.
+
+Run with ``python benchmarks/bench_bulk.py``.
+"""
+
+import time
+
+import lsst.pex.config as pexConfig
+
+NITEMS = 10000
+
+
+class ContainerConfig(pexConfig.Config):
+    d = pexConfig.DictField("dict", str, float, default={})
+    ll = pexConfig.ListField("list", float, default=[])
+
+
+def appendItems(config):
+    for i in range(NITEMS):
+        config.ll.append(float(i))
+
+
+def extendItems(config):
+    config.ll.extend(float(i) for i in range(NITEMS))
+
+
+def setItems(config):
+    for i in range(NITEMS):
+        config.d["key%d" % i] = float(i)
+
+
+def updateItems(config):
+    config.d.update(("key%d" % i, float(i)) for i in range(NITEMS))
+
+
+def measure(label, name, fill):
+    config = ContainerConfig()
+    start = time.perf_counter()
+    fill(config)
+    seconds = time.perf_counter() - start
+    assert len(getattr(config, name)) == NITEMS
+    print("%-20s %10.2f ms %8d history events" % (label, 1e3*seconds, len(config._history[name])))
+
+
+def main():
+    measure("ListField append", "ll", appendItems)
+    measure("ListField extend", "ll", extendItems)
+    measure("DictField setitem", "d", setItems)
+    measure("DictField update", "d", updateItems)
+
+
+if __name__ == "__main__":
+    main()
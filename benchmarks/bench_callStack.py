@@ -0,0 +1,96 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark the cost of capturing call stacks for config history.
+
+Compares the lazy `lsst.pex.config.callStack.getCallStack` against eagerly
+building a `~lsst.pex.config.callStack.StackFrame` for every frame (the
+behavior before `~lsst.pex.config.callStack.CallStack` was introduced), at a
+stack depth typical of a deep task hierarchy, and times constructing and
+modifying a config with many fields.
+
+Run with ``python benchmarks/bench_callStack.py``.
+"""
+
+import timeit
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.callStack import StackFrame, getCallerFrame, getCallStack
+
+DEPTH = 80
+NFIELDS = 200
+
+
+def getEagerCallStack(skip=0):
+    """Capture the call stack the way ``getCallStack`` used to.
+    """
+    frame = getCallerFrame(skip + 1)
+    stack = []
+    while frame:
+        stack.append(StackFrame.fromFrame(frame))
+        frame = frame.f_back
+    return list(reversed(stack))
+
+
+def atDepth(depth, func):
+    """Call ``func`` with ``depth`` extra frames on the stack.
+    """
+    if depth == 0:
+        return func()
+    return atDepth(depth - 1, func)
+
+
+BigConfig = type("BigConfig", (pexConfig.Config,),
+                 {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i))
+                  for i in range(NFIELDS)})
+
+
+def makeAndSet():
+    config = BigConfig()
+    for i in range(NFIELDS):
+        setattr(config, "f%d" % i, 0.5*i)
+    return config
+
+
+def report(label, seconds, number):
+    print("%-45s %10.2f us" % (label, 1e6*seconds/number))
+
+
+def main():
+    number = 2000
+    eager = atDepth(DEPTH, lambda: timeit.timeit(getEagerCallStack, number=number))
+    lazy = atDepth(DEPTH, lambda: timeit.timeit(getCallStack, number=number))
+    report("eager capture (depth %d)" % DEPTH, eager, number)
+    report("lazy capture (depth %d)" % DEPTH, lazy, number)
+    print("speedup: %.1fx" % (eager/lazy))
+
+    stack = atDepth(DEPTH, getCallStack)
+    materialize = timeit.timeit(lambda: list(stack.copy()), number=number)
+    report("materialize a lazy stack", materialize, number)
+
+    number = 20
+    seconds = atDepth(DEPTH, lambda: timeit.timeit(makeAndSet, number=number))
+    report("construct and set %d fields (depth %d)" % (NFIELDS, DEPTH), seconds, number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark saving a config with a registry field of many plugins.
+
+Only one plugin is selected and configured, as is typical for a task with a
+pluggable algorithm. The time to save a freshly constructed config and the
+size of the output are reported for a field that saves every plugin and for
+one that only saves the plugins that were used.
+
+Run with ``python benchmarks/bench_choice.py``.
+"""
+
+import io
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NPLUGINS = 50
+NFIELDS = 20
+
+registry = pexConfig.makeRegistry("Plugins")
+for i in range(NPLUGINS):
+    fields = {"f%d" % j: pexConfig.Field("Field %d" % j, float, default=float(j)) for j in range(NFIELDS)}
+    PluginConfig = type("Plugin%dConfig" % i, (pexConfig.Config,), fields)
+    registry.register("plugin%d" % i, type("Plugin%d" % i, (), {"ConfigClass": PluginConfig}))
+
+
+def save(ConfigClass):
+    config = ConfigClass()
+    config.plugin["plugin0"].f0 = 1.0
+    stream = io.StringIO()
+    config.saveToStream(stream)
+    return stream.getvalue()
+
+
+def measure(label, saveAll):
+    ConfigClass = type("TaskConfig", (pexConfig.Config,),
+                       {"plugin": registry.makeField("plugin", default="plugin0", saveAll=saveAll)})
+    number = 20
+    seconds = timeit.timeit(lambda: save(ConfigClass), number=number)
+    print("%-20s %10.2f ms %10.1f kB" % (label, 1e3*seconds/number, len(save(ConfigClass))/1024))
+
+
+def main():
+    measure("save all", True)
+    measure("save used", False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark compact config files against full ones.
+
+Builds a pipeline-like config of retargetable subtasks in which a few
+fields of each task differ from their defaults, then compares the size of
+the files written by `~lsst.pex.config.Config.saveToStream` with and
+without ``compact=True``, and the time taken to write them and to load them
+back with `~lsst.pex.config.Config.loadFromStream`.
+
+Run with ``python benchmarks/bench_compact.py``.
+"""
+
+import io
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 60
+NTASKS = 50
+NCHANGED = 3
+
+
+class LeafConfig(pexConfig.Config):
+    a = pexConfig.Field("The a parameter of the leaf algorithm.", float, default=1.0)
+    b = pexConfig.Field("The b parameter of the leaf algorithm.", int, default=2)
+    c = pexConfig.ListField("Coefficients of the leaf algorithm.", float,
+                            default=[float(i) for i in range(10)])
+
+
+fields = {"f%d" % i: pexConfig.Field("Parameter %d of the task, documented\nover two lines." % i,
+                                     float, default=float(i))
+          for i in range(NFIELDS)}
+fields["leaf"] = pexConfig.ConfigField("Configuration of the leaf algorithm.", LeafConfig)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+
+
+class Task:
+    ConfigClass = TaskConfig
+
+
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigurableField("Task %d" % i, target=Task)
+                       for i in range(NTASKS)})
+
+
+def makeConfig():
+    config = PipelineConfig()
+    for i in range(NTASKS):
+        task = getattr(config, "task%d" % i)
+        for j in range(NCHANGED):
+            setattr(task, "f%d" % j, -1.0)
+        task.leaf.c = [float(i)]*10
+    return config
+
+
+def report(label, seconds, number):
+    print("%-25s %10.1f ms" % (label, 1e3*seconds/number))
+
+
+def main():
+    number = 10
+    config = makeConfig()
+    texts = {}
+    for compact in (False, True):
+        label = "compact" if compact else "full"
+        stream = io.StringIO()
+        config.saveToStream(stream, compact=compact)
+        texts[label] = stream.getvalue()
+        print("%-25s %10.1f kB" % ("%s size" % label, len(texts[label])/1024))
+    for label, text in texts.items():
+        compact = label == "compact"
+        seconds = timeit.timeit(lambda: config.saveToStream(io.StringIO(), compact=compact), number=number)
+        report("save %s" % label, seconds, number)
+    for label, text in texts.items():
+        targets = iter([PipelineConfig() for _ in range(number)])
+        seconds = timeit.timeit(lambda: next(targets).loadFromStream(text), number=number)
+        report("load %s" % label, seconds, number)
+    loaded = PipelineConfig()
+    loaded.loadFromStream(texts["compact"])
+    assert pexConfig.compareConfigs("compact", config, loaded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark comparing configs with thousands of floating-point values.
+
+Times `~lsst.pex.config.Config.compare` on two equal configs with many
+scalar float fields, and on a long float `~lsst.pex.config.ListField` and
+`~lsst.pex.config.DictField`. For reference, it also times the same scalar
+comparisons made with one `numpy.allclose` call per value.
+
+Run with ``python benchmarks/bench_compare.py``.
+"""
+
+import timeit
+
+import numpy
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 5000
+NITEMS = 10000
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+ScalarConfig = type("ScalarConfig", (pexConfig.Config,), fields)
+
+
+class ContainerConfig(pexConfig.Config):
+    ll = pexConfig.ListField("list", float, default=[float(i) for i in range(NITEMS)])
+    d = pexConfig.DictField("dict", str, float, default={"k%d" % i: float(i) for i in range(NITEMS)})
+
+
+def report(label, seconds, number):
+    print("%-40s %10.2f ms" % (label, 1e3*seconds/number))
+
+
+def main():
+    number = 10
+    scalar1 = ScalarConfig()
+    scalar2 = ScalarConfig()
+    values = [float(i) for i in range(NFIELDS)]
+
+    def numpyScalars():
+        for v in values:
+            numpy.allclose(v, v, rtol=1E-8, atol=1E-8) or (numpy.isnan(v) and numpy.isnan(v))
+
+    container1 = ContainerConfig()
+    container2 = ContainerConfig()
+    report("compare %d float fields" % NFIELDS,
+           timeit.timeit(lambda: scalar1.compare(scalar2), number=number), number)
+    report("numpy.allclose per value (reference)", timeit.timeit(numpyScalars, number=number), number)
+    report("compare %d-item list and dict" % NITEMS,
+           timeit.timeit(lambda: container1.compare(container2), number=number), number)
+
+
+if __name__ == "__main__":
+    main()
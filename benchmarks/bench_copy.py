@@ -0,0 +1,81 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark making per-dataset variants of a frozen pipeline-like config.
+
+Each variant changes one field of one task. Variants are made by
+re-instantiating the config and updating it from the base, and with
+`~lsst.pex.config.Config.copy`; the time per variant and the memory held by
+100 variants are reported.
+
+Run with ``python benchmarks/bench_copy.py``.
+"""
+
+import timeit
+import tracemalloc
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 60
+NTASKS = 50
+NVARIANTS = 100
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+fields["l"] = pexConfig.ListField("l", float, default=[0.0]*10)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigField("Task %d" % i, dtype=TaskConfig)
+                       for i in range(NTASKS)})
+
+
+def updateVariant(base, n):
+    config = PipelineConfig()
+    config.update(**base._storage)
+    config.task0.f0 = float(n)
+    return config
+
+
+def copyVariant(base, n):
+    config = base.copy()
+    config.task0.f0 = float(n)
+    return config
+
+
+def measure(label, makeVariant, base):
+    number = 20
+    seconds = timeit.timeit(lambda: makeVariant(base, 0), number=number)
+    tracemalloc.start()
+    variants = [makeVariant(base, n) for n in range(NVARIANTS)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert variants[-1].task0.f0 == NVARIANTS - 1 and variants[-1].task1 == base.task1
+    print("%-30s %10.2f ms %10.1f kB per variant" % (label, 1e3*seconds/number, size/NVARIANTS/1024))
+
+
+def main():
+    base = PipelineConfig()
+    base.freeze()
+    measure("re-instantiate and update", updateVariant, base)
+    measure("copy", copyVariant, base)
+
+
+if __name__ == "__main__":
+    main()
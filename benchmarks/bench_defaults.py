@@ -0,0 +1,83 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark instantiating configs from the cached defaults template.
+
+Compares creating configs when the class's defaults template is available
+with creating them when it has to be rebuilt each time (equivalent to
+setting every default with ``Field.__set__``, as was always done before the
+template was introduced).
+
+Run with ``python benchmarks/bench_defaults.py``.
+"""
+
+import timeit
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.history import historyLimit
+
+NFIELDS = 100
+
+
+class LeafConfig(pexConfig.Config):
+    a = pexConfig.Field("a", float, default=1.0)
+    b = pexConfig.Field("b", int, default=2)
+    c = pexConfig.ListField("c", float, default=[float(i) for i in range(50)])
+    d = pexConfig.DictField("d", str, float, default={str(i): float(i) for i in range(50)})
+
+
+class LeafTask:
+    ConfigClass = LeafConfig
+
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+fields.update({"sub%d" % i: pexConfig.ConfigurableField("Subtask %d" % i, target=LeafTask)
+               for i in range(5)})
+fields["leaf"] = pexConfig.ConfigField("leaf", LeafConfig)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+
+
+def makeWithoutTemplate():
+    TaskConfig._defaultsTemplate = None
+    LeafConfig._defaultsTemplate = None
+    return TaskConfig()
+
+
+def report(label, seconds, number):
+    print("%-40s %10.1f us" % (label, 1e6*seconds/number))
+
+
+def main():
+    number = 200
+    for limit in (None, 0):
+        with historyLimit(limit):
+            slow = timeit.timeit(makeWithoutTemplate, number=number)
+            TaskConfig()
+            fast = timeit.timeit(TaskConfig, number=number)
+        name = "full" if limit is None else "off"
+        report("without template (history %s)" % name, slow, number)
+        report("with template (history %s)" % name, fast, number)
+        print("speedup: %.1fx" % (slow/fast))
+
+
+if __name__ == "__main__":
+    main()
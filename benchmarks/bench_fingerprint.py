@@ -0,0 +1,71 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark comparing large configs with and without fingerprints.
+
+Compares ``==`` and `~lsst.pex.config.Config.compare` on two identical
+pipeline-like configs before they are frozen (every field is compared) and
+after (their cached fingerprints match).
+
+Run with ``python benchmarks/bench_fingerprint.py``.
+"""
+
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 60
+NTASKS = 50
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+fields["l"] = pexConfig.ListField("l", float, default=[0.0]*10)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigField("Task %d" % i, dtype=TaskConfig)
+                       for i in range(NTASKS)})
+
+
+def report(label, seconds, number):
+    print("%-40s %10.1f us" % (label, 1e6*seconds/number))
+
+
+def main():
+    number = 20
+    config1 = PipelineConfig()
+    config2 = PipelineConfig()
+    eqSlow = timeit.timeit(lambda: config1 == config2, number=number)
+    compareSlow = timeit.timeit(lambda: config1.compare(config2), number=number)
+    config1.freeze()
+    config2.freeze()
+    first = timeit.timeit(config1.fingerprint, number=1)
+    config2.fingerprint()
+    eqFast = timeit.timeit(lambda: config1 == config2, number=number)
+    compareFast = timeit.timeit(lambda: config1.compare(config2), number=number)
+    report("== (unfrozen)", eqSlow, number)
+    report("== (frozen, fingerprints)", eqFast, number)
+    report("compare (unfrozen)", compareSlow, number)
+    report("compare (frozen, fingerprints)", compareFast, number)
+    report("first fingerprint", first, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark freezing many configs with a registry field.
+
+Each frozen config used to replace the field's typemap by a deep copy of the
+registry; it now takes a read-only snapshot once. The time per freeze is
+reported for the snapshot and, for reference, for a deep copy of the
+registry.
+
+Run with ``python benchmarks/bench_freeze.py``.
+"""
+
+import copy
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NPLUGINS = 200
+NCONFIGS = 2000
+
+registry = pexConfig.makeRegistry("Plugins")
+for i in range(NPLUGINS):
+    PluginConfig = type("Plugin%dConfig" % i, (pexConfig.Config,),
+                        {"f": pexConfig.Field("Field", float, default=1.0)})
+    registry.register("plugin%d" % i, type("Plugin%d" % i, (), {"ConfigClass": PluginConfig}))
+
+TaskConfig = type("TaskConfig", (pexConfig.Config,),
+                  {"plugin": registry.makeField("plugin", default="plugin0")})
+
+
+def main():
+    typemap = TaskConfig.plugin.typemap
+    configs = [TaskConfig() for _ in range(NCONFIGS)]
+    seconds = timeit.timeit(lambda: [config.freeze() for config in configs], number=1)
+    print("%-20s %10.2f us per config" % ("snapshot", 1e6*seconds/NCONFIGS))
+    number = 20
+    seconds = timeit.timeit(lambda: copy.deepcopy(typemap), number=number)
+    print("%-20s %10.2f us per config" % ("deep copy", 1e6*seconds/number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the history of a DictField and a ListField filled item by item.
+
+The time to fill each field and the memory held by its history are
+reported, together with the memory that the history takes when the value
+after every change is rebuilt from it, as it used to be stored.
+
+Run with ``python benchmarks/bench_history.py``.
+"""
+
+import time
+import tracemalloc
+
+import lsst.pex.config as pexConfig
+
+NITEMS = 2000
+
+
+class ContainerConfig(pexConfig.Config):
+    d = pexConfig.DictField("dict", str, float, default={})
+    ll = pexConfig.ListField("list", float, default=[])
+
+
+def fillDict(config):
+    for i in range(NITEMS):
+        config.d["key%d" % i] = float(i)
+
+
+def fillList(config):
+    for i in range(NITEMS):
+        config.ll.append(float(i))
+
+
+def measure(label, name, fill):
+    config = ContainerConfig()
+    tracemalloc.start()
+    start = time.perf_counter()
+    fill(config)
+    seconds = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    replayed = config.history[name]
+    replayedSize = tracemalloc.get_traced_memory()[0] - size
+    tracemalloc.stop()
+    assert len(replayed) == NITEMS + 1
+    print("%-10s %10.2f ms %10.1f kB history %10.1f kB as copies" %
+          (label, 1e3*seconds, size/1024, replayedSize/1024))
+
+
+def main():
+    measure("DictField", "d", fillDict)
+    measure("ListField", "ll", fillList)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the time taken by ``import lsst.pex.config``.
+
+Each measurement runs a fresh interpreter, so the result includes all of the
+package's imports. The interpreter start-up time alone is reported for
+reference, along with the heavy optional modules the import pulled in.
+
+Run with ``python benchmarks/bench_import.py``.
+"""
+
+import subprocess
+import sys
+import time
+
+HEAVY = ("numpy", "deprecated", "lsst.pex.config.convert")
+
+
+def run(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - start
+
+
+def best(code, repeat=10):
+    return min(run(code) for _ in range(repeat))
+
+
+def main():
+    baseline = best("pass")
+    imported = best("import lsst.pex.config")
+    result = subprocess.run([sys.executable, "-c",
+                             "import sys, lsst.pex.config\n"
+                             "print(' '.join(m for m in %r if m in sys.modules))" % (HEAVY,)],
+                            check=True, stdout=subprocess.PIPE, universal_newlines=True)
+    print("%-40s %10.1f ms" % ("interpreter start-up", 1e3*baseline))
+    print("%-40s %10.1f ms" % ("import lsst.pex.config", 1e3*(imported - baseline)))
+    print("%-40s %s" % ("heavy modules loaded", result.stdout.strip() or "none"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark loading the same override file repeatedly with `Config.load`.
+
+Compares loading with the process-wide compiled-code cache against
+compiling the file on every load, as was done before the cache existed.
+
+Run with ``python benchmarks/bench_load.py``.
+"""
+
+import os
+import tempfile
+import timeit
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.history import historyLimit
+
+NFIELDS = 200
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=0.0) for i in range(NFIELDS)}
+OverrideConfig = type("OverrideConfig", (pexConfig.Config,), fields)
+
+
+def loadUncached(config, filename):
+    with open(filename, "r") as f:
+        code = compile(f.read(), filename=filename, mode="exec")
+    config.loadFromStream(code)
+
+
+def report(label, seconds, number):
+    print("%-40s %10.1f us" % (label, 1e6*seconds/number))
+
+
+def main():
+    number = 200
+    config = OverrideConfig()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "override.py")
+        with open(filename, "w") as f:
+            for i in range(NFIELDS):
+                f.write("# Override %d\nconfig.f%d = %r\n" % (i, i, float(i)))
+        with historyLimit(0):
+            slow = timeit.timeit(lambda: loadUncached(config, filename), number=number)
+            fast = timeit.timeit(lambda: config.load(filename), number=number)
+    cache = pexConfig.getCodeCache()
+    report("compile every load", slow, number)
+    report("cached load", fast, number)
+    print("speedup: %.1fx (hits=%d, misses=%d)" % (slow/fast, cache.hits, cache.misses))
+
+
+if __name__ == "__main__":
+    main()
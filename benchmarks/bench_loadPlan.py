@@ -0,0 +1,108 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark loading override files from a plan against executing them.
+
+Saves a pipeline-like config of retargetable subtasks to full and compact
+override files, then compares `~lsst.pex.config.Config.load`, which applies
+the cached `~lsst.pex.config.overridePlan.OverridePlan` of each file, with
+executing the same cached code through
+`~lsst.pex.config.Config.loadFromStream`.
+
+Run with ``python benchmarks/bench_loadPlan.py``.
+"""
+
+import os
+import tempfile
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 60
+NTASKS = 50
+NCHANGED = 3
+
+
+class LeafConfig(pexConfig.Config):
+    a = pexConfig.Field("The a parameter of the leaf algorithm.", float, default=1.0)
+    b = pexConfig.Field("The b parameter of the leaf algorithm.", int, default=2)
+    c = pexConfig.ListField("Coefficients of the leaf algorithm.", float,
+                            default=[float(i) for i in range(10)])
+
+
+fields = {"f%d" % i: pexConfig.Field("Parameter %d of the task." % i, float, default=float(i))
+          for i in range(NFIELDS)}
+fields["leaf"] = pexConfig.ConfigField("Configuration of the leaf algorithm.", LeafConfig)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+
+
+class Task:
+    ConfigClass = TaskConfig
+
+
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigurableField("Task %d" % i, target=Task)
+                       for i in range(NTASKS)})
+
+
+def makeConfig():
+    config = PipelineConfig()
+    for i in range(NTASKS):
+        task = getattr(config, "task%d" % i)
+        for j in range(NCHANGED):
+            setattr(task, "f%d" % j, -1.0)
+        task.leaf.c = [float(i)]*10
+    return config
+
+
+def report(label, seconds, number):
+    print("%-25s %10.1f ms" % (label, 1e3*seconds/number))
+
+
+def main():
+    number = 10
+    config = makeConfig()
+    cache = pexConfig.getCodeCache()
+    with tempfile.TemporaryDirectory() as directory:
+        for compact in (False, True):
+            label = "compact" if compact else "full"
+            filename = os.path.join(directory, label + ".py")
+            config.save(filename, compact=compact)
+            assert cache.getPlan(filename).canApply("config")
+
+            targets = iter([PipelineConfig() for _ in range(number)])
+            seconds = timeit.timeit(lambda: next(targets).loadFromStream(cache.getCode(filename)),
+                                    number=number)
+            report("exec %s" % label, seconds, number)
+            targets = iter([PipelineConfig() for _ in range(number)])
+            seconds = timeit.timeit(lambda: next(targets).load(filename), number=number)
+            report("plan %s" % label, seconds, number)
+
+            executed = PipelineConfig()
+            executed.loadFromStream(cache.getCode(filename))
+            loaded = PipelineConfig()
+            loaded.load(filename)
+            assert pexConfig.compareConfigs(label, executed, loaded)
+            assert loaded.task0.history["f0"][-1][1][-1].filename == filename
+
+
+if __name__ == "__main__":
+    main()
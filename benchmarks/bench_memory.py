@@ -0,0 +1,79 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the memory held by live config instances.
+
+Reports the bytes allocated per instance for a flat config of scalar
+fields, a config with list and dict fields, and a nested config, with
+history recorded as usual and with history disabled.
+
+Run with ``python benchmarks/bench_memory.py``.
+"""
+
+import tracemalloc
+
+import lsst.pex.config as pexConfig
+
+NCONFIGS = 1000
+
+
+class ScalarConfig(pexConfig.Config):
+    i = pexConfig.Field("integer", int, default=1)
+    f = pexConfig.Field("float", float, default=2.0)
+    s = pexConfig.Field("string", str, default="value")
+    b = pexConfig.Field("bool", bool, default=True)
+    c = pexConfig.ChoiceField("choice", str, default="a", allowed={"a": "A", "b": "B"})
+    r = pexConfig.RangeField("range", float, default=0.5, min=0.0, max=1.0)
+
+
+class ContainerConfig(ScalarConfig):
+    ll = pexConfig.ListField("list", float, default=[1.0, 2.0, 3.0])
+    d = pexConfig.DictField("dict", str, int, default={"a": 1, "b": 2})
+
+
+class NestedConfig(ContainerConfig):
+    inner = pexConfig.ConfigField("inner", ContainerConfig)
+    choice = pexConfig.ConfigChoiceField("choice", typemap={"scalar": ScalarConfig,
+                                                            "container": ContainerConfig},
+                                         default="scalar")
+
+
+def measure(ConfigClass):
+    ConfigClass()
+    tracemalloc.start()
+    configs = [ConfigClass() for _ in range(NCONFIGS)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del configs
+    return size/NCONFIGS
+
+
+def main():
+    print("%-20s %15s %15s" % ("bytes per config", "with history", "no history"))
+    for ConfigClass in (ScalarConfig, ContainerConfig, NestedConfig):
+        withHistory = measure(ConfigClass)
+        with pexConfig.history.historyLimit(0):
+            noHistory = measure(ConfigClass)
+        print("%-20s %15.0f %15.0f" % (ConfigClass.__name__, withHistory, noHistory))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark long lists of floats in a ListField and a NumericListField.
+
+The time to assign, copy and compare 10000 items, and to save and load the
+config, is reported for each field type.
+
+Run with ``python benchmarks/bench_numericList.py``.
+"""
+
+import io
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NITEMS = 10000
+
+
+class ListConfig(pexConfig.Config):
+    values = pexConfig.ListField("values", float, default=[], itemCheck=lambda x: x >= 0)
+
+
+class NumericConfig(pexConfig.Config):
+    values = pexConfig.NumericListField("values", float, default=[], itemCheck=lambda x: x >= 0)
+
+
+def measure(label, ConfigClass):
+    values = [float(i) for i in range(NITEMS)]
+    config = ConfigClass()
+    other = ConfigClass()
+    other.values = values
+
+    def assign():
+        config.values = values
+
+    def save():
+        stream = io.StringIO()
+        config.saveToStream(stream)
+        ConfigClass().loadFromStream(stream.getvalue())
+
+    number = 10
+    print(label)
+    for name, func in (("assign", assign),
+                       ("slice assignment", lambda: config.values.__setitem__(slice(0, 10), values[:10])),
+                       ("copy", lambda: config.copy()),
+                       ("compare", lambda: config.compare(other)),
+                       ("save and load", save)):
+        seconds = timeit.timeit(func, number=number)
+        print("    %-20s %10.2f ms" % (name, 1e3*seconds/number))
+
+
+def main():
+    measure("ListField", ListConfig)
+    measure("NumericListField", NumericConfig)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark pickling configs, as done when shipping them to worker
+processes.
+
+Compares a pickle round trip of a pipeline-like config using the structured
+reduction with the previous reduction, which saved the config as Python code
+and executed it into a fresh instance.
+
+Run with ``python benchmarks/bench_pickle.py``.
+"""
+
+import io
+import pickle
+import timeit
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.config import unreduceConfig
+
+NFIELDS = 60
+NTASKS = 50
+
+
+class LeafConfig(pexConfig.Config):
+    a = pexConfig.Field("a", float, default=1.0)
+    b = pexConfig.Field("b", int, default=2)
+    c = pexConfig.ListField("c", float, default=[float(i) for i in range(10)])
+    d = pexConfig.DictField("d", str, float, default={str(i): float(i) for i in range(10)})
+
+
+class LeafTask:
+    ConfigClass = LeafConfig
+
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+fields["leaf"] = pexConfig.ConfigField("leaf", LeafConfig)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+
+
+class Task:
+    ConfigClass = TaskConfig
+
+
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigurableField("Task %d" % i, target=Task)
+                       for i in range(NTASKS)})
+
+
+def makeConfig():
+    config = PipelineConfig()
+    for i in range(NTASKS):
+        task = getattr(config, "task%d" % i)
+        for j in range(0, NFIELDS, 2):
+            setattr(task, "f%d" % j, float(i + j))
+    return config
+
+
+def execRoundTrip(config):
+    """Round trip through the previous, exec-based, reduction.
+    """
+    stream = io.StringIO()
+    config.saveToStream(stream)
+    func, args = unreduceConfig, (type(config), stream.getvalue().encode())
+    return func(*pickle.loads(pickle.dumps(args)))
+
+
+def report(label, seconds, number):
+    print("%-40s %10.1f ms" % (label, 1e3*seconds/number))
+
+
+def main():
+    number = 10
+    config = makeConfig()
+    print("fields:", len(config.names()))
+    slow = timeit.timeit(lambda: execRoundTrip(config), number=number)
+    fast = timeit.timeit(lambda: pickle.loads(pickle.dumps(config)), number=number)
+    report("exec reduction", slow, number)
+    report("structured reduction", fast, number)
+    print("speedup: %.1fx" % (slow/fast))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark populating a registry with many plugin modules.
+
+Plugins are either imported and registered, or registered by name so that
+only the two that are selected are imported. The time to populate the
+registry and create a config selecting two plugins is reported.
+
+Run with ``python benchmarks/bench_registry.py``.
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import lsst.pex.config as pexConfig
+
+NPLUGINS = 200
+NFIELDS = 20
+
+FIELDS = "\n".join("    f%d = pexConfig.Field('Field %d', float, default=%d.0)" % (i, i, i)
+                   for i in range(NFIELDS))
+PLUGIN = """
+import lsst.pex.config as pexConfig
+
+class PluginConfig(pexConfig.Config):
+%s
+
+class Plugin:
+    ConfigClass = PluginConfig
+""" % FIELDS
+
+
+def populate(prefix, deferred):
+    registry = pexConfig.makeRegistry("Plugins")
+    for i in range(NPLUGINS):
+        name = "%s%d.Plugin" % (prefix, i)
+        if deferred:
+            registry.register("plugin%d" % i, name)
+        else:
+            module = importlib.import_module("%s%d" % (prefix, i))
+            registry.register("plugin%d" % i, module.Plugin)
+    TaskConfig = type("TaskConfig", (pexConfig.Config,),
+                      {"plugins": registry.makeField("plugins", multi=True, default=["plugin0", "plugin1"])})
+    config = TaskConfig()
+    config.validate()
+
+
+def measure(label, prefix, deferred):
+    start = time.perf_counter()
+    populate(prefix, deferred)
+    seconds = time.perf_counter() - start
+    imported = sum(name.startswith(prefix) for name in sys.modules)
+    print("%-20s %10.2f ms %6d modules imported" % (label, 1e3*seconds, imported))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tempDir:
+        for prefix in ("eagerPlugin", "deferredPlugin"):
+            for i in range(NPLUGINS):
+                with open(os.path.join(tempDir, "%s%d.py" % (prefix, i)), "w") as f:
+                    f.write(PLUGIN)
+        sys.path.insert(0, tempDir)
+        measure("import all", "eagerPlugin", False)
+        measure("register by name", "deferredPlugin", True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark saving a config made of many small nested subconfigs.
+
+Builds a pipeline-like tree of subconfigs (config fields, retargetable
+subtasks, choice fields and config dicts) a few levels deep and times
+`~lsst.pex.config.Config.saveToStream`, whose cost for such trees is
+dominated by the traversals rather than by formatting the values.
+
+Run with ``python benchmarks/bench_save.py``.
+"""
+
+import io
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NTASKS = 200
+
+
+class LeafConfig(pexConfig.Config):
+    a = pexConfig.Field("a", float, default=1.0)
+    b = pexConfig.Field("b", int, default=2)
+
+
+class LeafTask:
+    ConfigClass = LeafConfig
+
+
+class MiddleConfig(pexConfig.Config):
+    x = pexConfig.ConfigField("x", LeafConfig)
+    y = pexConfig.ConfigurableField("y", target=LeafTask)
+    z = pexConfig.ConfigChoiceField("z", typemap={"leaf": LeafConfig}, default="leaf")
+
+
+class TaskConfig(pexConfig.Config):
+    m = pexConfig.ConfigField("m", MiddleConfig)
+    n = pexConfig.ConfigDictField("n", str, MiddleConfig, default={})
+
+
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigField("task %d" % i, TaskConfig)
+                       for i in range(NTASKS)})
+
+
+def makeConfig():
+    config = PipelineConfig()
+    for i in range(NTASKS):
+        getattr(config, "task%d" % i).n = {"a": MiddleConfig(), "b": MiddleConfig()}
+    return config
+
+
+def main():
+    config = makeConfig()
+    stream = io.StringIO()
+    config.saveToStream(stream)
+    nAssignments = stream.getvalue().count("\n")
+    number = 5
+    seconds = timeit.timeit(lambda: config.saveToStream(io.StringIO()), number=number)
+    print("saveToStream (%d lines): %.1f ms" % (nAssignments, 1e3*seconds/number))
+
+
+if __name__ == "__main__":
+    main()
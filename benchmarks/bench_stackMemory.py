@@ -0,0 +1,98 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark the memory held by the call stacks recorded in config history.
+
+Many configs with many fields are built and modified at a stack depth
+typical of a task hierarchy, and the memory they hold is reported with
+history recorded and with history disabled, the difference being the
+cost of the history. It is measured again after the history of every
+field has been formatted, which requires the stacks to be interpreted.
+
+Run with ``python benchmarks/bench_stackMemory.py``.
+"""
+
+import time
+import tracemalloc
+
+import lsst.pex.config as pexConfig
+
+DEPTH = 40
+NFIELDS = 100
+NCONFIGS = 50
+
+BigConfig = type("BigConfig", (pexConfig.Config,),
+                 {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i))
+                  for i in range(NFIELDS)})
+
+
+def atDepth(depth, func):
+    """Call ``func`` with ``depth`` extra frames on the stack.
+    """
+    if depth == 0:
+        return func()
+    return atDepth(depth - 1, func)
+
+
+def makeConfigs():
+    configs = []
+    for _ in range(NCONFIGS):
+        config = BigConfig()
+        for i in range(NFIELDS):
+            setattr(config, "f%d" % i, 0.5*i)
+        configs.append(config)
+    return configs
+
+
+def formatAll(configs):
+    for config in configs:
+        for name in config._fields:
+            config.formatHistory(name)
+
+
+def measure(limit):
+    atDepth(DEPTH, makeConfigs)
+    with pexConfig.history.historyLimit(limit):
+        tracemalloc.start()
+        start = time.perf_counter()
+        configs = atDepth(DEPTH, makeConfigs)
+        seconds = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        formatAll(configs)
+        formatted = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    return seconds, size, formatted
+
+
+def main():
+    seconds, size, formatted = measure(None)
+    noHistory = measure(0)[1]
+    nEvents = 2*NFIELDS*NCONFIGS
+    print("%d configs of %d fields at depth %d: %.1f ms" % (NCONFIGS, NFIELDS, DEPTH, 1e3*seconds))
+    print("%-30s %10.1f kB" % ("configs without history", noHistory/1024))
+    print("%-30s %10.1f kB %8.0f B/event" % ("history", (size - noHistory)/1024,
+                                             (size - noHistory)/nEvents))
+    print("%-30s %10.1f kB %8.0f B/event" % ("history after formatting", (formatted - noHistory)/1024,
+                                             (formatted - noHistory)/nEvents))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Benchmark applying thousands of overrides to a pipeline-like config.
+
+Compares setting every override by attribute assignment, as an override
+file does, with a single `~lsst.pex.config.Config.bulkUpdate` of dotted
+names.
+
+Run with ``python benchmarks/bench_update.py``.
+"""
+
+import functools
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 60
+NTASKS = 50
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigField("Task %d" % i, dtype=TaskConfig)
+                       for i in range(NTASKS)})
+
+OVERRIDES = {"task%d.f%d" % (t, i): float(t + i) for t in range(NTASKS) for i in range(NFIELDS)}
+
+
+def assign(config):
+    for name, value in OVERRIDES.items():
+        path, _, field = name.rpartition(".")
+        setattr(functools.reduce(getattr, path.split("."), config), field, value)
+
+
+def report(label, seconds, number):
+    print("%-40s %10.2f ms" % (label, 1e3*seconds/number))
+
+
+def main():
+    number = 10
+    config = PipelineConfig()
+    print("%d overrides" % len(OVERRIDES))
+    report("attribute assignment", timeit.timeit(lambda: assign(config), number=number), number)
+    report("bulkUpdate", timeit.timeit(lambda: config.bulkUpdate(OVERRIDES), number=number), number)
+    check = PipelineConfig()
+    assign(check)
+    assert check == config
+
+
+if __name__ == "__main__":
+    main()
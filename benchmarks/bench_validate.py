@@ -0,0 +1,75 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Benchmark repeated validation of a large config.
+
+Compares a forced full validation of a pipeline-like config with validating
+it again after changing a single field, when only the modified task config
+(and its parents) are checked again.
+
+Run with ``python benchmarks/bench_validate.py``.
+"""
+
+import timeit
+
+import lsst.pex.config as pexConfig
+
+NFIELDS = 60
+NTASKS = 50
+
+fields = {"f%d" % i: pexConfig.Field("Field %d" % i, float, default=float(i)) for i in range(NFIELDS)}
+fields["l"] = pexConfig.ListField("l", float, default=[0.0]*10, maxLength=20)
+TaskConfig = type("TaskConfig", (pexConfig.Config,), fields)
+
+
+class Task:
+    ConfigClass = TaskConfig
+
+
+PipelineConfig = type("PipelineConfig", (pexConfig.Config,),
+                      {"task%d" % i: pexConfig.ConfigurableField("Task %d" % i, target=Task)
+                       for i in range(NTASKS)})
+
+
+def report(label, seconds, number):
+    print("%-40s %10.1f us" % (label, 1e6*seconds/number))
+
+
+def main():
+    number = 100
+    config = PipelineConfig()
+    full = timeit.timeit(lambda: config.validate(force=True), number=number)
+
+    def modifyAndValidate():
+        config.task7.f3 += 1.0
+        config.validate()
+
+    incremental = timeit.timeit(modifyAndValidate, number=number)
+    unchanged = timeit.timeit(config.validate, number=number)
+    report("full validation", full, number)
+    report("after modifying one field", incremental, number)
+    report("unchanged", unchanged, number)
+    print("speedup: %.1fx (modified), %.1fx (unchanged)" % (full/incremental, full/unchanged))
+
+
+if __name__ == "__main__":
+    main()
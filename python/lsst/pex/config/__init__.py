@@ -21,15 +21,41 @@
 
 from .comparison import *
 from .config import *
+from .codeCache import *
 from .rangeField import *
 from .choiceField import *
 from .listField import *
+from .numericListField import *
 from .dictField import *
 from .configField import *
 from .configChoiceField import *
 from .configurableField import *
 from .configDictField import *
-from .convert import *
 from .wrap import *
 from .registry import *
 from .version import *
+
+import importlib as _importlib
+
+# Names provided by submodules that are only imported when first used,
+# because their dependencies are expensive to import.
+_lazyAttributes = {
+    "makePropertySet": ".convert",
+    "makePolicy": ".convert",
+}
+
+__all__ = [_name for _name in globals() if not _name.startswith("_")] + list(_lazyAttributes)
+
+
+def __getattr__(name):
+    try:
+        moduleName = _lazyAttributes[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name)) from None
+    value = getattr(_importlib.import_module(moduleName, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazyAttributes))
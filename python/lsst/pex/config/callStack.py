@@ -19,10 +19,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-__all__ = ['getCallerFrame', 'getStackFrame', 'StackFrame', 'getCallStack']
+__all__ = ['getCallerFrame', 'getStackFrame', 'StackFrame', 'CallStack', 'getCallStack']
 
+import collections.abc
 import inspect
 import linecache
+import threading
+import weakref
 
 
 def getCallerFrame(relative=0):
@@ -165,6 +168,241 @@ class StackFrame:
         return result
 
 
+class _StackNode:
+    """A frame in the interned tree of captured call stacks.
+
+    Parameters
+    ----------
+    filename : `str`
+        Name of file containing the code being executed.
+    lineno : `int`
+        Line number of file being executed.
+    function : `str`
+        Function name being executed.
+    parent : `_StackNode` or `None`
+        Node for the calling frame, or `None` for the outermost frame.
+    frame : `StackFrame`, optional
+        Frame to return from `frame`; created on demand if not provided.
+
+    Notes
+    -----
+    Nodes are created by `_intern`, so there is a single node for each
+    distinct ``(filename, lineno, function, parent)``, and every stack
+    passing through the same frames shares the same nodes and the same
+    `StackFrame` objects. A node is only kept while a stack uses it.
+    """
+
+    __slots__ = ("filename", "lineno", "function", "parent", "depth", "_frame", "__weakref__")
+
+    def __init__(self, filename, lineno, function, parent, frame=None):
+        self.filename = filename
+        self.lineno = lineno
+        self.function = function
+        self.parent = parent
+        self.depth = 1 if parent is None else parent.depth + 1
+        self._frame = frame
+
+    @property
+    def frame(self):
+        """Stack frame for this node (created on demand) (`StackFrame`).
+        """
+        if self._frame is None:
+            self._frame = StackFrame(self.filename, self.lineno, self.function)
+        return self._frame
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+_stackNodes = weakref.WeakValueDictionary()
+"""Interned stack nodes, keyed by ``(filename, lineno, function, parent)``
+(`weakref.WeakValueDictionary`).
+
+Nodes are removed once no stack uses them, so the table does not grow with
+the number of stacks ever captured.
+"""
+
+_stackNodesLock = threading.Lock()
+"""Lock held while looking up and adding nodes in `_stackNodes`
+(`threading.Lock`).
+"""
+
+_lastCaptures = threading.local()
+"""The code object, line number and node of each frame of the most recent
+stack captured by `getCallStack` in each thread, ordered with the outermost
+frame first, as the ``capture`` attribute (`list` of `tuple`).
+"""
+
+
+def _intern(parent, frames):
+    """Extend a stack with frames, reusing existing nodes where possible.
+
+    Parameters
+    ----------
+    parent : `_StackNode` or `None`
+        Node for the most recent frame of the stack to extend, or `None` to
+        start a new stack.
+    frames : iterable of `StackFrame` or `_StackNode`
+        Frames to add, ordered with the most recent frame last.
+
+    Returns
+    -------
+    node : `_StackNode` or `None`
+        Node for the most recent frame of the extended stack.
+    """
+    with _stackNodesLock:
+        for frame in frames:
+            key = (frame.filename, frame.lineno, frame.function, parent)
+            node = _stackNodes.get(key)
+            if node is None:
+                if isinstance(frame, _StackNode):
+                    frame = frame._frame
+                node = _stackNodes[key] = _StackNode(*key, frame)
+            parent = node
+    return parent
+
+
+class CallStack(collections.abc.MutableSequence):
+    """A call stack that is captured cheaply and shared between history
+    events.
+
+    Parameters
+    ----------
+    frames : iterable of `StackFrame`, optional
+        Frames of the stack, ordered with the most recent frame last.
+
+    Notes
+    -----
+    Capturing a stack with `getCallStack` happens every time a field is set,
+    and most stacks recorded in a config's history share long common
+    prefixes (the driver script, task constructors, `Config.__new__`...).
+    Frames are therefore stored as nodes of an interned tree in which each
+    node points to its caller, with one node for each distinct
+    ``(filename, lineno, function, parent)``; a ``CallStack`` only holds a
+    reference to the node for its most recent frame. The `StackFrame` for
+    each node is only built the first time a stack through it is
+    inspected (for example by `lsst.pex.config.history.format`), and is
+    then shared by every stack through that node.
+
+    ``CallStack`` behaves like the `list` of `StackFrame` that
+    `getCallStack` used to return, ordered with the most recent frame last.
+    Adding frames at the end (with ``+``, ``+=`` or `append`) reuses the
+    existing nodes; other modifications rebuild the path from the first
+    modified frame.
+
+    Nodes are interned in a `weakref.WeakValueDictionary`, so a node is freed
+    once no stack uses it (apart from the most recent capture in each
+    thread, which is kept to speed up the next one). The memory they use is
+    bounded by the number of distinct call paths of the stacks still held.
+    """
+
+    __slots__ = ("_node",)
+
+    def __init__(self, frames=()):
+        self._node = _intern(None, frames)
+
+    @classmethod
+    def _fromNode(cls, node):
+        """Construct a stack ending at an interned node.
+        """
+        stack = object.__new__(cls)
+        stack._node = node
+        return stack
+
+    def _nodes(self):
+        """Return the nodes of this stack, ordered with the most recent
+        frame last.
+        """
+        nodes = []
+        node = self._node
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    @property
+    def frames(self):
+        """The full call stack, ordered with the most recent frame last
+        (`list` of `StackFrame`).
+        """
+        return [node.frame for node in self._nodes()]
+
+    def __len__(self):
+        return 0 if self._node is None else self._node.depth
+
+    def __getitem__(self, i):
+        if i == -1 and self._node is not None:
+            return self._node.frame
+        return self.frames[i]
+
+    def __setitem__(self, i, frame):
+        nodes = self._nodes()
+        nodes[i] = frame
+        self._node = _intern(None, nodes)
+
+    def __delitem__(self, i):
+        nodes = self._nodes()
+        del nodes[i]
+        self._node = _intern(None, nodes)
+
+    def __iter__(self):
+        return iter(self.frames)
+
+    def insert(self, i, frame):
+        """Insert a frame before index ``i``.
+
+        Parameters
+        ----------
+        i : `int`
+            Index before which the frame is inserted.
+        frame : `StackFrame`
+            Frame to insert.
+        """
+        if i >= len(self):
+            self._node = _intern(self._node, (frame,))
+        else:
+            nodes = self._nodes()
+            nodes.insert(i, frame)
+            self._node = _intern(None, nodes)
+
+    def copy(self):
+        """Return a shallow copy of this stack.
+        """
+        return self._fromNode(self._node)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __reduce__(self):
+        return (self.__class__, (self.frames,))
+
+    def __add__(self, other):
+        return self._fromNode(_intern(self._node, other))
+
+    def __radd__(self, other):
+        return self._fromNode(_intern(_intern(None, other), self._nodes()))
+
+    def __iadd__(self, other):
+        self._node = _intern(self._node, other)
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, CallStack) and self._node is other._node:
+            return True
+        if isinstance(other, (CallStack, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.frames)
+
+
 def getCallStack(skip=0):
     """Retrieve the call stack for the caller.
 
@@ -175,17 +413,46 @@ def getCallStack(skip=0):
 
     Returns
     -------
-    output : `list` of `StackFrame`
-        The call stack. The `list` is ordered with the most recent frame to
-        last.
+    output : `CallStack`
+        The call stack, which behaves like a `list` of `StackFrame`. The
+        stack is ordered with the most recent frame to last.
 
     Notes
     -----
     This function is excluded from the call stack.
+
+    Only the location of each frame is recorded here, as a node shared with
+    every other stack captured through the same frames; `StackFrame`
+    objects are created when the stack is first inspected (see
+    `CallStack`). Successive captures in a thread usually only differ in
+    their most recent frames, so the nodes of the outer frames are reused
+    from the previous capture in the same thread without being looked up
+    again.
     """
     frame = getCallerFrame(skip + 1)
-    stack = []
+    frames = []
     while frame:
-        stack.append(StackFrame.fromFrame(frame))
+        frames.append(frame)
         frame = frame.f_back
-    return list(reversed(stack))
+    frames.reverse()
+    node = None
+    nShared = 0
+    lastCapture = getattr(_lastCaptures, "capture", ())
+    for frame, (code, lineno, cached) in zip(frames, lastCapture):
+        if frame.f_code is not code or frame.f_lineno != lineno:
+            break
+        node = cached
+        nShared += 1
+    capture = list(lastCapture[:nShared])
+    nodes = _stackNodes
+    with _stackNodesLock:
+        for frame in frames[nShared:]:
+            code = frame.f_code
+            lineno = frame.f_lineno
+            key = (code.co_filename, lineno, code.co_name, node)
+            node = nodes.get(key)
+            if node is None:
+                node = nodes[key] = _StackNode(*key)
+            capture.append((code, lineno, node))
+    _lastCaptures.capture = capture
+    return CallStack._fromNode(node)
@@ -0,0 +1,208 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ("CodeCache", "getCodeCache")
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import tempfile
+import types
+
+from .overridePlan import OverridePlan
+
+CODE_CACHE_ENV_VAR = "PEX_CONFIG_CODE_CACHE"
+"""Name of the environment variable giving the directory of the on-disk
+cache used by `getCodeCache` (`str`).
+
+If unset or empty, compiled override files are only cached in memory.
+"""
+
+
+class CodeCache:
+    """Cache of config override files, parsed into plans and compiled.
+
+    `lsst.pex.config.Config.load` uses the process-wide cache returned by
+    `getCodeCache`, so loading the same override file repeatedly compiles it
+    only once (see `lsst.pex.config.overridePlan.OverridePlan`).
+
+    Parameters
+    ----------
+    directory : `str`, optional
+        Directory for an on-disk cache of compiled code, shared between
+        processes. It is created if necessary. If `None`, code is only cached
+        in memory.
+
+    Attributes
+    ----------
+    hits : `int`
+        Number of lookups served from memory.
+    diskHits : `int`
+        Number of lookups served from the on-disk cache.
+    misses : `int`
+        Number of lookups that compiled the file.
+
+    Notes
+    -----
+    Entries are keyed by the file name (as given, since it is recorded in the
+    compiled code), its modification time and size, and a hash of its
+    contents. The file is read and hashed on every lookup, so an edited file
+    is never served stale code; only compilation is skipped.
+
+    The on-disk cache is best effort: unreadable, corrupt or unwritable
+    entries are ignored. Entries are tagged with
+    `importlib.util.MAGIC_NUMBER` so that code compiled by a different
+    Python version is never used.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._entries = {}
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+
+    def getCode(self, filename):
+        """Get the code object compiled from a config override file.
+
+        Parameters
+        ----------
+        filename : `str`
+            Name of the file.
+
+        Returns
+        -------
+        code : `types.CodeType`
+            Code compiled from the file in ``exec`` mode.
+
+        Raises
+        ------
+        OSError
+            Raised if the file cannot be read.
+        SyntaxError
+            Raised if the file is not valid Python.
+        """
+        return self.getPlan(filename).code
+
+    def getPlan(self, filename):
+        """Get a config override file parsed into an `OverridePlan`.
+
+        Parameters
+        ----------
+        filename : `str`
+            Name of the file.
+
+        Returns
+        -------
+        plan : `lsst.pex.config.overridePlan.OverridePlan`
+            The parsed file, including the code compiled from it in ``exec``
+            mode.
+
+        Raises
+        ------
+        OSError
+            Raised if the file cannot be read.
+        SyntaxError
+            Raised if the file is not valid Python.
+        """
+        with open(filename, "rb") as f:
+            stat = os.fstat(f.fileno())
+            source = f.read()
+        key = (filename, stat.st_mtime_ns, stat.st_size, hashlib.blake2b(source, digest_size=16).hexdigest())
+
+        path = os.path.abspath(filename)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+
+        plan = self._readDisk(key) if self.directory else None
+        if plan is not None:
+            self.diskHits += 1
+        else:
+            self.misses += 1
+            plan = OverridePlan.fromSource(source, filename=filename)
+            if self.directory:
+                self._writeDisk(key, plan)
+        self._entries[path] = (key, plan)
+        return plan
+
+    def clear(self):
+        """Remove all in-memory entries (the counters and the on-disk cache
+        are left untouched).
+        """
+        self._entries.clear()
+
+    def _diskPath(self, key):
+        name = hashlib.blake2b("\0".join(str(k) for k in key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ".pyc")
+
+    def _readDisk(self, key):
+        try:
+            with open(self._diskPath(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+        try:
+            code, steps, names = marshal.loads(data[len(magic):])
+            if not isinstance(code, types.CodeType) or not isinstance(steps, (tuple, type(None))):
+                return None
+            return OverridePlan(code.co_filename, steps, names, code=code)
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _writeDisk(self, key, plan):
+        try:
+            data = marshal.dumps((plan.code, plan.steps, tuple(plan.names)))
+        except (ValueError, TypeError):
+            # plans with values marshal cannot store are only cached in memory
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(mode="wb", delete=False, dir=self.directory) as outfile:
+                outfile.write(importlib.util.MAGIC_NUMBER)
+                outfile.write(data)
+            # rename so that concurrent readers never see a partial entry
+            os.replace(outfile.name, self._diskPath(key))
+        except OSError:
+            pass
+
+
+_codeCache = None
+
+
+def getCodeCache():
+    """Get the process-wide cache used by `lsst.pex.config.Config.load`.
+
+    Returns
+    -------
+    cache : `CodeCache`
+        The cache. It is created on first use, with the on-disk directory
+        given by the ``PEX_CONFIG_CODE_CACHE`` environment variable, if set.
+    """
+    global _codeCache
+    if _codeCache is None:
+        _codeCache = CodeCache(os.environ.get(CODE_CACHE_ENV_VAR) or None)
+    return _codeCache
@@ -28,7 +28,15 @@ writing messages as well as floating-point comparisons and shortcuts.
 
 __all__ = ("getComparisonName", "compareScalars", "compareConfigs")
 
-import numpy
+import cmath
+import math
+
+# Python scalar types that `compareScalars` compares without calling numpy.
+_pythonScalarTypes = frozenset((float, int, complex, bool))
+
+# Minimum number of floating-point items before `_compareItems` hands the
+# whole sequence to numpy instead of comparing items one at a time.
+_VECTORIZE_THRESHOLD = 64
 
 
 def getComparisonName(name1, name2):
@@ -89,12 +97,18 @@ def compareScalars(name, v1, v2, output, rtol=1E-8, atol=1E-8, dtype=None):
 
     Notes
     -----
-    Floating point comparisons are performed by `numpy.allclose`.
+    Floating point comparisons follow `numpy.allclose`, with NaN values
+    considered equal to each other. Python scalars are compared directly
+    without creating numpy arrays; other values are passed to numpy.
     """
     if v1 is None or v2 is None:
         result = (v1 == v2)
     elif dtype in (float, complex):
-        result = numpy.allclose(v1, v2, rtol=rtol, atol=atol) or (numpy.isnan(v1) and numpy.isnan(v2))
+        if type(v1) in _pythonScalarTypes and type(v2) in _pythonScalarTypes:
+            result = _isClose(v1, v2, rtol, atol)
+        else:
+            import numpy
+            result = numpy.allclose(v1, v2, rtol=rtol, atol=atol) or (numpy.isnan(v1) and numpy.isnan(v2))
     else:
         result = (v1 == v2)
     if not result and output is not None:
@@ -102,6 +116,75 @@ def compareScalars(name, v1, v2, output, rtol=1E-8, atol=1E-8, dtype=None):
     return result
 
 
+def _isClose(v1, v2, rtol, atol):
+    """Compare two Python scalars the way `numpy.allclose` does, treating
+    two NaN values as equal.
+    """
+    if v1 == v2:
+        return True
+    if type(v1) is complex or type(v2) is complex:
+        isfinite, isnan = cmath.isfinite, cmath.isnan
+    else:
+        isfinite, isnan = math.isfinite, math.isnan
+    if not (isfinite(v1) and isfinite(v2)):
+        return isnan(v1) and isnan(v2)
+    return abs(v1 - v2) <= atol + rtol*abs(v2)
+
+
+def _compareItems(name, keys, values1, values2, output, rtol, atol, dtype, shortcut):
+    """Compare the items of two equal-length sequences of scalars.
+
+    Parameters
+    ----------
+    name : `str`
+        Name of the container; items are reported as ``name[key]``.
+    keys : sequence
+        Keys or indices of the items, in the order of ``values1`` and
+        ``values2``.
+    values1, values2 : sequence
+        Items to compare.
+    output : callable or `None`
+        Callable used to report inequalities, as for `compareScalars`.
+    rtol, atol : `float`
+        Relative and absolute tolerances for floating point comparisons.
+    dtype : class
+        Data type of the items.
+    shortcut : `bool`
+        If `True`, return as soon as an inequality is found.
+
+    Returns
+    -------
+    areEqual : `bool`
+        `True` if all items are equal.
+
+    Notes
+    -----
+    Long floating-point sequences are compared in a single vectorised
+    `numpy.isclose` call, and only the items it rejects are passed on to
+    `compareScalars`, which produces the same result and messages as
+    comparing every item individually.
+    """
+    indices = range(len(keys))
+    if (dtype in (float, complex) and len(keys) >= _VECTORIZE_THRESHOLD and
+            None not in values1 and None not in values2):
+        import numpy
+        try:
+            close = numpy.isclose(numpy.array(values1, dtype=dtype), numpy.array(values2, dtype=dtype),
+                                  rtol=rtol, atol=atol, equal_nan=True)
+        except (TypeError, ValueError):
+            pass
+        else:
+            indices = numpy.flatnonzero(~close).tolist()
+    equal = True
+    for i in indices:
+        result = compareScalars("%s[%r]" % (name, keys[i]), values1[i], values2[i], dtype=dtype,
+                                rtol=rtol, atol=atol, output=output)
+        if not result and shortcut:
+            return False
+        equal = equal and result
+    return equal
+
+
 def compareConfigs(name, c1, c2, shortcut=True, rtol=1E-8, atol=1E-8, output=None):
     """Compare two `lsst.pex.config.Config` instances for equality.
 
@@ -21,9 +21,13 @@
 
 __all__ = ("Config", "ConfigMeta", "Field", "FieldValidationError")
 
+import collections.abc
 import io
 import os
-import re
+import json
+import hashlib
+import importlib
+import itertools
 import sys
 import math
 import copy
@@ -33,6 +37,9 @@ import warnings
 
 from .comparison import getComparisonName, compareScalars, compareConfigs
 from .callStack import getStackFrame, getCallStack
+from .history import getHistoryLimit
+from .codeCache import getCodeCache
+from .overridePlan import OverridePlan
 
 
 def _joinNamePath(prefix=None, name=None, index=None):
@@ -96,6 +103,147 @@ def _typeStr(x):
         return "%s.%s" % (xtype.__module__, xtype.__name__)
 
 
+def _importTypeStr(typeString):
+    """Look up an object from the fully-qualified name generated by
+    `_typeStr`, importing its module if necessary.
+
+    Parameters
+    ----------
+    typeString : `str`
+        Fully-qualified name, e.g. ``"lsst.pex.config.Config"``. Names without
+        a module are looked up in `builtins`.
+
+    Returns
+    -------
+    obj : object
+        The named object.
+
+    Raises
+    ------
+    ImportError
+        Raised if no importable module prefix of ``typeString`` provides the
+        named object, or if importing an existing module prefix fails.
+    """
+    parts = typeString.split(".")
+    if len(parts) == 1:
+        parts.insert(0, "builtins")
+    for i in range(len(parts) - 1, 0, -1):
+        module = ".".join(parts[:i])
+        try:
+            obj = importlib.import_module(module)
+        except ImportError as e:
+            # only a missing module prefix means a shorter prefix may work;
+            # errors from importing an existing module are the user's to see
+            if e.name is None or (module != e.name and not module.startswith(e.name + ".")):
+                raise
+            continue
+        try:
+            for attr in parts[i:]:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            continue
+        return obj
+    raise ImportError("Cannot import %s" % typeString)
+
+
+_validationEpoch = 0
+"""Counter compared with `Config._validated`; incremented to discard every
+cached validation result (`int`).
+"""
+
+_modificationCounter = itertools.count()
+"""Source of the stamps recorded in `Config._modified` and
+`Config._fingerprint`, ordering modifications and fingerprints.
+"""
+
+_structuredSupport = {}
+
+
+def _savesStructured(fieldType):
+    """Test whether a `Field` type supports structured persistence.
+
+    Parameters
+    ----------
+    fieldType : `Field`-type
+        The field class.
+
+    Returns
+    -------
+    supported : `bool`
+        `False` if ``fieldType`` (or a base) overrides ``save`` more recently
+        than ``_saveStructured``, as the structured tree might then miss
+        whatever the customized ``save`` writes.
+    """
+    try:
+        return _structuredSupport[fieldType]
+    except KeyError:
+        pass
+    for klass in fieldType.__mro__:
+        if "_saveStructured" in vars(klass):
+            supported = True
+            break
+        if "save" in vars(klass):
+            supported = False
+            break
+    _structuredSupport[fieldType] = supported
+    return supported
+
+
+_namedSaveSupport = {}
+
+
+def _savesNamed(fieldType):
+    """Test whether a `Field` type can be saved without renaming its config.
+
+    Parameters
+    ----------
+    fieldType : `Field`-type
+        The field class.
+
+    Returns
+    -------
+    supported : `bool`
+        `False` if ``fieldType`` (or a base) overrides ``save`` or
+        ``_collectImports`` more recently than ``_saveNamed``, as these
+        customizations rely on the names of the configs being saved.
+    """
+    try:
+        return _namedSaveSupport[fieldType]
+    except KeyError:
+        pass
+    for klass in fieldType.__mro__:
+        if "_saveNamed" in vars(klass):
+            supported = True
+            break
+        if "save" in vars(klass) or "_collectImports" in vars(klass):
+            supported = False
+            break
+    _namedSaveSupport[fieldType] = supported
+    return supported
+
+
+def _encodeStructured(value):
+    """Convert a field value to a node of a structured (JSON) config tree.
+
+    Notes
+    -----
+    JSON has no complex type, so complex values are stored as
+    ``{"complex": [real, imag]}``. Non-finite floats rely on the ``NaN`` and
+    ``Infinity`` extensions supported by the `json` module.
+    """
+    if isinstance(value, complex):
+        return {"complex": [value.real, value.imag]}
+    return value
+
+
+def _decodeStructured(node):
+    """Invert `_encodeStructured`.
+    """
+    if isinstance(node, dict):
+        return complex(*node["complex"])
+    return node
+
+
 class ConfigMeta(type):
     """A metaclass for `lsst.pex.config.Config`.
 
@@ -105,12 +253,20 @@ class ConfigMeta(type):
     class attributes as a class attribute called ``_fields``, and adds
     the name of each field as an instance variable of the field itself (so you
     don't have to pass the name of the field to the field constructor).
+
+    It also resets the class's cached defaults template (see
+    `lsst.pex.config.Config.__new__`) and lists of fields holding subconfigs
+    (see `lsst.pex.config.Config.validate`) or mutable values (see
+    `lsst.pex.config.Config.copy`) whenever a field is added to the class.
     """
 
     def __init__(cls, name, bases, dict_):
         type.__init__(cls, name, bases, dict_)
         cls._fields = {}
         cls._source = getStackFrame()
+        cls._defaultsTemplate = None
+        cls._subconfigFields = None
+        cls._copiedFields = None
 
         def getFields(classtype):
             fields = {}
@@ -132,9 +288,285 @@ class ConfigMeta(type):
         if isinstance(value, Field):
             value.name = name
             cls._fields[name] = value
+            type.__setattr__(cls, "_defaultsTemplate", None)
+            type.__setattr__(cls, "_subconfigFields", None)
+            type.__setattr__(cls, "_copiedFields", None)
         type.__setattr__(cls, name, value)
 
 
+class _FieldHistory(dict):
+    """History of the fields of a config, keyed by field name (for internal
+    use only).
+
+    Parameters
+    ----------
+    fields : `dict`
+        The fields of the config, keyed by name.
+    *args
+        Initial history, as for `dict`.
+
+    Notes
+    -----
+    The list of events of a field is only created when its first event is
+    recorded; until then the field's history is an empty list.
+    """
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, fields, *args):
+        dict.__init__(self, *args)
+        self._fields = fields
+
+    def __missing__(self, name):
+        if name not in self._fields:
+            raise KeyError(name)
+        return []
+
+
+class _HistoryDelta:
+    """A change to a `~lsst.pex.config.List` or `~lsst.pex.config.Dict`,
+    recorded in the history of its field instead of a copy of the whole
+    container (for internal use only).
+
+    Parameters
+    ----------
+    op : {"set", "del", "update", "clear"}
+        Whether items were set, deleted, updated from a `dict` or all
+        deleted.
+    key : `int`, `slice` or object
+        The index, slice or key of the items, or `None` for an update or
+        when clearing.
+    value : object
+        The new item or items, or `None` for a deletion.
+    """
+
+    __slots__ = ("op", "key", "value")
+
+    def __init__(self, op, key, value=None):
+        self.op = op
+        self.key = key
+        self.value = value
+
+    def apply(self, container):
+        """Apply the change to a `list` or `dict` in place.
+        """
+        if self.op == "set":
+            container[self.key] = self.value
+        elif self.op == "del":
+            del container[self.key]
+        elif self.op == "update":
+            container.update(self.value)
+        else:
+            container.clear()
+
+    def __repr__(self):
+        return "_HistoryDelta(%r, %r, %r)" % (self.op, self.key, self.value)
+
+
+def _replayHistory(events):
+    """Get the history events of a field with the value after each change.
+
+    Parameters
+    ----------
+    events : `list` of `tuple`
+        History events: ``(value, stack, label)``, where ``value`` may be a
+        `_HistoryDelta` for the value of the previous event.
+
+    Returns
+    -------
+    replayed : `list` of `tuple`
+        ``events`` itself if it holds no `_HistoryDelta`, otherwise a new
+        list in which each of them is replaced by a copy of the value after
+        the change.
+    """
+    if not any(type(event[0]) is _HistoryDelta for event in events):
+        return events
+    replayed = []
+    current = None
+    for value, at, label in events:
+        if type(value) is _HistoryDelta:
+            value.apply(current)
+            value = current.copy()
+        else:
+            current = value.copy() if isinstance(value, (list, dict)) else value
+        replayed.append((value, at, label))
+    return replayed
+
+
+class _HistoryView(collections.abc.Mapping):
+    """Read-only view of the history of the fields of a config, which
+    replays the changes recorded as `_HistoryDelta` (for internal use only).
+
+    Parameters
+    ----------
+    history : `_FieldHistory`
+        The history of the config.
+    """
+
+    __slots__ = ("_history",)
+
+    def __init__(self, history):
+        self._history = history
+
+    def __getitem__(self, name):
+        return _replayHistory(self._history[name])
+
+    def __iter__(self):
+        return iter(self._history)
+
+    def __len__(self):
+        return len(self._history)
+
+    def __contains__(self, name):
+        return name in self._history
+
+
+class _FieldDoc:
+    """Descriptor for the ``__doc__`` of a `_FieldValue`, which is the
+    documentation of its field (for internal use only).
+
+    Parameters
+    ----------
+    classDoc : `str` or `None`
+        Documentation of the class, returned when the descriptor is
+        accessed on the class itself.
+    """
+
+    def __init__(self, classDoc):
+        self.classDoc = classDoc
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.classDoc
+        return instance._field.doc
+
+
+class _FieldValue:
+    """Base class for the objects that hold the value of a field in a config,
+    such as `~lsst.pex.config.List` (for internal use only).
+
+    Subclasses store their state in ``__slots__`` and must set ``_field``.
+    Their ``__doc__`` is the documentation of that field, which is shared
+    rather than stored in each instance.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.__doc__ = _FieldDoc(cls.__dict__.get("__doc__"))
+
+    def _recordChange(self, op, key, value, at, label, setHistory=True):
+        """Record a change to a container in the history of its field (for
+        internal use only).
+
+        Parameters
+        ----------
+        op : {"set", "del", "update", "clear"}
+            The kind of change (see `_HistoryDelta`).
+        key : `int`, `slice` or object
+            The index, slice or key of the items, if any.
+        value : object
+            The new item or items, if any.
+        at : `list` of `lsst.pex.config.callStack.StackFrame` or `None`
+            The call stack; captured here if `None`.
+        label : `str`
+            Event label for the history.
+        setHistory : `bool`, optional
+            Whether the change should be recorded at all.
+
+        Notes
+        -----
+        Containers that use this method have a ``_lastEvent`` slot holding
+        the last history event that recorded their full value or a change to
+        it, and a ``_historyValue`` method returning a copy of their value.
+        A change is recorded as a `_HistoryDelta` if that event is still the
+        last one of the field, and as a copy of the value otherwise, so that
+        replaying the history never applies a change to the wrong value.
+        """
+        config = self._config
+        if not (setHistory and config._recordsHistory()):
+            # the history misses this change
+            self._lastEvent = None
+            return
+        if at is None:
+            at = getCallStack(1)
+        history = config._history[self._field.name]
+        if history and history[-1] is self._lastEvent:
+            event = (_HistoryDelta(op, key, value), at, label)
+        else:
+            event = (self._historyValue(), at, label)
+        config._addHistory(self._field.name, event)
+        self._lastEvent = event
+
+
+class _DefaultsTemplate:
+    """Validated field defaults of a `Config` class, used to initialize new
+    instances without repeating the work (for internal use only).
+
+    Parameters
+    ----------
+    instance : `Config`
+        A config whose fields have just been set to their defaults (and
+        before `Config.setDefaults` is called).
+
+    Notes
+    -----
+    Each field is asked for a template of its default with
+    `Field._makeDefaultTemplate`. Values of fields that use the base
+    `Field._setDefault` are immutable and are shared by all instances;
+    other fields build their storage from their template with
+    `Field._setDefault`, and fields that do not support templates are set
+    with ``__set__`` as usual.
+
+    The template is out of date once a field's default is replaced, or a
+    mutable default (such as the `list` default of a
+    `~lsst.pex.config.ListField`) is modified in place.
+    """
+
+    def __init__(self, instance):
+        self.storage = {}
+        """Initial storage for new instances: the shared default value, or
+        `None` for fields that set their own storage (`dict`).
+        """
+
+        self.shared = []
+        """Fields whose default value is shared (`list` of `Field`).
+        """
+
+        self.other = []
+        """Fields that set their own storage, with their templates
+        (`list` of `tuple`).
+        """
+
+        self.defaults = []
+        self.mutableDefaults = []
+        for field in instance._fields.values():
+            template = field._makeDefaultTemplate(instance)
+            if template is not NotImplemented and type(field)._setDefault is Field._setDefault:
+                self.storage[field.name] = template
+                self.shared.append(field)
+            else:
+                self.storage[field.name] = None
+                self.other.append((field, template))
+            self.defaults.append((field, field.default))
+            if isinstance(field.default, (collections.abc.MutableSequence, collections.abc.MutableMapping,
+                                          collections.abc.MutableSet)):
+                self.mutableDefaults.append((field, copy.copy(field.default)))
+
+    def isCurrent(self):
+        """Return `True` if no field's default has been replaced or modified
+        since the template was made.
+        """
+        for field, default in self.defaults:
+            if field.default is not default:
+                return False
+        for field, default in self.mutableDefaults:
+            if field.default != default:
+                return False
+        return True
+
+
 class FieldValidationError(ValueError):
     """Raised when a ``~lsst.pex.config.Field`` is not valid in a
     particular ``~lsst.pex.config.Config``.
@@ -168,7 +600,7 @@ class FieldValidationError(ValueError):
         (`str`).
         """
 
-        self.history = config.history.setdefault(field.name, [])
+        self.history = config.history[field.name]
         """Full history of all changes to the `~lsst.pex.config.Field`
         instance.
         """
@@ -368,6 +800,46 @@ class Field:
         if not self.optional and value is None:
             raise FieldValidationError(self, instance, "Required value cannot be None")
 
+    def _isValidated(self, instance):
+        """Test whether the subconfigs this field validates are unchanged since
+        they were last validated (for internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            The config instance that contains this field.
+
+        Returns
+        -------
+        validated : `bool`
+            `True` if `validate` would only repeat checks that already passed.
+
+        Notes
+        -----
+        Changes to the field's own value are tracked by its config (see
+        `lsst.pex.config.Config._markModified`), so fields that do not hold
+        subconfigs can rely on this default. Fields that hold subconfigs must
+        return `False` unless ``Config._isValidated`` is `True` for every
+        subconfig their `validate` method validates.
+        """
+        return True
+
+    def _subconfigs(self, instance):
+        """Get the subconfigs held by this field (for internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            The config instance that contains this field.
+
+        Returns
+        -------
+        subconfigs : iterable of `lsst.pex.config.Config`
+            Every subconfig created so far whose values `_saveStructured`
+            persists. Fields that do not hold subconfigs return nothing.
+        """
+        return ()
+
     def freeze(self, instance):
         """Make this field read-only (for internal use only).
 
@@ -412,6 +884,78 @@ class Field:
             msg = "Value %s is not a valid value" % str(value)
             raise ValueError(msg)
 
+    def _makeDefaultTemplate(self, instance):
+        """Make a template from which this field's default can be set
+        quickly in new configs (for internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            A config in which this field has just been set to its default with
+            ``__set__``.
+
+        Returns
+        -------
+        template : object
+            Template passed to `_setDefault` when new instances of the config
+            class are created, or `NotImplemented` if the default must be set
+            with ``__set__``.
+
+        Notes
+        -----
+        The base implementation returns the validated default, which is
+        immutable and can be shared between configs. Subclasses that override
+        ``__set__`` must override this method and `_setDefault` to take
+        advantage of the template; otherwise their defaults continue to be
+        set with ``__set__``.
+        """
+        if type(self).__set__ is not Field.__set__:
+            return NotImplemented
+        return instance._storage[self.name]
+
+    def _setDefault(self, instance, template, at):
+        """Set this field to its default in a new config from a template
+        made by `_makeDefaultTemplate` (for internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            The config instance that contains this field.
+        template : object
+            Template returned by `_makeDefaultTemplate`.
+        at : `list` of `lsst.pex.config.callStack.StackFrame` or `None`
+            The call stack for the history, or `None` if history is not being
+            recorded.
+        """
+        instance._storage[self.name] = template
+        if at is not None:
+            instance._addHistory(self.name, (template, at, "default"))
+
+    def _copyValue(self, instance, value):
+        """Copy this field's value from another config into a copy of it (for
+        internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            The copy being made, whose history has already been copied.
+        value : object
+            The value of this field in the config being copied.
+
+        Returns
+        -------
+        value : object
+            The value to store in ``instance``.
+
+        Notes
+        -----
+        The base implementation returns ``value`` itself, since the values of
+        simple fields are immutable. Fields holding containers or subconfigs
+        must return copies bound to ``instance``, using `Config._copy` for
+        subconfigs so that they are only duplicated when accessed.
+        """
+        return value
+
     def _collectImports(self, instance, imports):
         """This function should call the _collectImports method on all config
         objects the field may own, and union them with the supplied imports
@@ -447,11 +991,53 @@ class Field:
 
         This output can be executed with Python.
         """
+        self._saveNamed(outfile, instance, instance._name, set())
+
+    def _saveNamed(self, outfile, instance, prefix, imports, reference=None):
+        """Save this field to a file, naming it relative to ``prefix`` (for
+        internal use only).
+
+        Parameters
+        ----------
+        outfile : file-like object
+            A writeable field handle.
+        instance : `Config`
+            The `Config` instance that contains this field.
+        prefix : `str`
+            Full name of ``instance`` in the saved file.
+        imports : `set`
+            Set of python modules that need imported after persistence, to be
+            updated with the modules this field needs.
+        reference : `Config`, optional
+            If provided, save in compact form: the field is only written if
+            its value differs from its value in ``reference``, and without
+            its documentation.
+
+        Notes
+        -----
+        This is the single-pass counterpart of `save` and `_collectImports`
+        used by `Config.saveToStream`: the saved names are built from
+        ``prefix`` instead of the names of the configs, and neither
+        ``instance`` nor its subconfigs are renamed or otherwise modified.
+        Fields that hold subconfigs should call `Config._saveNamed` on each
+        subconfig, with the matching subconfig of ``reference`` (which stands
+        for the config the saved file will be loaded into) if it is provided.
+        """
         value = self.__get__(instance)
-        fullname = _joinNamePath(instance._name, self.name)
+        fullname = _joinNamePath(prefix, self.name)
 
         if self.deprecated and value == self.default:
             return
+        if reference is not None:
+            # _compare also treats values such as NaN as equal
+            if value == self.__get__(reference) or \
+                    self._compare(instance, reference, shortcut=True, rtol=0.0, atol=0.0, output=None):
+                return
+            if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+                outfile.write(u"{}=float('{!r}')\n".format(fullname, value))
+            else:
+                outfile.write(u"{}={!r}\n".format(fullname, value))
+            return
 
         # write full documentation string as comment lines (i.e. first character is #)
         doc = "# " + str(self.doc).replace("\n", "\n# ")
@@ -488,6 +1074,79 @@ class Field:
         """
         return self.__get__(instance)
 
+    def _walk(self, instance, prefix):
+        """Iterate over the names this field assigns when saved (for
+        internal use only).
+
+        Parameters
+        ----------
+        instance : `Config`
+            The `Config` instance that contains this field.
+        prefix : `str` or `None`
+            Name of ``instance`` relative to the config being walked.
+
+        Yields
+        ------
+        name : `str`
+            Name relative to the config being walked.
+        field : `Field`
+            The field holding the value.
+        value : object
+            The value.
+
+        Notes
+        -----
+        This is the traversal counterpart of `save` and must yield one entry
+        for each assignment that `save` writes, in the same order. Fields that
+        hold subconfigs should yield the entries of `Config._walk` for each
+        subconfig.
+        """
+        value = self.__get__(instance)
+        if self.deprecated and value == self.default:
+            return
+        yield _joinNamePath(prefix, self.name), self, value
+
+    def _saveStructured(self, instance, data):
+        """Add this field's value to a structured config tree (for internal
+        use only).
+
+        Parameters
+        ----------
+        instance : `Config`
+            The `Config` instance that contains this field.
+        data : `dict`
+            Tree of the containing config, keyed by field name. Fields that
+            should not be persisted leave it untouched.
+
+        Notes
+        -----
+        This is the structured counterpart of `save`: the node must contain
+        only JSON-compatible values, and `_loadStructured` must restore it.
+        Fields that hold subconfigs should store the trees returned by
+        `Config._saveStructured`.
+        """
+        value = self.__get__(instance)
+        if self.deprecated and value == self.default:
+            return
+        data[self.name] = _encodeStructured(value)
+
+    def _loadStructured(self, instance, node, at, label):
+        """Set this field from a node of a structured config tree (for
+        internal use only).
+
+        Parameters
+        ----------
+        instance : `Config`
+            The `Config` instance that contains this field.
+        node : object
+            The node stored by `_saveStructured`.
+        at : `list` of `lsst.pex.config.callStack.StackFrame`
+            The call stack shared by every field set during the load.
+        label : `str`
+            Event label for the history.
+        """
+        self.__set__(instance, _decodeStructured(node), at=at, label=label)
+
     def __get__(self, instance, owner=None, at=None, label="default"):
         """Define how attribute access should occur on the Config instance
         This is invoked by the owning config object and should not be called
@@ -550,18 +1209,48 @@ class Field:
         if instance._frozen:
             raise FieldValidationError(self, instance, "Cannot modify a frozen Config")
 
-        history = instance._history.setdefault(self.name, [])
         if value is not None:
-            value = _autocast(value, self.dtype)
-            try:
-                self._validateValue(value)
-            except BaseException as e:
-                raise FieldValidationError(self, instance, str(e))
+            value = self._castValue(instance, value)
+        self._storeValue(instance, value, at, label)
 
-        instance._storage[self.name] = value
-        if at is None:
-            at = getCallStack()
-        history.append((value, at, label))
+    def _castValue(self, instance, value):
+        """Cast and validate a value to be stored by `__set__` (for internal
+        use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            The config instance that contains this field.
+        value : object
+            Value to set on this field; must not be `None`.
+
+        Returns
+        -------
+        value : object
+            The value cast to the field's type.
+
+        Raises
+        ------
+        lsst.pex.config.FieldValidationError
+            Raised if the value is invalid.
+        """
+        value = _autocast(value, self.dtype)
+        try:
+            self._validateValue(value)
+        except BaseException as e:
+            raise FieldValidationError(self, instance, str(e))
+        return value
+
+    def _storeValue(self, instance, value, at, label):
+        """Store a value returned by `_castValue` and record its history (for
+        internal use only).
+        """
+        instance._storage[self.name] = value
+        instance._markModified()
+        if instance._recordsHistory():
+            if at is None:
+                at = getCallStack()
+            instance._addHistory(self.name, (value, at, label))
 
     def __delete__(self, instance, at=None, label='deletion'):
         """Delete an attribute from a `lsst.pex.config.Config` instance.
@@ -581,7 +1270,7 @@ class Field:
         This is invoked by the owning `~lsst.pex.config.Config` object and
         should not be called directly.
         """
-        if at is None:
+        if at is None and instance._recordsHistory():
             at = getCallStack()
         self.__set__(instance, None, at=at, label=label)
 
@@ -720,6 +1409,11 @@ class Config(metaclass=ConfigMeta):
     ['coffee', 'green tea', 'water', 'earl grey tea']
     """
 
+    # Instances keep their state in slots rather than a per-instance
+    # dictionary; subclasses that do not declare ``__slots__`` still get one.
+    __slots__ = ("_storage", "_history", "_imports", "_frozen", "_name", "_validated", "_modified",
+                 "_fingerprint", "_copiedFrom")
+
     def __iter__(self):
         """Iterate over fields.
         """
@@ -833,24 +1527,56 @@ class Config(metaclass=ConfigMeta):
         This ensures that even if a derived `~lsst.pex.config.Config` class
         implements ``__init__``, its author does not need to be concerned about
         when or even the base ``Config.__init__`` should be called.
+
+        The first instance of each class has its fields set to their defaults
+        with ``Field.__set__``. The validated result is cached as a template
+        for the class, so later instances copy the defaults in bulk instead of
+        validating them again. The template is rebuilt if a field is added to
+        the class or a field's default is replaced. `setDefaults` is always
+        called, since it may depend on state that changes at runtime (for
+        example, the contents of a registry).
         """
         name = kw.pop("__name", None)
-        at = kw.pop("__at", getCallStack())
+        at = kw.pop("__at", None)
         # remove __label and ignore it
         kw.pop("__label", "default")
+        # only skipped when every field is about to be restored (unpickling)
+        setDefaults = kw.pop("__setDefaults", True)
 
         instance = object.__new__(cls)
         instance._frozen = False
+        instance._validated = None
+        instance._modified = next(_modificationCounter)
+        instance._fingerprint = None
+        instance._copiedFrom = None
         instance._name = name
-        instance._storage = {}
-        instance._history = {}
-        instance._imports = set()
+        instance._history = _FieldHistory(cls._fields)
+        record = instance._recordsHistory()
+        if at is None and record:
+            at = getCallStack()
         # load up defaults
-        for field in instance._fields.values():
-            instance._history[field.name] = []
-            field.__set__(instance, field.default, at=at + [field.source], label="default")
+        template = cls._defaultsTemplate
+        if template is not None and template.isCurrent():
+            instance._storage = template.storage.copy()
+            if record:
+                for field in template.shared:
+                    instance._addHistory(field.name, (instance._storage[field.name], at + [field.source],
+                                                      "default"))
+            for field, fieldTemplate in template.other:
+                fieldAt = at + [field.source] if record else None
+                if fieldTemplate is NotImplemented:
+                    field.__set__(instance, field.default, at=fieldAt, label="default")
+                else:
+                    field._setDefault(instance, fieldTemplate, at=fieldAt)
+        else:
+            instance._storage = {}
+            for field in cls._fields.values():
+                fieldAt = at + [field.source] if at is not None else None
+                field.__set__(instance, field.default, at=fieldAt, label="default")
+            cls._defaultsTemplate = _DefaultsTemplate(instance)
         # set custom default-overides
-        instance.setDefaults()
+        if setDefaults:
+            instance.setDefaults()
         # set constructor overides
         instance.update(__at=at, **kw)
         return instance
@@ -861,7 +1587,17 @@ class Config(metaclass=ConfigMeta):
         We need to condense and reconstitute the `~lsst.pex.config.Config`,
         since it may contain lambdas (as the ``check`` elements) that cannot
         be pickled.
+
+        The structured tree of the config (see `saveStructuredToStream`) is
+        pickled when every field supports it, and is restored by
+        `unreduceStructuredConfig` without calling `setDefaults` or executing
+        code. Otherwise the config is saved as Python code and restored by
+        `unreduceConfig`.
         """
+        try:
+            return (unreduceStructuredConfig, (self.__class__, self._toStructured()))
+        except NotImplementedError:
+            pass
         # The stream must be in characters to match the API but pickle requires bytes
         stream = io.StringIO()
         self.saveToStream(stream)
@@ -930,8 +1666,10 @@ class Config(metaclass=ConfigMeta):
         fieldB: True
         fieldC: 'Updated!'
         """
-        at = kw.pop("__at", getCallStack())
+        at = kw.pop("__at", None)
         label = kw.pop("__label", "update")
+        if at is None and self._recordsHistory():
+            at = getCallStack()
 
         for name, value in kw.items():
             try:
@@ -940,6 +1678,149 @@ class Config(metaclass=ConfigMeta):
             except KeyError:
                 raise KeyError("No field of name %s exists in config type %s" % (name, _typeStr(self)))
 
+    def bulkUpdate(self, values, label="bulk update"):
+        """Set many fields of this config and its subconfigs in a single
+        all-or-nothing update.
+
+        Parameters
+        ----------
+        values : `collections.abc.Mapping`
+            New values keyed by field name. Names may be dotted paths to
+            fields of subconfigs, such as ``"sub.field"``, and a mapping given
+            for a subconfig is applied to its fields, so
+            ``{"sub": {"field": 1}}`` is the same as ``{"sub.field": 1}``.
+        label : `str`, optional
+            Event label for the history.
+
+        Raises
+        ------
+        KeyError
+            Raised if a name does not refer to a field.
+        lsst.pex.config.FieldValidationError
+            Raised if a config to modify is frozen, or a value is invalid.
+
+        Notes
+        -----
+        Every name is resolved, and every value of a plain `Field` is cast and
+        validated, before any field is modified. Other fields, such as
+        choice and configurable fields, may modify their current values in
+        place when set, which cannot be undone, so if the update includes
+        any of them it is first applied to a copy of this config and only
+        applied to this config if that succeeds.
+
+        A single call stack is captured for the whole update and shared by
+        the history of every field set.
+
+        Examples
+        --------
+        >>> from lsst.pex.config import Config, ConfigField, Field
+        >>> class InnerConfig(Config):
+        ...     x = Field(doc='X', dtype=float, default=0.0)
+        ...
+        >>> class OuterConfig(Config):
+        ...     n = Field(doc='N', dtype=int, default=1)
+        ...     inner = ConfigField(doc='Inner', dtype=InnerConfig)
+        ...
+        >>> config = OuterConfig()
+        >>> config.bulkUpdate({"n": 2, "inner": {"x": 3}})
+        >>> config.n, config.inner.x
+        (2, 3.0)
+        >>> config.bulkUpdate({"n": 5, "inner.x": "bad"})
+        Traceback (most recent call last):
+            ...
+        lsst.pex.config.config.FieldValidationError: ...
+        >>> config.n
+        2
+        """
+        updates = []
+        owners = {}
+        restorable = True
+        for name, value in self._flattenUpdates(values, None):
+            path, _, fieldName = name.rpartition(".")
+            owner = owners.get(path)
+            if owner is None:
+                owner = owners[path] = self._resolveConfig(path) if path else self
+            if owner is None or fieldName not in owner._fields:
+                raise KeyError("No field of name %s exists in config type %s" % (name, _typeStr(self)))
+            field = owner._fields[fieldName]
+            if owner._frozen:
+                raise FieldValidationError(field, owner, "Cannot modify a frozen Config")
+            if field.deprecated is not None:
+                fullname = _joinNamePath(owner._name, field.name)
+                warnings.warn(f"Config field {fullname} is deprecated: {field.deprecated}", FutureWarning)
+            simple = type(field).__set__ is Field.__set__
+            if simple and value is not None:
+                value = field._castValue(owner, value)
+            restorable = restorable and simple
+            updates.append((path, owner, field, value, simple))
+
+        at = None
+        if any(owner._recordsHistory() for owner in owners.values()):
+            at = getCallStack()
+        if restorable:
+            for _, owner, field, value, _ in updates:
+                field._storeValue(owner, value, at, label)
+            return
+
+        trial = self.copy()
+        trialOwners = {}
+        for path, _, field, value, simple in updates:
+            owner = trialOwners.get(path)
+            if owner is None:
+                owner = trialOwners[path] = trial._resolveConfig(path) if path else trial
+            if simple:
+                field._storeValue(owner, value, at, label)
+            else:
+                field.__set__(owner, value, at=at, label=label)
+
+        # the trial succeeded, so this only restores the fields already set
+        # if the update is interrupted
+        applied = []
+        try:
+            for _, owner, field, value, simple in updates:
+                history = owner._history.get(field.name)
+                applied.append((owner, field.name, owner._storage.get(field.name),
+                                None if history is None else list(history)))
+                if simple:
+                    field._storeValue(owner, value, at, label)
+                else:
+                    field.__set__(owner, value, at=at, label=label)
+        except BaseException:
+            for owner, name, value, history in reversed(applied):
+                owner._storage[name] = value
+                if history is None:
+                    owner._history.pop(name, None)
+                else:
+                    owner._history[name] = history
+                owner._markModified()
+            raise
+
+    def _flattenUpdates(self, values, prefix):
+        """Yield the dotted names and values of a possibly nested mapping of
+        updates for `bulkUpdate` (for internal use only).
+        """
+        for name, value in values.items():
+            name = _joinNamePath(prefix, name)
+            if isinstance(value, collections.abc.Mapping) and isinstance(self._resolveConfig(name), Config):
+                yield from self._flattenUpdates(value, name)
+            else:
+                yield name, value
+
+    def _resolveConfig(self, name):
+        """Return the subconfig at a dotted name, or `None` if the name does
+        not refer to a subconfig (for internal use only).
+        """
+        config = self
+        for part in name.split("."):
+            if not isinstance(config, Config) or part not in config._fields:
+                return None
+            config = getattr(config, part)
+            if not isinstance(config, Config):
+                # Fields such as ConfigurableField hold proxies of their
+                # configs.
+                config = getattr(config, "value", config)
+        return config if isinstance(config, Config) else None
+
     def load(self, filename, root="config"):
         """Modify this config in place by executing the Python code in a
         configuration file.
@@ -970,10 +1851,16 @@ class Config(metaclass=ConfigMeta):
         lsst.pex.config.Config.loadFromStream
         lsst.pex.config.Config.save
         lsst.pex.config.Config.saveFromStream
+        lsst.pex.config.getCodeCache
+
+        Notes
+        -----
+        The parsed and compiled file is cached (see
+        `lsst.pex.config.CodeCache`), so loading an unchanged file again only
+        reads it.
         """
-        with open(filename, "r") as f:
-            code = compile(f.read(), filename=filename, mode="exec")
-            self.loadFromStream(stream=code, root=root)
+        plan = getCodeCache().getPlan(filename)
+        self.loadFromStream(stream=plan, root=root)
 
     def loadFromStream(self, stream, root="config", filename=None):
         """Modify this Config in place by executing the Python code in the
@@ -981,7 +1868,7 @@ class Config(metaclass=ConfigMeta):
 
         Parameters
         ----------
-        stream : file-like object, `str`, or compiled string
+        stream : file-like object, `str`, compiled string, or `OverridePlan`
             Stream containing configuration override code.
         root : `str`, optional
             Name of the variable in file that refers to the config being
@@ -1007,7 +1894,25 @@ class Config(metaclass=ConfigMeta):
         lsst.pex.config.Config.load
         lsst.pex.config.Config.save
         lsst.pex.config.Config.saveFromStream
+
+        Notes
+        -----
+        Statements that assign a literal value to a field, such as
+        ``config.a.b = 1``, are applied without being executed (see
+        `lsst.pex.config.overridePlan.OverridePlan`): the call stack is
+        captured once for the whole file, and the history of each field still
+        records the line of the file that set it. Other statements are
+        executed.
         """
+        if isinstance(stream, (str, bytes)):
+            stream = OverridePlan.fromSource(stream, compileCode=False)
+        if isinstance(stream, OverridePlan):
+            if stream.canApply(root):
+                at = getCallStack() if self._recordsHistory() else None
+                self._imports.update(stream.apply(self, root, at))
+                return
+            stream = stream.code
+
         with RecordingImporter() as importer:
             try:
                 local = {root: self}
@@ -1029,7 +1934,7 @@ class Config(metaclass=ConfigMeta):
 
         self._imports.update(importer.getModules())
 
-    def save(self, filename, root="config"):
+    def save(self, filename, root="config", compact=False):
         """Save a Python script to the named file, which, when loaded,
         reproduces this config.
 
@@ -1040,6 +1945,10 @@ class Config(metaclass=ConfigMeta):
         root : `str`, optional
             Name to use for the root config variable. The same value must be
             used when loading (see `lsst.pex.config.Config.load`).
+        compact : `bool`, optional
+            If `True`, only write the fields that differ from a newly
+            constructed config, without documentation (see
+            `saveToStream`).
 
         See also
         --------
@@ -1049,7 +1958,7 @@ class Config(metaclass=ConfigMeta):
         """
         d = os.path.dirname(filename)
         with tempfile.NamedTemporaryFile(mode="w", delete=False, dir=d) as outfile:
-            self.saveToStream(outfile, root)
+            self.saveToStream(outfile, root, compact=compact)
             # tempfile is hardcoded to create files with mode '0600'
             # for an explantion of these antics see:
             # https://stackoverflow.com/questions/10291131/how-to-use-os-umask-in-python
@@ -1061,7 +1970,7 @@ class Config(metaclass=ConfigMeta):
             # os.rename may not work across filesystems
             shutil.move(outfile.name, filename)
 
-    def saveToStream(self, outfile, root="config"):
+    def saveToStream(self, outfile, root="config", compact=False):
         """Save a configuration file to a stream, which, when loaded,
         reproduces this config.
 
@@ -1073,32 +1982,221 @@ class Config(metaclass=ConfigMeta):
         root
             Name to use for the root config variable. The same value must be
             used when loading (see `lsst.pex.config.Config.load`).
+        compact : `bool`, optional
+            If `True`, only write the fields whose values differ from those
+            of a newly constructed config of the same type (including the
+            changes made by `setDefaults`), and do not write the
+            documentation of each field as comments.
 
         See also
         --------
         lsst.pex.config.Config.save
         lsst.pex.config.Config.load
         lsst.pex.config.Config.loadFromStream
+
+        Notes
+        -----
+        A compact file only reproduces this config when it is loaded into a
+        newly constructed config, whereas loading a full file overrides every
+        field.
         """
-        tmp = self._name
-        self._rename(root)
+        buffer = io.StringIO()
+        imports = set()
+        reference = type(self)() if compact else None
+        self._saveNamed(buffer, root, imports, reference)
+        # Remove self from the set, as it is handled explicitly below
+        imports.discard(self.__module__)
+        configType = type(self)
+        typeString = _typeStr(configType)
+        outfile.write(u"import {}\n".format(configType.__module__))
+        outfile.write(u"assert type({})=={}, 'config is of type %s.%s ".format(root, typeString))
+        outfile.write(u"instead of {}' % (type({}).__module__, type({}).__name__)\n".format(typeString,
+                                                                                            root,
+                                                                                            root))
+        for imp in sorted(imports):
+            if imp in sys.modules and sys.modules[imp] is not None:
+                outfile.write(u"import {}\n".format(imp))
+        outfile.write(buffer.getvalue())
+
+    def loadStructured(self, filename):
+        """Modify this config in place by reading a structured config file
+        written by `saveStructured`.
+
+        Parameters
+        ----------
+        filename : `str`
+            Name of the structured configuration file.
+
+        See also
+        --------
+        lsst.pex.config.Config.loadStructuredFromStream
+        lsst.pex.config.Config.saveStructured
+        """
+        with open(filename, "r") as f:
+            self.loadStructuredFromStream(f)
+
+    def loadStructuredFromStream(self, stream):
+        """Modify this config in place by reading a structured config written
+        by `saveStructuredToStream`.
+
+        Parameters
+        ----------
+        stream : file-like object, `str` or `bytes`
+            Stream or string containing the structured (JSON) config.
+
+        Raises
+        ------
+        TypeError
+            Raised if the stream was saved from a different config type.
+        KeyError
+            Raised if the stream refers to a field this config does not have.
+
+        See also
+        --------
+        lsst.pex.config.Config.loadStructured
+        lsst.pex.config.Config.saveStructuredToStream
+
+        Notes
+        -----
+        Unlike `loadFromStream`, no code is executed: the modules recorded at
+        save time are imported (so that, for example, registries are
+        populated), then every field is set directly from the stored tree.
+        Values are validated exactly as for attribute assignment, and all the
+        resulting history entries share a single call stack.
+        """
+        if isinstance(stream, (str, bytes)):
+            data = json.loads(stream)
+        else:
+            data = json.load(stream)
+        self._fromStructured(data, label="load")
+
+    def saveStructured(self, filename):
+        """Save this config to the named file in a structured (JSON) format
+        that can be restored without executing code.
+
+        Parameters
+        ----------
+        filename : `str`
+            Destination filename of this configuration.
+
+        See also
+        --------
+        lsst.pex.config.Config.saveStructuredToStream
+        lsst.pex.config.Config.loadStructured
+        """
+        d = os.path.dirname(filename)
+        with tempfile.NamedTemporaryFile(mode="w", delete=False, dir=d) as outfile:
+            self.saveStructuredToStream(outfile)
+            umask = os.umask(0o077)
+            os.umask(umask)
+            os.chmod(outfile.name, (~umask & 0o666))
+            shutil.move(outfile.name, filename)
+
+    def saveStructuredToStream(self, outfile):
+        """Save this config to a stream in a structured (JSON) format that can
+        be restored without executing code.
+
+        Parameters
+        ----------
+        outfile : file-like object
+            Destination file object write the config into. Accepts strings not
+            bytes.
+
+        See also
+        --------
+        lsst.pex.config.Config.saveStructured
+        lsst.pex.config.Config.loadStructuredFromStream
+
+        Notes
+        -----
+        The output is a JSON object with the config ``type``, the ``imports``
+        needed to restore it and the field ``values``. The values tree follows
+        the same walk as `saveToStream`: subconfigs become nested objects,
+        `~lsst.pex.config.ConfigChoiceField` nodes hold the selection and the
+        choice values, `~lsst.pex.config.ConfigurableField` nodes record any
+        retargeting, and dictionaries are stored as lists of ``[key, value]``
+        pairs so that non-string keys survive the round trip.
+        """
+        data = self._toStructured()
+        # json.dumps uses the C encoder; json.dump writes chunks from the
+        # pure-Python one
+        outfile.write(json.dumps(data, separators=(",", ":")))
+
+    def copy(self):
+        """Make a copy of this config.
+
+        Returns
+        -------
+        config : `lsst.pex.config.Config`
+            A config of the same type, with the same values and history as
+            this one. It is not frozen, even if this config is.
+
+        Notes
+        -----
+        The copy shares immutable field values and history events with this
+        config. Subconfigs of a frozen config are copied lazily: a subconfig
+        of the copy only duplicates the values of the original the first time
+        it is accessed, so copies of a large frozen config that modify a few
+        fields are cheap to make and to keep.
+        """
+        return self._copy()
+
+    def _copy(self):
+        """Make a copy of this config for `copy` and of subconfigs for
+        `Field._copyValue` (for internal use only).
+
+        If this config is frozen, the copy keeps a reference to it and copies
+        its fields when its storage is first accessed (see `__getattr__`);
+        otherwise the fields are copied immediately.
+        """
+        other = object.__new__(type(self))
+        object.__setattr__(other, "_name", self._name)
+        object.__setattr__(other, "_frozen", False)
+        object.__setattr__(other, "_validated", self._validated)
+        object.__setattr__(other, "_modified", next(_modificationCounter))
+        object.__setattr__(other, "_fingerprint", None)
+        object.__setattr__(other, "_copiedFrom", None)
         try:
-            self._collectImports()
-            # Remove self from the set, as it is handled explicitly below
-            self._imports.remove(self.__module__)
-            configType = type(self)
-            typeString = _typeStr(configType)
-            outfile.write(u"import {}\n".format(configType.__module__))
-            outfile.write(u"assert type({})=={}, 'config is of type %s.%s ".format(root, typeString))
-            outfile.write(u"instead of {}' % (type({}).__module__, type({}).__name__)\n".format(typeString,
-                                                                                                root,
-                                                                                                root))
-            for imp in self._imports:
-                if imp in sys.modules and sys.modules[imp] is not None:
-                    outfile.write(u"import {}\n".format(imp))
-            self._save(outfile)
-        finally:
-            self._rename(tmp)
+            imports = object.__getattribute__(self, "_imports")
+        except AttributeError:
+            pass
+        else:
+            object.__setattr__(other, "_imports", set(imports))
+        state = getattr(self, "__dict__", None)
+        if state:
+            other.__dict__.update(state)
+        if self._frozen:
+            object.__setattr__(other, "_copiedFrom", self)
+        else:
+            other._copyFields(self)
+        return other
+
+    def _copyFields(self, source):
+        """Copy the history and field values of a config into this copy of
+        it (for internal use only).
+        """
+        object.__setattr__(self, "_history",
+                           _FieldHistory(self._fields, ((name, list(events))
+                                                        for name, events in source._history.items())))
+        storage = dict(source._storage)
+        for field in self._getCopiedFields():
+            if field.name in storage:
+                storage[field.name] = field._copyValue(self, storage[field.name])
+        object.__setattr__(self, "_storage", storage)
+        object.__setattr__(self, "_copiedFrom", None)
+
+    def __getattr__(self, attr):
+        # Called only for attributes that are not set. The set of imports is
+        # created when first used, and the storage and history of a lazy copy
+        # made by ``_copy`` are copied from the original when first used.
+        if attr == "_imports":
+            imports = set()
+            object.__setattr__(self, "_imports", imports)
+            return imports
+        if attr in ("_storage", "_history") and self._copiedFrom is not None:
+            self._copyFields(self._copiedFrom)
+            return object.__getattribute__(self, attr)
+        raise AttributeError("%r object has no attribute %r" % (type(self).__name__, attr))
 
     def freeze(self):
         """Make this config, and all subconfigs, read-only.
@@ -1116,8 +2214,140 @@ class Config(metaclass=ConfigMeta):
             Destination file object write the config into. Accepts strings not
             bytes.
         """
+        self._saveNamed(outfile, self._name, set())
+
+    def _saveNamed(self, outfile, prefix, imports, reference=None):
+        """Save this config to an open stream object, naming it ``prefix``,
+        and collect the modules it needs (for internal use only).
+
+        Parameters
+        ----------
+        outfile : file-like object
+            Destination file object write the config into. Accepts strings not
+            bytes.
+        prefix : `str`
+            Full name of this config in the saved file.
+        imports : `set`
+            Set of python modules that need imported after persistence, to be
+            updated with the modules this config and its subconfigs need.
+        reference : `Config`, optional
+            If provided, only save the fields that differ from ``reference``,
+            without documentation (see `Field._saveNamed`).
+
+        Notes
+        -----
+        Unlike `_save` and `_collectImports`, this does not rename or modify
+        this config or its subconfigs, except around fields that customize
+        `Field.save` without implementing `Field._saveNamed`, which are saved
+        after renaming this config to ``prefix``.
+        """
+        imports.add(self.__module__)
+        try:
+            imports |= object.__getattribute__(self, "_imports")
+        except AttributeError:
+            pass
+        name = self._name
         for field in self._fields.values():
-            field.save(outfile, self)
+            if _savesNamed(type(field)):
+                field._saveNamed(outfile, self, prefix, imports, reference)
+                continue
+            if self._name != prefix:
+                self._rename(prefix)
+            try:
+                field._collectImports(self, imports)
+                field.save(outfile, self)
+            finally:
+                if self._name != name:
+                    self._rename(name)
+
+    def _toStructured(self):
+        """Build the structured document of this config: its type, the
+        modules to import and the tree of field values.
+
+        Returns
+        -------
+        data : `dict`
+            JSON-compatible document, as written by `saveStructuredToStream`.
+
+        Raises
+        ------
+        NotImplementedError
+            Raised if a field in this config or its subconfigs customizes
+            `Field.save` without providing the structured equivalent.
+        """
+        values = self._saveStructured()
+        self._collectImports()
+        imports = [imp for imp in sorted(self._imports)
+                   if imp in sys.modules and sys.modules[imp] is not None]
+        return {"type": _typeStr(self), "imports": imports, "values": values}
+
+    def _fromStructured(self, data, label):
+        """Modify this config in place from a document built by
+        `_toStructured`.
+
+        Parameters
+        ----------
+        data : `dict`
+            Structured document.
+        label : `str`
+            Event label for the history.
+
+        Raises
+        ------
+        TypeError
+            Raised if the document was built from a different config type.
+        """
+        typeString = _typeStr(self)
+        if data["type"] != typeString:
+            raise TypeError("Structured config is of type %s instead of %s" % (data["type"], typeString))
+        for imp in data["imports"]:
+            importlib.import_module(imp)
+        self._imports.update(data["imports"])
+
+        at = getCallStack(1) if self._recordsHistory() else None
+        self._loadStructured(data["values"], at=at, label=label)
+
+    def _saveStructured(self):
+        """Build the structured tree of this config (for internal use only).
+
+        Returns
+        -------
+        data : `dict`
+            JSON-compatible tree keyed by field name.
+
+        Raises
+        ------
+        NotImplementedError
+            Raised if a field customizes `Field.save` without providing the
+            structured equivalent.
+        """
+        data = {}
+        for field in self._fields.values():
+            if not _savesStructured(type(field)):
+                raise NotImplementedError("Field %s of %s does not support structured persistence" %
+                                          (field.name, _typeStr(self)))
+            field._saveStructured(self, data)
+        return data
+
+    def _loadStructured(self, data, at, label):
+        """Set fields from a tree built by `_saveStructured` (for internal use
+        only).
+
+        Parameters
+        ----------
+        data : `dict`
+            Structured tree keyed by field name.
+        at : `list` of `lsst.pex.config.callStack.StackFrame`
+            The call stack shared by every field set.
+        label : `str`
+            Event label for the history.
+        """
+        for name, node in data.items():
+            try:
+                field = self._fields[name]
+            except KeyError:
+                raise KeyError("No field of name %s exists in config type %s" % (name, _typeStr(self)))
+            field._loadStructured(self, node, at=at, label=label)
 
     def _collectImports(self):
         """Adds module containing self to the list of things to import and
@@ -1161,28 +2391,53 @@ class Config(metaclass=ConfigMeta):
         -------
         names : `list` of `str`
             Field names.
+
+        See also
+        --------
+        lsst.pex.config.Config.walk
         """
-        #
-        # Rather than sort out the recursion all over again use the
-        # pre-existing saveToStream()
-        #
-        with io.StringIO() as strFd:
-            self.saveToStream(strFd, "config")
-            contents = strFd.getvalue()
-            strFd.close()
-        #
-        # Pull the names out of the dumped config
-        #
-        keys = []
-        for line in contents.split("\n"):
-            if re.search(r"^((assert|import)\s+|\s*$|#)", line):
-                continue
+        return [name for name, field, value in self._walk(None)]
 
-            mat = re.search(r"^(?:config\.)?([^=]+)\s*=\s*.*", line)
-            if mat:
-                keys.append(mat.group(1))
+    def walk(self):
+        """Iterate over the fields of this config and its subconfigs.
 
-        return keys
+        Yields
+        ------
+        name : `str`
+            Name relative to this config, e.g. ``"sub.field"`` or
+            ``"choice['a'].field"``.
+        field : `lsst.pex.config.Field`
+            The field holding the value.
+        value : object
+            The value.
+
+        See also
+        --------
+        lsst.pex.config.Config.names
+
+        Notes
+        -----
+        One entry is yielded for each assignment written by `saveToStream`, in
+        the same order, but without serializing anything:
+
+        - fields holding a subconfig (`~lsst.pex.config.ConfigField` and
+          `~lsst.pex.config.ConfigurableField`) yield the entries of their
+          subconfig instead of themselves;
+        - a `~lsst.pex.config.ConfigChoiceField` yields the entries of each of
+          its configs, then its ``name`` (or ``names``) with the selection as
+          value;
+        - a `~lsst.pex.config.ConfigDictField` yields itself, then each item
+          followed by the entries of that item;
+        - deprecated fields left at their default are skipped.
+        """
+        return self._walk(None)
+
+    def _walk(self, prefix):
+        """Iterate over the fields of this config, naming them relative to
+        ``prefix`` (for internal use only).
+        """
+        for field in self._fields.values():
+            yield from field._walk(self, prefix)
 
     def _rename(self, name):
         """Rename this config object in its parent `~lsst.pex.config.Config`.
@@ -1207,9 +2462,15 @@ class Config(metaclass=ConfigMeta):
         for field in self._fields.values():
             field.rename(self)
 
-    def validate(self):
+    def validate(self, force=False):
         """Validate the Config, raising an exception if invalid.
 
+        Parameters
+        ----------
+        force : `bool`, optional
+            If `True`, validate every field of every config again, even those
+            unchanged since they last passed validation.
+
         Raises
         ------
         lsst.pex.config.FieldValidationError
@@ -1220,6 +2481,13 @@ class Config(metaclass=ConfigMeta):
         The base class implementation performs type checks on all fields by
         calling their `~lsst.pex.config.Field.validate` methods.
 
+        The base class implementation returns immediately if neither this
+        config nor any subconfig it validates has been modified since it last
+        passed validation. Forcing validation discards these results for all
+        configs, so it is needed when a check depends on state outside the
+        config (for example, the contents of a registry). Inter-field checks
+        in derived classes run on every call.
+
         Complex single-field validation can be defined by deriving new Field
         types. For convenience, some derived `lsst.pex.config.Field`-types
         (`~lsst.pex.config.ConfigField` and
@@ -1230,8 +2498,139 @@ class Config(metaclass=ConfigMeta):
         `~lsst.pex.config.Config` classes after calling this method, and base
         validation is complete.
         """
+        global _validationEpoch
+        if force:
+            _validationEpoch += 1
+        elif self._isValidated():
+            return
         for field in self._fields.values():
             field.validate(self)
+        object.__setattr__(self, "_validated", _validationEpoch)
+
+    def _isValidated(self):
+        """Test whether this config and the subconfigs it validates are
+        unchanged since they last passed validation (for internal use only).
+        """
+        if self._validated != _validationEpoch:
+            return False
+        for field in self._getSubconfigFields():
+            if not field._isValidated(self):
+                return False
+        return True
+
+    @classmethod
+    def _getSubconfigFields(cls):
+        """Get the fields of this class that hold subconfigs (for internal use
+        only).
+
+        Returns
+        -------
+        fields : `list` of `lsst.pex.config.Field`
+            Fields overriding `Field._isValidated` or `Field._subconfigs`;
+            the default implementations of these hooks do nothing for other
+            fields, so they need not be called.
+        """
+        fields = cls._subconfigFields
+        if fields is None:
+            fields = [field for field in cls._fields.values()
+                      if type(field)._isValidated is not Field._isValidated or
+                      type(field)._subconfigs is not Field._subconfigs]
+            cls._subconfigFields = fields
+        return fields
+
+    @classmethod
+    def _getCopiedFields(cls):
+        """Get the fields of this class whose values must be copied by `copy`
+        (for internal use only).
+
+        Returns
+        -------
+        fields : `list` of `lsst.pex.config.Field`
+            Fields overriding `Field._copyValue`; the values of other fields
+            are shared by copies.
+        """
+        fields = cls._copiedFields
+        if fields is None:
+            fields = [field for field in cls._fields.values()
+                      if type(field)._copyValue is not Field._copyValue]
+            cls._copiedFields = fields
+        return fields
+
+    def _markModified(self):
+        """Record that a field of this config changed (for internal use only).
+
+        This must be called whenever a field value, or a container holding
+        one, is modified, so that cached state derived from the values (such
+        as the result of `validate` and the `fingerprint`) is discarded.
+        """
+        object.__setattr__(self, "_validated", None)
+        object.__setattr__(self, "_modified", next(_modificationCounter))
+
+    def _isModifiedSince(self, stamp):
+        """Test whether this config or any of its subconfigs was modified
+        after the given stamp from ``_modificationCounter`` (for internal use
+        only).
+        """
+        if self._modified > stamp:
+            return True
+        for field in self._getSubconfigFields():
+            for config in field._subconfigs(self):
+                if config._isModifiedSince(stamp):
+                    return True
+        return False
+
+    def fingerprint(self):
+        """Compute a digest of the contents of this config.
+
+        Returns
+        -------
+        fingerprint : `str`
+            Hexadecimal SHA-256 digest of the type of this config and the tree
+            of its values written by `saveStructuredToStream`.
+
+        Raises
+        ------
+        NotImplementedError
+            Raised if a field does not support structured persistence.
+
+        Notes
+        -----
+        Configs with the same fingerprint have identical values, so the
+        fingerprint can be used as a `dict` key to cache results derived from
+        a config. Configs that compare equal may still have different
+        fingerprints, for example if a `~lsst.pex.config.DictField` was filled
+        in a different order, or if different alternatives of a
+        `~lsst.pex.config.ConfigChoiceField` have been instantiated.
+
+        The fingerprint is cached until this config or one of its subconfigs
+        is modified, and permanently once the config is frozen.
+        """
+        cached = self._fingerprint
+        if cached is not None:
+            digest, stamp, permanent = cached
+            if permanent or not self._isModifiedSince(stamp):
+                if self._frozen and not permanent:
+                    object.__setattr__(self, "_fingerprint", (digest, stamp, True))
+                return digest
+        data = {"type": _typeStr(self), "values": self._saveStructured()}
+        digest = hashlib.sha256(json.dumps(data, separators=(",", ":")).encode()).hexdigest()
+        # stamp after saving, which may create subconfigs
+        object.__setattr__(self, "_fingerprint", (digest, next(_modificationCounter), self._frozen))
+        return digest
+
+    def _cheapFingerprint(self):
+        """Get the fingerprint of this config if it is already cached and
+        still valid, without computing it (for internal use only).
+
+        Returns
+        -------
+        fingerprint : `str` or `None`
+            The fingerprint, or `None` if it is not cached.
+        """
+        cached = self._fingerprint
+        if cached is not None and (cached[2] or not self._isModifiedSince(cached[1])):
+            return cached[0]
+        return None
 
     def formatHistory(self, name, **kwargs):
         """Format a configuration field's history to a human-readable format.
@@ -1255,10 +2654,51 @@ class Config(metaclass=ConfigMeta):
         import lsst.pex.config.history as pexHist
         return pexHist.format(self, name, **kwargs)
 
-    history = property(lambda x: x._history)
-    """Read-only history.
+    history = property(lambda x: _HistoryView(x._history))
+    """Read-only history: a mapping from field name to a `list` of events
+    ``(value, stack, label)``.
     """
 
+    def _recordsHistory(self):
+        """Return whether history events are currently recorded for this
+        config (`bool`).
+
+        Callers should check this before capturing a call stack or building
+        an expensive history event.
+
+        See also
+        --------
+        lsst.pex.config.history.setHistoryLimit
+        """
+        return getHistoryLimit(type(self)) != 0
+
+    def _addHistory(self, name, event):
+        """Record a history event for a field, respecting the history limit.
+
+        Parameters
+        ----------
+        name : `str`
+            Name of the field.
+        event : `tuple`
+            History event: ``(value, stack, label)``.
+
+        See also
+        --------
+        lsst.pex.config.history.setHistoryLimit
+        """
+        history = self._history.setdefault(name, [])
+        limit = getHistoryLimit(type(self))
+        if limit is None:
+            history.append(event)
+        elif limit > 0:
+            history.append(event)
+            if len(history) > limit:
+                excess = len(history) - limit
+                if type(history[excess][0]) is _HistoryDelta:
+                    # the first event that is kept must hold a full value
+                    history[excess] = _replayHistory(history[:excess + 1])[-1]
+                del history[:excess]
+
     def __setattr__(self, attr, value, at=None, label="assignment"):
         """Set an attribute (such as a field's value).
 
@@ -1277,15 +2717,17 @@ class Config(metaclass=ConfigMeta):
                 fullname = _joinNamePath(self._name, self._fields[attr].name)
                 warnings.warn(f"Config field {fullname} is deprecated: {self._fields[attr].deprecated}",
                               FutureWarning)
-            if at is None:
+            if at is None and self._recordsHistory():
                 at = getCallStack()
             # This allows Field descriptors to work.
             self._fields[attr].__set__(self, value, at=at, label=label)
         elif hasattr(getattr(self.__class__, attr, None), '__set__'):
             # This allows properties and other non-Field descriptors to work.
             return object.__setattr__(self, attr, value)
-        elif attr in self.__dict__ or attr in ("_name", "_history", "_storage", "_frozen", "_imports"):
+        elif attr in Config.__slots__:
             # This allows specific private attributes to work.
+            object.__setattr__(self, attr, value)
+        elif attr in getattr(self, "__dict__", ()):
             self.__dict__[attr] = value
         else:
             # We throw everything else.
@@ -1293,7 +2735,7 @@ class Config(metaclass=ConfigMeta):
 
     def __delattr__(self, attr, at=None, label="deletion"):
         if attr in self._fields:
-            if at is None:
+            if at is None and self._recordsHistory():
                 at = getCallStack()
             self._fields[attr].__delete__(self, at=at, label=label)
         else:
@@ -1301,6 +2743,9 @@ class Config(metaclass=ConfigMeta):
 
     def __eq__(self, other):
         if type(other) == type(self):
+            fingerprint = self._cheapFingerprint()
+            if fingerprint is not None and fingerprint == other._cheapFingerprint():
+                return True
             for name in self._fields:
                 thisValue = getattr(self, name)
                 otherValue = getattr(other, name)
@@ -1360,8 +2805,19 @@ class Config(metaclass=ConfigMeta):
         unselected choices of `~lsst.pex.config.ConfigChoiceField` fields
         are not considered by this method.
 
-        Floating point comparisons are performed by `numpy.allclose`.
+        Field values, and the items of `~lsst.pex.config.ListField` and
+        `~lsst.pex.config.DictField` fields, are compared by
+        `~lsst.pex.config.compareScalars`; floating point values are equal if
+        they are within the tolerances given by ``rtol`` and ``atol``.
+
+        If the `fingerprint` of both configs is already cached and the
+        fingerprints match, the configs are equal without comparing each
+        field; fingerprints are never computed just for a comparison.
         """
+        if type(other) is type(self):
+            fingerprint = self._cheapFingerprint()
+            if fingerprint is not None and fingerprint == other._cheapFingerprint():
+                return True
         name1 = self._name if self._name is not None else "config"
         name2 = other._name if other._name is not None else "config"
         name = getComparisonName(name1, name2)
@@ -1392,3 +2848,37 @@ def unreduceConfig(cls, stream):
     config = cls()
     config.loadFromStream(stream)
     return config
+
+
+def unreduceStructuredConfig(cls, data):
+    """Create a `~lsst.pex.config.Config` from a structured document.
+
+    Parameters
+    ----------
+    cls : `lsst.pex.config.Config`-type
+        A `lsst.pex.config.Config` type (not an instance) that is instantiated
+        with the configurations in ``data``.
+    data : `dict`
+        Structured document built by `lsst.pex.config.Config.__reduce__`.
+
+    Returns
+    -------
+    config : `lsst.pex.config.Config`
+        Config instance.
+
+    Notes
+    -----
+    `~lsst.pex.config.Config.setDefaults` is not called: the document holds
+    the value of every field except deprecated fields left at
+    `~lsst.pex.config.Field.default`, so the fields are set directly from it.
+    The ``__init__`` method of ``cls`` is still called, as it would be by
+    ``cls()``.
+
+    See also
+    --------
+    lsst.pex.config.Config.loadStructuredFromStream
+    """
+    config = cls.__new__(cls, __setDefaults=False)
+    config.__init__()
+    config._fromStructured(data, label="unpickle")
+    return config
@@ -24,11 +24,42 @@ __all__ = ["ConfigChoiceField"]
 import copy
 import collections.abc
 
-from .config import Config, Field, FieldValidationError, _typeStr, _joinNamePath
+from .config import Config, Field, FieldValidationError, _typeStr, _joinNamePath, _FieldValue
 from .comparison import getComparisonName, compareScalars, compareConfigs
 from .callStack import getCallStack, getStackFrame
 
 
+class _TypemapSnapshot(collections.abc.Mapping):
+    """Read-only copy of a typemap, taken when a config with a
+    `~lsst.pex.config.ConfigChoiceField` is frozen (for internal use only).
+
+    Parameters
+    ----------
+    typemap : `dict`-like
+        The typemap to copy.
+    """
+
+    __slots__ = ("_dict",)
+
+    def __init__(self, typemap):
+        self._dict = dict(typemap)
+
+    def __getitem__(self, k):
+        return self._dict[k]
+
+    def __iter__(self):
+        return iter(self._dict)
+
+    def __len__(self):
+        return len(self._dict)
+
+    def __contains__(self, k):
+        return k in self._dict
+
+    def _snapshot(self):
+        return self
+
+
 class SelectionSet(collections.abc.MutableSet):
     """A mutable set class that tracks the selection of multi-select
     `~lsst.pex.config.ConfigChoiceField` objects.
@@ -54,13 +85,15 @@ class SelectionSet(collections.abc.MutableSet):
     history.
     """
 
+    __slots__ = ("_dict", "_field", "_config", "_set")
+
     def __init__(self, dict_, value, at=None, label="assignment", setHistory=True):
-        if at is None:
-            at = getCallStack()
         self._dict = dict_
         self._field = self._dict._field
         self._config = self._dict._config
-        self.__history = self._config._history.setdefault(self._field.name, [])
+        record = self._config._recordsHistory()
+        if at is None and record:
+            at = getCallStack()
         if value is not None:
             try:
                 for v in value:
@@ -74,8 +107,8 @@ class SelectionSet(collections.abc.MutableSet):
         else:
             self._set = set()
 
-        if setHistory:
-            self.__history.append(("Set selection to %s" % self, at, label))
+        if setHistory and record:
+            self._config._addHistory(self._field.name, ("Set selection to %s" % self, at, label))
 
     def add(self, value, at=None):
         """Add a value to the selected set.
@@ -84,15 +117,18 @@ class SelectionSet(collections.abc.MutableSet):
             raise FieldValidationError(self._field, self._config,
                                        "Cannot modify a frozen Config")
 
-        if at is None:
+        record = self._config._recordsHistory()
+        if at is None and record:
             at = getCallStack()
 
         if value not in self._dict:
             # invoke __getitem__ to make sure it's present
             self._dict.__getitem__(value, at=at)
 
-        self.__history.append(("added %s to selection" % value, at, "selection"))
+        if record:
+            self._config._addHistory(self._field.name, ("added %s to selection" % value, at, "selection"))
         self._set.add(value)
+        self._config._markModified()
 
     def discard(self, value, at=None):
         """Discard a value from the selected set.
@@ -104,11 +140,12 @@ class SelectionSet(collections.abc.MutableSet):
         if value not in self._dict:
             return
 
-        if at is None:
-            at = getCallStack()
-
-        self.__history.append(("removed %s from selection" % value, at, "selection"))
+        if self._config._recordsHistory():
+            if at is None:
+                at = getCallStack()
+            self._config._addHistory(self._field.name, ("removed %s from selection" % value, at, "selection"))
         self._set.discard(value)
+        self._config._markModified()
 
     def __len__(self):
         return len(self._set)
@@ -126,7 +163,7 @@ class SelectionSet(collections.abc.MutableSet):
         return str(list(self._set))
 
 
-class ConfigInstanceDict(collections.abc.Mapping):
+class ConfigInstanceDict(collections.abc.Mapping, _FieldValue):
     """Dictionary of instantiated configs, used to populate a
     `~lsst.pex.config.ConfigChoiceField`.
 
@@ -139,6 +176,8 @@ class ConfigInstanceDict(collections.abc.Mapping):
         attribute must provide key-based access to configuration classes,
         (that is, ``typemap[name]``).
     """
+    __slots__ = ("_dict", "_selection", "_config", "_field", "_history")
+
     def __init__(self, config, field):
         collections.abc.Mapping.__init__(self)
         self._dict = dict()
@@ -146,7 +185,6 @@ class ConfigInstanceDict(collections.abc.Mapping):
         self._config = config
         self._field = field
         self._history = config._history.setdefault(field.name, [])
-        self.__doc__ = field.doc
 
     types = property(lambda x: x._field.typemap)
 
@@ -163,7 +201,8 @@ class ConfigInstanceDict(collections.abc.Mapping):
         if self._config._frozen:
             raise FieldValidationError(self._field, self._config, "Cannot modify a frozen Config")
 
-        if at is None:
+        record = self._config._recordsHistory()
+        if at is None and record:
             at = getCallStack(1)
 
         if value is None:
@@ -174,7 +213,9 @@ class ConfigInstanceDict(collections.abc.Mapping):
             if value not in self._dict:
                 self.__getitem__(value, at=at)  # just invoke __getitem__ to make sure it's present
             self._selection = value
-        self._history.append((value, at, label))
+        self._config._markModified()
+        if record:
+            self._config._addHistory(self._field.name, (value, at, label))
 
     def _getNames(self):
         if not self._field.multi:
@@ -182,17 +223,18 @@ class ConfigInstanceDict(collections.abc.Mapping):
                                        "Single-selection field has no attribute 'names'")
         return self._selection
 
-    def _setNames(self, value):
+    def _setNames(self, value, at=None, label="assignment"):
         if not self._field.multi:
             raise FieldValidationError(self._field, self._config,
                                        "Single-selection field has no attribute 'names'")
-        self._setSelection(value)
+        self._setSelection(value, at=at, label=label)
 
     def _delNames(self):
         if not self._field.multi:
             raise FieldValidationError(self._field, self._config,
                                        "Single-selection field has no attribute 'names'")
         self._selection = None
+        self._config._markModified()
 
     def _getName(self):
         if self._field.multi:
@@ -200,17 +242,18 @@ class ConfigInstanceDict(collections.abc.Mapping):
                                        "Multi-selection field has no attribute 'name'")
         return self._selection
 
-    def _setName(self, value):
+    def _setName(self, value, at=None, label="assignment"):
         if self._field.multi:
             raise FieldValidationError(self._field, self._config,
                                        "Multi-selection field has no attribute 'name'")
-        self._setSelection(value)
+        self._setSelection(value, at=at, label=label)
 
     def _delName(self):
         if self._field.multi:
             raise FieldValidationError(self._field, self._config,
                                        "Multi-selection field has no attribute 'name'")
         self._selection = None
+        self._config._markModified()
 
     names = property(_getNames, _setNames, _delNames)
     """List of names of active items in a multi-selection
@@ -246,22 +289,45 @@ class ConfigInstanceDict(collections.abc.Mapping):
         except KeyError:
             try:
                 dtype = self._field.typemap[k]
+            except ImportError:
+                # a registry target that was registered by name
+                raise
             except Exception:
                 raise FieldValidationError(self._field, self._config,
                                            "Unknown key %r in Registry/ConfigChoiceField" % k)
             name = _joinNamePath(self._config._name, self._field.name, k)
-            if at is None:
+            if at is None and self._config._recordsHistory():
                 at = getCallStack()
                 at.insert(0, dtype._source)
             value = self._dict.setdefault(k, dtype(__name=name, __at=at, __label=label))
+            if self._config._frozen:
+                # alternatives are instantiated when first used, so they may
+                # be created after the config is frozen
+                value.freeze()
         return value
 
+    def _usedItems(self):
+        """Get the configs that have been instantiated, after instantiating
+        the selected ones (for internal use only).
+
+        Returns
+        -------
+        items : `list` of `tuple`
+            ``(name, config)`` pairs, in the order of the typemap.
+        """
+        if self._selection is not None:
+            for k in (self._selection if self._field.multi else [self._selection]):
+                self[k]
+        return [(k, self._dict[k]) for k in self._field.typemap if k in self._dict]
+
     def __setitem__(self, k, value, at=None, label="assignment"):
         if self._config._frozen:
             raise FieldValidationError(self._field, self._config, "Cannot modify a frozen Config")
 
         try:
             dtype = self._field.typemap[k]
+        except ImportError:
+            raise
         except Exception:
             raise FieldValidationError(self._field, self._config, "Unknown key %r" % k)
 
@@ -270,7 +336,7 @@ class ConfigInstanceDict(collections.abc.Mapping):
                 (value, k, _typeStr(value), _typeStr(dtype))
             raise FieldValidationError(self._field, self._config, msg)
 
-        if at is None:
+        if at is None and self._config._recordsHistory():
             at = getCallStack()
         name = _joinNamePath(self._config._name, self._field.name, k)
         oldValue = self._dict.get(k, None)
@@ -289,11 +355,14 @@ class ConfigInstanceDict(collections.abc.Mapping):
             v._rename(_joinNamePath(name=fullname, index=k))
 
     def __setattr__(self, attr, value, at=None, label="assignment"):
-        if hasattr(getattr(self.__class__, attr, None), '__set__'):
+        if attr == "name":
+            self._setName(value, at=at, label=label)
+        elif attr == "names":
+            self._setNames(value, at=at, label=label)
+        elif hasattr(getattr(self.__class__, attr, None), '__set__'):
             # This allows properties to work.
             object.__setattr__(self, attr, value)
-        elif attr in self.__dict__ or attr in ["_history", "_field", "_config", "_dict",
-                                               "_selection", "__doc__"]:
+        elif attr in ConfigInstanceDict.__slots__:
             # This allows specific private attributes to work.
             object.__setattr__(self, attr, value)
         else:
@@ -329,6 +398,11 @@ class ConfigChoiceField(Field):
     deprecated : None or `str`, optional
         A description of why this Field is deprecated, including removal date.
         If not None, the string is appended to the docstring for this Field.
+    saveAll : `bool`, optional
+        If `True`, saving and `~lsst.pex.config.Config.toDict` include every
+        config in the ``typemap``, instantiating those that have not been
+        used. If `False` (default), they only include the configs that have
+        been accessed or selected.
 
     See also
     --------
@@ -354,8 +428,12 @@ class ConfigChoiceField(Field):
     ``active`` attribute is `None` and the field is not optional, validation
     will fail.
 
-    When saving a configuration with a ``ConfigChoiceField``, the entire set is
-    saved, as well as the active selection.
+    The config for each key in the ``typemap`` is only instantiated when it is
+    first accessed or selected. When saving a configuration with a
+    ``ConfigChoiceField``, the active selection is saved together with the
+    configs that have been instantiated; the others still have their default
+    values, which are restored when they are instantiated after loading. Set
+    ``saveAll`` to save the entire set instead.
 
     Examples
     --------
@@ -408,22 +486,36 @@ class ConfigChoiceField(Field):
 
     instanceDictClass = ConfigInstanceDict
 
-    def __init__(self, doc, typemap, default=None, optional=False, multi=False, deprecated=None):
+    def __init__(self, doc, typemap, default=None, optional=False, multi=False, deprecated=None,
+                 saveAll=False):
         source = getStackFrame()
         self._setup(doc=doc, dtype=self.instanceDictClass, default=default, check=None, optional=optional,
                     source=source, deprecated=deprecated)
         self.typemap = typemap
         self.multi = multi
+        self.saveAll = saveAll
+
+    def _items(self, instanceDict):
+        """Get the configs of an instance of this field that are saved (for
+        internal use only).
+
+        Returns
+        -------
+        items : iterable of `tuple`
+            ``(name, config)`` pairs: every config in the ``typemap`` if
+            ``saveAll`` is set, otherwise only those that have been accessed
+            or selected.
+        """
+        return instanceDict.items() if self.saveAll else instanceDict._usedItems()
 
     def _getOrMake(self, instance, label="default"):
         instanceDict = instance._storage.get(self.name)
         if instanceDict is None:
-            at = getCallStack(1)
             instanceDict = self.dtype(instance, self)
-            instanceDict.__doc__ = self.doc
             instance._storage[self.name] = instanceDict
-            history = instance._history.setdefault(self.name, [])
-            history.append(("Initialized from defaults", at, label))
+            if instance._recordsHistory():
+                at = getCallStack(1)
+                instance._addHistory(self.name, ("Initialized from defaults", at, label))
 
         return instanceDict
 
@@ -436,7 +528,7 @@ class ConfigChoiceField(Field):
     def __set__(self, instance, value, at=None, label="assignment"):
         if instance._frozen:
             raise FieldValidationError(self, instance, "Cannot modify a frozen Config")
-        if at is None:
+        if at is None and instance._recordsHistory():
             at = getCallStack()
         instanceDict = self._getOrMake(instance)
         if isinstance(value, self.instanceDictClass):
@@ -474,7 +566,7 @@ class ConfigChoiceField(Field):
             dict_["name"] = instanceDict.name
 
         values = {}
-        for k, v in instanceDict.items():
+        for k, v in self._items(instanceDict):
             values[k] = v.toDict()
         dict_["values"] = values
 
@@ -482,29 +574,87 @@ class ConfigChoiceField(Field):
 
     def freeze(self, instance):
         # When a config is frozen it should not be affected by anything further
-        # being added to a registry, so create a deep copy of the registry
-        # typemap
-        self.typemap = copy.deepcopy(self.typemap)
+        # being added to a registry, so replace the typemap by a read-only
+        # snapshot; a snapshot is its own snapshot, so this is only done once
+        snapshot = getattr(self.typemap, "_snapshot", None)
+        self.typemap = snapshot() if snapshot is not None else _TypemapSnapshot(self.typemap)
         instanceDict = self.__get__(instance)
-        for v in instanceDict.values():
+        for v in instanceDict._dict.values():
             v.freeze()
 
     def _collectImports(self, instance, imports):
         instanceDict = self.__get__(instance)
-        for config in instanceDict.values():
+        for _, config in self._items(instanceDict):
             config._collectImports()
             imports |= config._imports
 
-    def save(self, outfile, instance):
+    def _saveNamed(self, outfile, instance, prefix, imports, reference=None):
         instanceDict = self.__get__(instance)
-        fullname = _joinNamePath(instance._name, self.name)
-        for v in instanceDict.values():
-            v._save(outfile)
+        fullname = _joinNamePath(prefix, self.name)
+        referenceDict = self.__get__(reference) if reference is not None else None
+        for k, v in self._items(instanceDict):
+            v._saveNamed(outfile, _joinNamePath(prefix, self.name, k), imports,
+                         referenceDict[k] if referenceDict is not None else None)
+        if referenceDict is not None:
+            if self.multi and instanceDict.names == referenceDict.names:
+                return
+            if not self.multi and instanceDict.name == referenceDict.name:
+                return
         if self.multi:
             outfile.write(u"{}.names={!r}\n".format(fullname, instanceDict.names))
         else:
             outfile.write(u"{}.name={!r}\n".format(fullname, instanceDict.name))
 
+    def _isValidated(self, instance):
+        instanceDict = self.__get__(instance)
+        active = instanceDict.active
+        if active is None:
+            return True
+        if not self.multi:
+            return active._isValidated()
+        return all(a._isValidated() for a in active)
+
+    def _subconfigs(self, instance):
+        return self.__get__(instance)._dict.values()
+
+    def _copyValue(self, instance, value):
+        copy = type(value)(instance, self)
+        copy._dict = {k: v._copy() for k, v in value._dict.items()}
+        selection = value._selection
+        if isinstance(selection, SelectionSet):
+            selection = SelectionSet(copy, None, at=(), setHistory=False)
+            selection._set.update(value._selection._set)
+        copy._selection = selection
+        return copy
+
+    def _walk(self, instance, prefix):
+        instanceDict = self.__get__(instance)
+        for k, v in self._items(instanceDict):
+            yield from v._walk(_joinNamePath(prefix, self.name, k))
+        if self.multi:
+            yield _joinNamePath(prefix, self.name) + ".names", self, instanceDict.names
+        else:
+            yield _joinNamePath(prefix, self.name) + ".name", self, instanceDict.name
+
+    def _saveStructured(self, instance, data):
+        instanceDict = self.__get__(instance)
+        node = {}
+        if self.multi:
+            names = instanceDict.names
+            # sorted, so that equal selections are saved identically
+            node["names"] = sorted(names, key=repr) if names is not None else None
+        else:
+            node["name"] = instanceDict.name
+        node["values"] = [[k, v._saveStructured()] for k, v in self._items(instanceDict)]
+        data[self.name] = node
+
+    def _loadStructured(self, instance, node, at, label):
+        instanceDict = self.__get__(instance)
+        for k, v in node["values"]:
+            instanceDict.__getitem__(k, at=at, label=label)._loadStructured(v, at=at, label=label)
+        selection = node["names"] if self.multi else node["name"]
+        instanceDict._setSelection(selection, at=at, label=label)
+
     def __deepcopy__(self, memo):
         """Customize deep-copying, because we always want a reference to the
         original typemap.
@@ -513,7 +663,7 @@ class ConfigChoiceField(Field):
         constructor signature!
         """
         other = type(self)(doc=self.doc, typemap=self.typemap, default=copy.deepcopy(self.default),
-                           optional=self.optional, multi=self.multi)
+                           optional=self.optional, multi=self.multi, saveAll=self.saveAll)
         other.source = self.source
         return other
 
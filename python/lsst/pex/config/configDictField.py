@@ -21,7 +21,8 @@
 
 __all__ = ["ConfigDictField"]
 
-from .config import Config, FieldValidationError, _autocast, _typeStr, _joinNamePath
+from .config import (Config, FieldValidationError, _autocast, _typeStr, _joinNamePath,
+                     _encodeStructured, _decodeStructured)
 from .dictField import Dict, DictField
 from .comparison import compareConfigs, compareScalars, getComparisonName
 from .callStack import getCallStack, getStackFrame
@@ -34,9 +35,12 @@ class ConfigDict(Dict):
     the history of changes to any of its items.
     """
 
+    __slots__ = ()
+
     def __init__(self, config, field, value, at, label):
         Dict.__init__(self, config, field, value, at, label, setHistory=False)
-        self.history.append(("Dict initialized", at, label))
+        if self._config._recordsHistory():
+            self._config._addHistory(self._field.name, ("Dict initialized", at, label))
 
     def __setitem__(self, k, x, at=None, label="setitem", setHistory=True):
         if self._config._frozen:
@@ -44,6 +48,15 @@ class ConfigDict(Dict):
                   "Attempting to set item at key %r to value %s" % (k, x)
             raise FieldValidationError(self._field, self._config, msg)
 
+        k, x = self._castItem(k, x)
+        record = setHistory and self._config._recordsHistory()
+        if at is None and record:
+            at = getCallStack()
+        message = self._setItem(k, x, at, label)
+        if record:
+            self._config._addHistory(self._field.name, (message % k, at, label))
+
+    def _castItem(self, k, x):
         # validate keytype
         k = _autocast(k, self._field.keytype)
         if type(k) != self._field.keytype:
@@ -52,14 +65,23 @@ class ConfigDict(Dict):
             raise FieldValidationError(self._field, self._config, msg)
 
         # validate itemtype
-        dtype = self._field.itemtype
         if type(x) != self._field.itemtype and x != self._field.itemtype:
             msg = "Value %s at key %r is of incorrect type %s. Expected type %s" % \
                 (x, k, _typeStr(x), _typeStr(self._field.itemtype))
             raise FieldValidationError(self._field, self._config, msg)
+        return k, x
 
-        if at is None:
-            at = getCallStack()
+    def _setItem(self, k, x, at, label):
+        """Add a config at a key, or update the config already there (for
+        internal use only).
+
+        Returns
+        -------
+        message : `str`
+            Description of the change for the history, with a ``%s`` for the
+            key.
+        """
+        dtype = self._field.itemtype
         name = _joinNamePath(self._config._name, self._field.name, k)
         oldValue = self._dict.get(k, None)
         if oldValue is None:
@@ -67,20 +89,34 @@ class ConfigDict(Dict):
                 self._dict[k] = dtype(__name=name, __at=at, __label=label)
             else:
                 self._dict[k] = dtype(__name=name, __at=at, __label=label, **x._storage)
-            if setHistory:
-                self.history.append(("Added item at key %s" % k, at, label))
+            self._config._markModified()
+            return "Added item at key %s"
         else:
             if x == dtype:
                 x = dtype()
             oldValue.update(__at=at, __label=label, **x._storage)
-            if setHistory:
-                self.history.append(("Modified item at key %s" % k, at, label))
+            return "Modified item at key %s"
+
+    def _updateItems(self, items, at, label):
+        for k, x in items.items():
+            self._setItem(k, x, at, label)
+        if at is not None and items:
+            self._config._addHistory(self._field.name,
+                                     ("Updated items at keys %s" % ", ".join(map(str, items)), at, label))
+
+    def _clearItems(self, at, label):
+        self._dict.clear()
+        self._config._markModified()
+        if at is not None:
+            self._config._addHistory(self._field.name, ("Removed all items", at, label))
 
     def __delitem__(self, k, at=None, label="delitem"):
-        if at is None:
+        record = self._config._recordsHistory()
+        if at is None and record:
             at = getCallStack()
         Dict.__delitem__(self, k, at, label, False)
-        self.history.append(("Removed item at key %s" % k, at, label))
+        if record:
+            self._config._addHistory(self._field.name, ("Removed item at key %s" % k, at, label))
 
 
 class ConfigDictField(DictField):
@@ -191,17 +227,71 @@ class ConfigDictField(DictField):
 
         return dict_
 
-    def save(self, outfile, instance):
+    def _saveNamed(self, outfile, instance, prefix, imports, reference=None):
         configDict = self.__get__(instance)
-        fullname = _joinNamePath(instance._name, self.name)
+        fullname = _joinNamePath(prefix, self.name)
+        if reference is not None:
+            referenceDict = self.__get__(reference)
+            if configDict is None and referenceDict is None:
+                return
+            if configDict is not None and referenceDict is not None and not configDict and not referenceDict:
+                return
         if configDict is None:
             outfile.write(u"{}={!r}\n".format(fullname, configDict))
             return
 
         outfile.write(u"{}={!r}\n".format(fullname, {}))
-        for v in configDict.values():
-            outfile.write(u"{}={}()\n".format(v._name, _typeStr(v)))
-            v._save(outfile)
+        for k, v in configDict.items():
+            name = _joinNamePath(prefix, self.name, k)
+            outfile.write(u"{}={}()\n".format(name, _typeStr(v)))
+            # Items are saved as new configs, so only differences from a new
+            # config of the same type need to be written in compact form
+            v._saveNamed(outfile, name, imports, type(v)() if reference is not None else None)
+
+    def _walk(self, instance, prefix):
+        configDict = self.__get__(instance)
+        yield _joinNamePath(prefix, self.name), self, configDict
+        if configDict is not None:
+            for k, v in configDict.items():
+                name = _joinNamePath(prefix, self.name, k)
+                yield name, self, v
+                yield from v._walk(name)
+
+    def _saveStructured(self, instance, data):
+        configDict = self.__get__(instance)
+        if configDict is None:
+            data[self.name] = None
+        else:
+            data[self.name] = [[_encodeStructured(k), v._saveStructured()] for k, v in configDict.items()]
+
+    def _loadStructured(self, instance, node, at, label):
+        self.__set__(instance, None if node is None else {}, at=at, label=label)
+        if node is not None:
+            configDict = self.__get__(instance)
+            for k, v in node:
+                k = _decodeStructured(k)
+                configDict.__setitem__(k, self.itemtype, at=at, label=label)
+                configDict[k]._loadStructured(v, at=at, label=label)
+
+    def _isValidated(self, instance):
+        configDict = self.__get__(instance)
+        if configDict is not None:
+            for item in configDict.values():
+                if not item._isValidated():
+                    return False
+        return True
+
+    def _subconfigs(self, instance):
+        configDict = self.__get__(instance)
+        return configDict.values() if configDict is not None else ()
+
+    def _copyValue(self, instance, value):
+        if value is None:
+            return None
+        copy = object.__new__(type(value))
+        Dict.__init__(copy, instance, self, None, None, "copy", setHistory=False)
+        copy._dict = {k: v._copy() for k, v in value._dict.items()}
+        return copy
 
     def freeze(self, instance):
         configDict = self.__get__(instance)
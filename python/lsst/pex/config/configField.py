@@ -88,8 +88,10 @@ class ConfigField(Field):
         else:
             value = instance._storage.get(self.name, None)
             if value is None:
-                at = getCallStack()
-                at.insert(0, self.source)
+                at = None
+                if instance._recordsHistory():
+                    at = getCallStack()
+                    at.insert(0, self.source)
                 self.__set__(instance, self.default, at=at, label="default")
             return value
 
@@ -104,7 +106,8 @@ class ConfigField(Field):
                 (value, _typeStr(value), _typeStr(self.dtype))
             raise FieldValidationError(self, instance, msg)
 
-        if at is None:
+        record = instance._recordsHistory()
+        if at is None and record:
             at = getCallStack()
 
         oldValue = instance._storage.get(self.name, None)
@@ -118,8 +121,9 @@ class ConfigField(Field):
             if value == self.dtype:
                 value = value()
             oldValue.update(__at=at, __label=label, **value._storage)
-        history = instance._history.setdefault(self.name, [])
-        history.append(("config value set", at, label))
+        instance._markModified()
+        if record:
+            instance._addHistory(self.name, ("config value set", at, label))
 
     def rename(self, instance):
         """Rename the field in a `~lsst.pex.config.Config` (for internal use
@@ -148,29 +152,33 @@ class ConfigField(Field):
         value._collectImports()
         imports |= value._imports
 
-    def save(self, outfile, instance):
-        """Save this field to a file (for internal use only).
+    def _saveNamed(self, outfile, instance, prefix, imports, reference=None):
+        value = self.__get__(instance)
+        if reference is not None:
+            reference = self.__get__(reference)
+        value._saveNamed(outfile, _joinNamePath(prefix, self.name), imports, reference)
 
-        Parameters
-        ----------
-        outfile : file-like object
-            A writeable field handle.
-        instance : `Config`
-            The `Config` instance that contains this field.
+    def _isValidated(self, instance):
+        value = self.__get__(instance)
+        return value._isValidated()
 
-        Notes
-        -----
-        This method is invoked by the `~lsst.pex.config.Config` object that
-        contains this field and should not be called directly.
+    def _subconfigs(self, instance):
+        return (self.__get__(instance),)
 
-        The output consists of the documentation string
-        (`lsst.pex.config.Field.doc`) formatted as a Python comment. The second
-        line is formatted as an assignment: ``{fullname}={value}``.
+    def _copyValue(self, instance, value):
+        return value._copy() if value is not None else None
 
-        This output can be executed with Python.
-        """
+    def _walk(self, instance, prefix):
+        value = self.__get__(instance)
+        yield from value._walk(_joinNamePath(prefix, self.name))
+
+    def _saveStructured(self, instance, data):
+        value = self.__get__(instance)
+        data[self.name] = value._saveStructured()
+
+    def _loadStructured(self, instance, node, at, label):
         value = self.__get__(instance)
-        value._save(outfile)
+        value._loadStructured(node, at=at, label=label)
 
     def freeze(self, instance):
         """Make this field read-only.
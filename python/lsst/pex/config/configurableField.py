@@ -23,12 +23,13 @@ __all__ = ('ConfigurableInstance', 'ConfigurableField')
 
 import copy
 
-from .config import Config, Field, _joinNamePath, _typeStr, FieldValidationError
+from .config import (Config, Field, _joinNamePath, _typeStr, _importTypeStr, FieldValidationError,
+                     _FieldValue)
 from .comparison import compareConfigs, getComparisonName
 from .callStack import getCallStack, getStackFrame
 
 
-class ConfigurableInstance:
+class ConfigurableInstance(_FieldValue):
     """A retargetable configuration in a `ConfigurableField` that proxies
     a `~lsst.pex.config.Config`.
 
@@ -44,6 +45,8 @@ class ConfigurableInstance:
     using the ``target`` property.
     """
 
+    __slots__ = ("_config", "_field", "_target", "_ConfigClass", "_value")
+
     def __initValue(self, at, label):
         """Construct value of field.
 
@@ -64,18 +67,19 @@ class ConfigurableInstance:
     def __init__(self, config, field, at=None, label="default"):
         object.__setattr__(self, "_config", config)
         object.__setattr__(self, "_field", field)
-        object.__setattr__(self, "__doc__", config)
         object.__setattr__(self, "_target", field.target)
         object.__setattr__(self, "_ConfigClass", field.ConfigClass)
         object.__setattr__(self, "_value", None)
 
-        if at is None:
+        record = config._recordsHistory()
+        if at is None and record:
             at = getCallStack()
-        at += [self._field.source]
+        if at is not None:
+            at += [self._field.source]
         self.__initValue(at, label)
 
-        history = config._history.setdefault(field.name, [])
-        history.append(("Targeted and initialized from defaults", at, label))
+        if record:
+            config._addHistory(field.name, ("Targeted and initialized from defaults", at, label))
 
     target = property(lambda x: x._target)
     """The targeted configurable (read-only).
@@ -112,16 +116,18 @@ class ConfigurableInstance:
         except BaseException as e:
             raise FieldValidationError(self._field, self._config, e.message)
 
-        if at is None:
+        record = self._config._recordsHistory()
+        if at is None and record:
             at = getCallStack()
         object.__setattr__(self, "_target", target)
         if ConfigClass != self.ConfigClass:
             object.__setattr__(self, "_ConfigClass", ConfigClass)
             self.__initValue(at, label)
+        self._config._markModified()
 
-        history = self._config._history.setdefault(self._field.name, [])
-        msg = "retarget(target=%s, ConfigClass=%s)" % (_typeStr(target), _typeStr(ConfigClass))
-        history.append((msg, at, label))
+        if record:
+            msg = "retarget(target=%s, ConfigClass=%s)" % (_typeStr(target), _typeStr(ConfigClass))
+            self._config._addHistory(self._field.name, (msg, at, label))
 
     def __getattr__(self, name):
         return getattr(self._value, name)
@@ -134,11 +140,11 @@ class ConfigurableInstance:
         if self._config._frozen:
             raise FieldValidationError(self._field, self._config, "Cannot modify a frozen Config")
 
-        if name in self.__dict__:
+        if name in ConfigurableInstance.__slots__:
             # attribute exists in the ConfigurableInstance wrapper
             object.__setattr__(self, name, value)
         else:
-            if at is None:
+            if at is None and self._value._recordsHistory():
                 at = getCallStack()
             self._value.__setattr__(name, value, at=at, label=label)
 
@@ -154,7 +160,7 @@ class ConfigurableInstance:
             # attribute exists in the ConfigurableInstance wrapper
             object.__delattr__(self, name)
         except AttributeError:
-            if at is None:
+            if at is None and self._value._recordsHistory():
                 at = getCallStack()
             self._value.__delattr__(name, at=at, label=label)
 
@@ -268,7 +274,7 @@ class ConfigurableField(Field):
     def __getOrMake(self, instance, at=None, label="default"):
         value = instance._storage.get(self.name, None)
         if value is None:
-            if at is None:
+            if at is None and instance._recordsHistory():
                 at = getCallStack(1)
             value = ConfigurableInstance(instance, self, at=at, label=label)
             instance._storage[self.name] = value
@@ -283,7 +289,7 @@ class ConfigurableField(Field):
     def __set__(self, instance, value, at=None, label="assignment"):
         if instance._frozen:
             raise FieldValidationError(self, instance, "Cannot modify a frozen Config")
-        if at is None:
+        if at is None and instance._recordsHistory():
             at = getCallStack()
         oldValue = self.__getOrMake(instance, at=at)
 
@@ -300,6 +306,26 @@ class ConfigurableField(Field):
                 (value, _typeStr(value), _typeStr(oldValue.ConfigClass))
             raise FieldValidationError(self, instance, msg)
 
+    def _makeDefaultTemplate(self, instance):
+        """Make a template from which this field's default can be set
+        quickly in new configs (for internal use only).
+
+        Notes
+        -----
+        Setting the default with ``__set__`` constructs the default
+        ``ConfigClass`` twice (once for the `ConfigurableInstance` and once to
+        copy it); `_setDefault` only constructs the `ConfigurableInstance`.
+        """
+        if type(self).__set__ is not ConfigurableField.__set__:
+            return NotImplemented
+        return self.default
+
+    def _setDefault(self, instance, template, at):
+        """Set this field to its default in a new config (for internal use
+        only).
+        """
+        instance._storage[self.name] = ConfigurableInstance(instance, self, at=at, label="default")
+
     def rename(self, instance):
         fullname = _joinNamePath(instance._name, self.name)
         value = self.__getOrMake(instance)
@@ -312,20 +338,70 @@ class ConfigurableField(Field):
         value.value._collectImports()
         imports |= value.value._imports
 
-    def save(self, outfile, instance):
-        fullname = _joinNamePath(instance._name, self.name)
+    def _saveNamed(self, outfile, instance, prefix, imports, reference=None):
+        fullname = _joinNamePath(prefix, self.name)
         value = self.__getOrMake(instance)
         target = value.target
+        ConfigClass = value.ConfigClass
+        imports.add(target.__module__)
 
-        if target != self.target:
+        if reference is None:
             # not targeting the field-default target.
+            retarget = target != self.target
+        else:
+            # not targeting the target of the config this is loaded into
+            reference = self.__getOrMake(reference)
+            retarget = target != reference.target or ConfigClass != reference.ConfigClass
+        if retarget:
             # save target information
-            ConfigClass = value.ConfigClass
             outfile.write(u"{}.retarget(target={}, ConfigClass={})\n\n".format(fullname,
                                                                                _typeStr(target),
                                                                                _typeStr(ConfigClass)))
+        if reference is not None:
+            # the loaded config will be retargeted the same way
+            if retarget:
+                reference.retarget(target, ConfigClass)
+            reference = reference.value
         # save field values
-        value._save(outfile)
+        value.value._saveNamed(outfile, fullname, imports, reference)
+
+    def _isValidated(self, instance):
+        value = self.__getOrMake(instance)
+        return value.value._isValidated()
+
+    def _subconfigs(self, instance):
+        return (self.__getOrMake(instance).value,)
+
+    def _copyValue(self, instance, value):
+        copy = object.__new__(type(value))
+        object.__setattr__(copy, "_config", instance)
+        object.__setattr__(copy, "_field", self)
+        object.__setattr__(copy, "_target", value._target)
+        object.__setattr__(copy, "_ConfigClass", value._ConfigClass)
+        object.__setattr__(copy, "_value", value._value._copy())
+        return copy
+
+    def _walk(self, instance, prefix):
+        value = self.__getOrMake(instance)
+        yield from value.value._walk(_joinNamePath(prefix, self.name))
+
+    def _saveStructured(self, instance, data):
+        value = self.__getOrMake(instance)
+        node = {}
+        if value.target != self.target or value.ConfigClass != self.ConfigClass:
+            # not targeting the field-default target and config class (for
+            # example, retargeted by setDefaults); save target information
+            node["target"] = _typeStr(value.target)
+            node["ConfigClass"] = _typeStr(value.ConfigClass)
+        node["values"] = value.value._saveStructured()
+        data[self.name] = node
+
+    def _loadStructured(self, instance, node, at, label):
+        value = self.__getOrMake(instance)
+        if "target" in node:
+            value.retarget(_importTypeStr(node["target"]), _importTypeStr(node["ConfigClass"]),
+                           at=at, label=label)
+        value.value._loadStructured(node["values"], at=at, label=label)
 
     def freeze(self, instance):
         value = self.__getOrMake(instance)
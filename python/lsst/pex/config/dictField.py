@@ -23,23 +23,26 @@ __all__ = ["DictField"]
 
 import collections.abc
 
-from .config import Field, FieldValidationError, _typeStr, _autocast, _joinNamePath
-from .comparison import getComparisonName, compareScalars
+from .config import (Field, FieldValidationError, _typeStr, _autocast, _joinNamePath,
+                     _encodeStructured, _decodeStructured, _FieldValue, _replayHistory)
+from .comparison import getComparisonName, compareScalars, _compareItems
 from .callStack import getCallStack, getStackFrame
 
 
-class Dict(collections.abc.MutableMapping):
+class Dict(collections.abc.MutableMapping, _FieldValue):
     """An internal mapping container.
 
     This class emulates a `dict`, but adds validation and provenance.
     """
 
+    __slots__ = ("_field", "_config", "_history", "_dict", "_lastEvent")
+
     def __init__(self, config, field, value, at, label, setHistory=True):
         self._field = field
         self._config = config
         self._dict = {}
         self._history = self._config._history.setdefault(self._field.name, [])
-        self.__doc__ = field.doc
+        self._lastEvent = None
         if value is not None:
             try:
                 for k in value:
@@ -49,10 +52,16 @@ class Dict(collections.abc.MutableMapping):
                 msg = "Value %s is of incorrect type %s. Mapping type expected." % \
                     (value, _typeStr(value))
                 raise FieldValidationError(self._field, self._config, msg)
-        if setHistory:
-            self._history.append((dict(self._dict), at, label))
+        if setHistory and self._config._recordsHistory():
+            self._lastEvent = (self._historyValue(), at, label)
+            self._config._addHistory(self._field.name, self._lastEvent)
+
+    def _historyValue(self):
+        """Copy the items for the history of the field (`dict`).
+        """
+        return dict(self._dict)
 
-    history = property(lambda x: x._history)
+    history = property(lambda x: _replayHistory(x._history))
     """History (read-only).
     """
 
@@ -74,6 +83,32 @@ class Dict(collections.abc.MutableMapping):
                 "Attempting to set item at key %r to value %s" % (k, x)
             raise FieldValidationError(self._field, self._config, msg)
 
+        k, x = self._castItem(k, x)
+        self._dict[k] = x
+        self._config._markModified()
+        self._recordChange("set", k, x, at, label, setHistory)
+
+    def _castItem(self, k, x):
+        """Cast and validate an item before it is set (for internal use
+        only).
+
+        Parameters
+        ----------
+        k : object
+            The key.
+        x : object
+            The value.
+
+        Returns
+        -------
+        k, x : `tuple`
+            The key and value, cast to the types of the field.
+
+        Raises
+        ------
+        FieldValidationError
+            Raised if the key or value is not valid for the field.
+        """
         # validate keytype
         k = _autocast(k, self._field.keytype)
         if type(k) != self._field.keytype:
@@ -97,13 +132,58 @@ class Dict(collections.abc.MutableMapping):
         if self._field.itemCheck is not None and not self._field.itemCheck(x):
             msg = "Item at key %r is not a valid value: %s" % (k, x)
             raise FieldValidationError(self._field, self._config, msg)
+        return k, x
 
-        if at is None:
-            at = getCallStack()
+    def update(self, *args, **kwds):
+        """Update the dictionary from a mapping or an iterable of key-value
+        pairs, and keyword arguments, like `dict.update`.
 
-        self._dict[k] = x
-        if setHistory:
-            self._history.append((dict(self._dict), at, label))
+        Notes
+        -----
+        All the items are validated before any is set, and the change is
+        recorded as a single history event.
+        """
+        if self._config._frozen:
+            raise FieldValidationError(self._field, self._config, "Cannot modify a frozen Config")
+        if len(args) > 1:
+            raise TypeError("update expected at most 1 positional argument, got %d" % len(args))
+        at = getCallStack() if self._config._recordsHistory() else None
+        items = dict(self._castItem(k, x) for k, x in dict(*args, **kwds).items())
+        self._updateItems(items, at, "update")
+
+    def _updateItems(self, items, at, label):
+        """Set validated items and record them as a single history event
+        (for internal use only).
+
+        Parameters
+        ----------
+        items : `dict`
+            Items returned by `_castItem`.
+        at : `list` of `lsst.pex.config.callStack.StackFrame` or `None`
+            The call stack.
+        label : `str`
+            Event label for the history.
+        """
+        self._dict.update(items)
+        self._config._markModified()
+        self._recordChange("update", None, items, at, label)
+
+    def clear(self):
+        """Remove all items from the dictionary, recording a single history
+        event.
+        """
+        if self._config._frozen:
+            raise FieldValidationError(self._field, self._config, "Cannot modify a frozen Config")
+        at = getCallStack() if self._config._recordsHistory() else None
+        self._clearItems(at, "clear")
+
+    def _clearItems(self, at, label):
+        """Remove all items and record a single history event (for internal
+        use only).
+        """
+        self._dict.clear()
+        self._config._markModified()
+        self._recordChange("clear", None, None, at, label)
 
     def __delitem__(self, k, at=None, label="delitem", setHistory=True):
         if self._config._frozen:
@@ -111,10 +191,8 @@ class Dict(collections.abc.MutableMapping):
                                        "Cannot modify a frozen Config")
 
         del self._dict[k]
-        if setHistory:
-            if at is None:
-                at = getCallStack()
-            self._history.append((dict(self._dict), at, label))
+        self._config._markModified()
+        self._recordChange("del", k, None, at, label, setHistory)
 
     def __repr__(self):
         return repr(self._dict)
@@ -126,7 +204,7 @@ class Dict(collections.abc.MutableMapping):
         if hasattr(getattr(self.__class__, attr, None), '__set__'):
             # This allows properties to work.
             object.__setattr__(self, attr, value)
-        elif attr in self.__dict__ or attr in ["_field", "_config", "_history", "_dict", "__doc__"]:
+        elif attr in Dict.__slots__:
             # This allows specific private attributes to work.
             object.__setattr__(self, attr, value)
         else:
@@ -255,15 +333,63 @@ class DictField(Field):
                   "Attempting to set field to value %s" % value
             raise FieldValidationError(self, instance, msg)
 
-        if at is None:
+        record = instance._recordsHistory()
+        if at is None and record:
             at = getCallStack()
         if value is not None:
             value = self.DictClass(instance, self, value, at=at, label=label)
-        else:
-            history = instance._history.setdefault(self.name, [])
-            history.append((value, at, label))
+        elif record:
+            instance._addHistory(self.name, (value, at, label))
 
         instance._storage[self.name] = value
+        instance._markModified()
+
+    def _makeDefaultTemplate(self, instance):
+        """Make a template from which this field's default can be set
+        quickly in new configs (for internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            A config in which this field has just been set to its default.
+
+        Returns
+        -------
+        template : `dict` or `None`
+            The validated default items, or `None` if the default is `None`.
+            `NotImplemented` is returned by subclasses that override
+            ``__set__`` or `DictClass`.
+        """
+        if type(self).__set__ is not DictField.__set__ or self.DictClass is not Dict:
+            return NotImplemented
+        value = instance._storage[self.name]
+        return dict(value._dict) if value is not None else None
+
+    def _setDefault(self, instance, template, at):
+        """Set this field to its default in a new config from a template
+        made by `_makeDefaultTemplate`, without validating the items again
+        (for internal use only).
+        """
+        if template is None:
+            value = None
+        else:
+            value = Dict(instance, self, None, at, "default", setHistory=False)
+            value._dict.update(template)
+        instance._storage[self.name] = value
+        if at is not None:
+            event = (dict(template) if value is not None else None, at, "default")
+            instance._addHistory(self.name, event)
+            if value is not None:
+                value._lastEvent = event
+
+    def _copyValue(self, instance, value):
+        if value is None:
+            return None
+        copy = type(value)(instance, self, None, None, "copy", setHistory=False)
+        copy._dict.update(value._dict)
+        # the copy shares the history events of the original
+        copy._lastEvent = value._lastEvent
+        return copy
 
     def toDict(self, instance):
         """Convert this field's key-value pairs into a regular `dict`.
@@ -283,6 +409,22 @@ class DictField(Field):
         value = self.__get__(instance)
         return dict(value) if value is not None else None
 
+    def _saveStructured(self, instance, data):
+        value = self.__get__(instance)
+        if self.deprecated and value == self.default:
+            return
+        if value is None:
+            data[self.name] = None
+        else:
+            data[self.name] = [[_encodeStructured(k), _encodeStructured(v)] for k, v in value.items()]
+
+    def _loadStructured(self, instance, node, at, label):
+        if node is None:
+            value = None
+        else:
+            value = {_decodeStructured(k): _decodeStructured(v) for k, v in node}
+        self.__set__(instance, value, at=at, label=label)
+
     def _compare(self, instance1, instance2, shortcut, rtol, atol, output):
         """Compare two fields for equality.
 
@@ -311,7 +453,8 @@ class DictField(Field):
 
         Notes
         -----
-        Floating point comparisons are performed by `numpy.allclose`.
+        Floating point comparisons follow `numpy.allclose`; long dicts of
+        floats are compared in a single vectorised call.
         """
         d1 = getattr(instance1, self.name)
         d2 = getattr(instance2, self.name)
@@ -325,12 +468,6 @@ class DictField(Field):
             return True
         if not compareScalars("keys for %s" % name, set(d1.keys()), set(d2.keys()), output=output):
             return False
-        equal = True
-        for k, v1 in d1.items():
-            v2 = d2[k]
-            result = compareScalars("%s[%r]" % (name, k), v1, v2, dtype=self.itemtype,
-                                    rtol=rtol, atol=atol, output=output)
-            if not result and shortcut:
-                return False
-            equal = equal and result
-        return equal
+        keys = list(d1.keys())
+        return _compareItems(name, keys, [d1[k] for k in keys], [d2[k] for k in keys], dtype=self.itemtype,
+                             rtol=rtol, atol=atol, output=output, shortcut=shortcut)
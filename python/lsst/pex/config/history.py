@@ -19,11 +19,171 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-__all__ = ('Color', 'format')
+__all__ = ('Color', 'format', 'getHistoryLimit', 'setHistoryLimit', 'historyLimit')
 
+import contextlib
 import os
 import re
 import sys
+import warnings
+
+HISTORY_ENV_VAR = "PEX_CONFIG_HISTORY"
+"""Name of the environment variable that sets the initial global history
+limit (`str`).
+
+The value may be ``full`` (record every event), ``off`` (record nothing) or
+a non-negative integer (keep only that many of the most recent events for
+each field).
+"""
+
+
+def _parseHistoryLimit(value):
+    """Convert a history limit, possibly given as a string, to `None` or a
+    non-negative `int`.
+    """
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("full", "all", ""):
+            return None
+        if lowered in ("off", "none"):
+            return 0
+        try:
+            value = int(lowered)
+        except ValueError:
+            raise ValueError("Invalid history limit %r; expected 'full', 'off' or an integer" % value)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError("Invalid history limit %r; expected None or a non-negative integer" % (value,))
+    return value
+
+
+def _limitFromEnvironment():
+    try:
+        return _parseHistoryLimit(os.environ.get(HISTORY_ENV_VAR, "full"))
+    except ValueError as e:
+        warnings.warn("Ignoring %s: %s" % (HISTORY_ENV_VAR, e))
+        return None
+
+
+_globalLimit = _limitFromEnvironment()
+_classLimits = {}
+_resolvedLimits = {}
+
+
+def getHistoryLimit(configClass=None):
+    """Get the number of history events recorded for each field.
+
+    Parameters
+    ----------
+    configClass : `lsst.pex.config.Config`-type, optional
+        Config class to get the limit for. The limit set for the nearest
+        class in its method resolution order is returned, falling back to the
+        global limit. If `None`, the global limit is returned.
+
+    Returns
+    -------
+    limit : `int` or `None`
+        `None` if every event is recorded, ``0`` if history is not recorded
+        at all, or the number of most recent events kept for each field.
+
+    See also
+    --------
+    setHistoryLimit
+    historyLimit
+    """
+    if configClass is None:
+        return _globalLimit
+    try:
+        return _resolvedLimits[configClass]
+    except KeyError:
+        pass
+    limit = _globalLimit
+    for cls in configClass.__mro__:
+        if cls in _classLimits:
+            limit = _classLimits[cls]
+            break
+    _resolvedLimits[configClass] = limit
+    return limit
+
+
+def setHistoryLimit(limit, configClass=None):
+    """Set the number of history events recorded for each field.
+
+    Parameters
+    ----------
+    limit : `int`, `str` or `None`
+        `None` or ``"full"`` to record every event, ``0`` or ``"off"`` to
+        record nothing, or a positive integer to keep only that many of the
+        most recent events for each field.
+    configClass : `lsst.pex.config.Config`-type, optional
+        If provided, only set the limit for this class and its subclasses;
+        otherwise set the global limit.
+
+    Raises
+    ------
+    ValueError
+        Raised if ``limit`` is not a valid limit.
+
+    Notes
+    -----
+    The limit is consulted every time an event is recorded, so changing it
+    affects existing config instances too; events recorded before a limit is
+    lowered are trimmed the next time their field changes. When history is
+    off, no call stacks are captured and containers are not copied, so
+    setting and loading configs is considerably faster.
+
+    The initial global limit is read from the ``PEX_CONFIG_HISTORY``
+    environment variable (see `HISTORY_ENV_VAR`).
+
+    See also
+    --------
+    getHistoryLimit
+    historyLimit
+    """
+    global _globalLimit
+    limit = _parseHistoryLimit(limit)
+    if configClass is None:
+        _globalLimit = limit
+    else:
+        _classLimits[configClass] = limit
+    _resolvedLimits.clear()
+
+
+@contextlib.contextmanager
+def historyLimit(limit, configClass=None):
+    """Context manager that temporarily sets the history limit.
+
+    Parameters
+    ----------
+    limit : `int`, `str` or `None`
+        History limit; see `setHistoryLimit`.
+    configClass : `lsst.pex.config.Config`-type, optional
+        If provided, only set the limit for this class and its subclasses;
+        otherwise set the global limit.
+
+    Examples
+    --------
+    Load overrides without recording any provenance:
+
+    >>> from lsst.pex.config.history import historyLimit
+    >>> with historyLimit("off"):
+    ...     config.load("overrides.py")
+    """
+    global _globalLimit
+    wasSet = configClass is None or configClass in _classLimits
+    previous = _globalLimit if configClass is None else _classLimits.get(configClass)
+    setHistoryLimit(limit, configClass)
+    try:
+        yield
+    finally:
+        if configClass is None:
+            _globalLimit = previous
+        elif wasSet:
+            _classLimits[configClass] = previous
+        else:
+            del _classLimits[configClass]
+        _resolvedLimits.clear()
 
 
 class Color:
@@ -212,6 +372,11 @@ def format(config, name=None, writeSourceLine=True, prefix="", verbose=False):
 
         outputs.append([value, output])
 
+    fullname = "%s.%s" % (config._name, name) if config._name is not None else name
+    if not outputs:
+        # No history was recorded (see `setHistoryLimit`)
+        return _colorize(re.sub(r"^root\.", "", fullname), "NAME")
+
     # Find the maximum widths of the value and file:lineNo fields.
     if writeSourceLine:
         sourceLengths = []
@@ -223,7 +388,6 @@ def format(config, name=None, writeSourceLine=True, prefix="", verbose=False):
 
     # Generate the config history content.
     msg = []
-    fullname = "%s.%s" % (config._name, name) if config._name is not None else name
     msg.append(_colorize(re.sub(r"^root\.", "", fullname), "NAME"))
     for value, output in outputs:
         line = prefix + _colorize("%-*s" % (valueLength, value), "VALUE") + " "
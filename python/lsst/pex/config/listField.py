@@ -23,12 +23,13 @@ __all__ = ["ListField"]
 
 import collections.abc
 
-from .config import Field, FieldValidationError, _typeStr, _autocast, _joinNamePath
-from .comparison import compareScalars, getComparisonName
+from .config import (Field, FieldValidationError, _typeStr, _autocast, _joinNamePath,
+                     _encodeStructured, _decodeStructured, _FieldValue, _replayHistory)
+from .comparison import compareScalars, getComparisonName, _compareItems
 from .callStack import getCallStack, getStackFrame
 
 
-class List(collections.abc.MutableSequence):
+class List(collections.abc.MutableSequence, _FieldValue):
     """List collection used internally by `ListField`.
 
     Parameters
@@ -53,14 +54,23 @@ class List(collections.abc.MutableSequence):
         Raised if an item in the ``value`` parameter does not have the
         appropriate type for this field or does not pass the
         `ListField.itemCheck` method of the ``field`` parameter.
+
+    Notes
+    -----
+    The history of the field records each change to the list, rather than a
+    copy of the list after every change; the values after each change are
+    rebuilt when the history is read.
     """
 
+    __slots__ = ("_field", "_config", "_history", "_list", "_lastEvent", "_augmentedAt")
+
     def __init__(self, config, field, value, at, label, setHistory=True):
         self._field = field
         self._config = config
         self._history = self._config._history.setdefault(self._field.name, [])
+        self._lastEvent = None
+        self._augmentedAt = None
         self._list = []
-        self.__doc__ = field.doc
         if value is not None:
             try:
                 for i, x in enumerate(value):
@@ -68,8 +78,14 @@ class List(collections.abc.MutableSequence):
             except TypeError:
                 msg = "Value %s is of incorrect type %s. Sequence type expected" % (value, _typeStr(value))
                 raise FieldValidationError(self._field, self._config, msg)
-        if setHistory:
-            self.history.append((list(self._list), at, label))
+        if setHistory and self._config._recordsHistory():
+            self._lastEvent = (self._historyValue(), at, label)
+            self._config._addHistory(self._field.name, self._lastEvent)
+
+    def _historyValue(self):
+        """Copy the items for the history of the field (`list`).
+        """
+        return list(self._list)
 
     def validateItem(self, i, x):
         """Validate an item to determine if it can be included in the list.
@@ -103,7 +119,7 @@ class List(collections.abc.MutableSequence):
         """
         return self._list
 
-    history = property(lambda x: x._history)
+    history = property(lambda x: _replayHistory(x._history))
     """Read-only history.
     """
 
@@ -119,20 +135,20 @@ class List(collections.abc.MutableSequence):
                                        "Cannot modify a frozen Config")
         if isinstance(i, slice):
             k, stop, step = i.indices(len(self))
-            for j, xj in enumerate(x):
+            items = []
+            for xj in x:
                 xj = _autocast(xj, self._field.itemtype)
                 self.validateItem(k, xj)
-                x[j] = xj
+                items.append(xj)
                 k += step
+            x = items
         else:
             x = _autocast(x, self._field.itemtype)
             self.validateItem(i, x)
 
         self._list[i] = x
-        if setHistory:
-            if at is None:
-                at = getCallStack()
-            self.history.append((list(self._list), at, label))
+        self._config._markModified()
+        self._recordChange("set", i, x, at, label, setHistory)
 
     def __getitem__(self, i):
         return self._list[i]
@@ -142,10 +158,8 @@ class List(collections.abc.MutableSequence):
             raise FieldValidationError(self._field, self._config,
                                        "Cannot modify a frozen Config")
         del self._list[i]
-        if setHistory:
-            if at is None:
-                at = getCallStack()
-            self.history.append((list(self._list), at, label))
+        self._config._markModified()
+        self._recordChange("del", i, None, at, label, setHistory)
 
     def __iter__(self):
         return iter(self._list)
@@ -168,10 +182,62 @@ class List(collections.abc.MutableSequence):
             Enable setting the field's history, using the value of the ``at``
             parameter. Default is `True`.
         """
-        if at is None:
+        if at is None and setHistory and self._config._recordsHistory():
             at = getCallStack()
         self.__setitem__(slice(i, i), [x], at=at, label=label, setHistory=setHistory)
 
+    def extend(self, values, at=None, label="extend", setHistory=True):
+        """Append items to the end of the list.
+
+        Parameters
+        ----------
+        values : iterable
+            Items that are appended.
+        at : `list` of `lsst.pex.config.callStack.StackFrame`, optional
+            The call stack (created by
+            `lsst.pex.config.callStack.getCallStack`).
+        label : `str`, optional
+            Event label for the history.
+        setHistory : `bool`, optional
+            Enable setting the field's history, using the value of the ``at``
+            parameter. Default is `True`.
+
+        Notes
+        -----
+        All the items are validated before any is appended, and the change
+        is recorded as a single history event.
+        """
+        if at is None and setHistory and self._config._recordsHistory():
+            at = getCallStack()
+        end = len(self._list)
+        self.__setitem__(slice(end, end), values, at=at, label=label, setHistory=setHistory)
+
+    def __iadd__(self, values):
+        at = getCallStack() if self._config._recordsHistory() else None
+        self.extend(values, at=at)
+        # ``config.field += values`` then assigns the list to the field from
+        # the same line, which must not record the change again
+        self._augmentedAt = at
+        return self
+
+    def clear(self, at=None, label="clear", setHistory=True):
+        """Remove all items from the list.
+
+        Parameters
+        ----------
+        at : `list` of `lsst.pex.config.callStack.StackFrame`, optional
+            The call stack (created by
+            `lsst.pex.config.callStack.getCallStack`).
+        label : `str`, optional
+            Event label for the history.
+        setHistory : `bool`, optional
+            Enable setting the field's history, using the value of the ``at``
+            parameter. Default is `True`.
+        """
+        if at is None and setHistory and self._config._recordsHistory():
+            at = getCallStack()
+        self.__delitem__(slice(None), at=at, label=label, setHistory=setHistory)
+
     def __repr__(self):
         return repr(self._list)
 
@@ -198,7 +264,7 @@ class List(collections.abc.MutableSequence):
         if hasattr(getattr(self.__class__, attr, None), '__set__'):
             # This allows properties to work.
             object.__setattr__(self, attr, value)
-        elif attr in self.__dict__ or attr in ["_field", "_config", "_history", "_list", "__doc__"]:
+        elif attr in List.__slots__:
             # This allows specific private attributes to work.
             object.__setattr__(self, attr, value)
         else:
@@ -248,9 +314,15 @@ class ListField(Field):
     ConfigurableField
     DictField
     Field
+    NumericListField
     RangeField
     RegistryField
     """
+
+    ListClass = List
+    """Class used to hold the items of the field.
+    """
+
     def __init__(self, doc, dtype, default=None, optional=False,
                  listCheck=None, itemCheck=None,
                  length=None, minLength=None, maxLength=None,
@@ -276,8 +348,8 @@ class ListField(Field):
             raise ValueError("'itemCheck' must be callable")
 
         source = getStackFrame()
-        self._setup(doc=doc, dtype=List, default=default, check=None, optional=optional, source=source,
-                    deprecated=deprecated)
+        self._setup(doc=doc, dtype=self.ListClass, default=default, check=None, optional=optional,
+                    source=source, deprecated=deprecated)
 
         self.listCheck = listCheck
         """Callable used to check the list as a whole.
@@ -350,17 +422,72 @@ class ListField(Field):
     def __set__(self, instance, value, at=None, label="assignment"):
         if instance._frozen:
             raise FieldValidationError(self, instance, "Cannot modify a frozen Config")
-
-        if at is None:
+        record = instance._recordsHistory()
+        if at is None and record:
             at = getCallStack()
 
+        if value is not None and value is instance._storage.get(self.name):
+            augmentedAt, value._augmentedAt = value._augmentedAt, None
+            if augmentedAt is not None and augmentedAt == at:
+                # the end of ``config.field += items``, whose change to the
+                # list in place has already been recorded
+                return
+
         if value is not None:
-            value = List(instance, self, value, at, label)
-        else:
-            history = instance._history.setdefault(self.name, [])
-            history.append((value, at, label))
+            value = self.ListClass(instance, self, value, at, label)
+        elif record:
+            instance._addHistory(self.name, (value, at, label))
 
         instance._storage[self.name] = value
+        instance._markModified()
+
+    def _makeDefaultTemplate(self, instance):
+        """Make a template from which this field's default can be set
+        quickly in new configs (for internal use only).
+
+        Parameters
+        ----------
+        instance : `lsst.pex.config.Config`
+            A config in which this field has just been set to its default.
+
+        Returns
+        -------
+        template : `list`-like or `None`
+            A copy of the validated default items, of the same type as
+            the items stored by ``ListClass``, or `None` if the default is
+            `None`. `NotImplemented` is returned by subclasses that override
+            ``__set__``.
+        """
+        if type(self).__set__ is not ListField.__set__:
+            return NotImplemented
+        value = instance._storage[self.name]
+        return value._list[:] if value is not None else None
+
+    def _setDefault(self, instance, template, at):
+        """Set this field to its default in a new config from a template
+        made by `_makeDefaultTemplate`, without validating the items again
+        (for internal use only).
+        """
+        if template is None:
+            value = None
+        else:
+            value = self.ListClass(instance, self, None, at, "default", setHistory=False)
+            value._list.extend(template)
+        instance._storage[self.name] = value
+        if at is not None:
+            event = (list(template) if value is not None else None, at, "default")
+            instance._addHistory(self.name, event)
+            if value is not None:
+                value._lastEvent = event
+
+    def _copyValue(self, instance, value):
+        if value is None:
+            return None
+        copy = type(value)(instance, self, None, None, "copy", setHistory=False)
+        copy._list.extend(value._list)
+        # the copy shares the history events of the original
+        copy._lastEvent = value._lastEvent
+        return copy
 
     def toDict(self, instance):
         """Convert the value of this field to a plain `list`.
@@ -380,6 +507,16 @@ class ListField(Field):
         value = self.__get__(instance)
         return list(value) if value is not None else None
 
+    def _saveStructured(self, instance, data):
+        value = self.__get__(instance)
+        if self.deprecated and value == self.default:
+            return
+        data[self.name] = [_encodeStructured(x) for x in value] if value is not None else None
+
+    def _loadStructured(self, instance, node, at, label):
+        value = [_decodeStructured(x) for x in node] if node is not None else None
+        self.__set__(instance, value, at=at, label=label)
+
     def _compare(self, instance1, instance2, shortcut, rtol, atol, output):
         """Compare two config instances for equality with respect to this
         field.
@@ -411,7 +548,8 @@ class ListField(Field):
 
         Notes
         -----
-        Floating point comparisons are performed by `numpy.allclose`.
+        Floating point comparisons follow `numpy.allclose`; long lists of
+        floats are compared in a single vectorised call.
         """
         l1 = getattr(instance1, self.name)
         l2 = getattr(instance2, self.name)
@@ -425,11 +563,5 @@ class ListField(Field):
             return True
         if not compareScalars("size for %s" % name, len(l1), len(l2), output=output):
             return False
-        equal = True
-        for n, v1, v2 in zip(range(len(l1)), l1, l2):
-            result = compareScalars("%s[%d]" % (name, n), v1, v2, dtype=self.dtype,
-                                    rtol=rtol, atol=atol, output=output)
-            if not result and shortcut:
-                return False
-            equal = equal and result
-        return equal
+        return _compareItems(name, range(len(l1)), list(l1), list(l2), dtype=self.itemtype,
+                             rtol=rtol, atol=atol, output=output, shortcut=shortcut)
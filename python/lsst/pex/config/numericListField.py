@@ -0,0 +1,313 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ["NumericListField"]
+
+import array
+
+from .config import FieldValidationError, _typeStr, _autocast
+from .listField import List, ListField
+from .callStack import getStackFrame
+
+
+class NumericList(List):
+    """List collection backed by an `array.array`, used internally by
+    `NumericListField`.
+
+    Parameters
+    ----------
+    config : `lsst.pex.config.Config`
+        Config instance that contains the ``field``.
+    field : `NumericListField`
+        Instance of the `NumericListField` using this ``NumericList``.
+    value : sequence
+        Sequence of values that are inserted into this ``NumericList``.
+    at : `list` of `lsst.pex.config.callStack.StackFrame`
+        The call stack (created by `lsst.pex.config.callStack.getCallStack`).
+    label : `str`
+        Event label for the history.
+    setHistory : `bool`, optional
+        Enable setting the field's history, using the value of the ``at``
+        parameter. Default is `True`.
+
+    Raises
+    ------
+    FieldValidationError
+        Raised if an item in the ``value`` parameter does not have the
+        appropriate type for this field or does not pass the checks of the
+        ``field`` parameter.
+
+    Notes
+    -----
+    Items are converted and validated in a single pass for each assignment,
+    and stored contiguously, so `buffer` gives access to them without
+    copying.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, config, field, value, at, label, setHistory=True):
+        self._field = field
+        self._config = config
+        self._history = config._history.setdefault(field.name, [])
+        self._lastEvent = None
+        self._augmentedAt = None
+        self._list = self._makeArray(0, value) if value is not None else array.array(field.typecode)
+        if setHistory and config._recordsHistory():
+            self._lastEvent = (self._list.tolist(), at, label)
+            config._addHistory(field.name, self._lastEvent)
+
+    def _historyValue(self):
+        return self._list.tolist()
+
+    def validateItem(self, i, x):
+        """Validate an item to determine if it can be included in the list.
+
+        Parameters
+        ----------
+        i : `int`
+            Index of the item in the list.
+        x : object
+            Item in the list.
+
+        Raises
+        ------
+        FieldValidationError
+            Raised if the item is `None`, does not have the appropriate type
+            for this field, is out of range for the storage type, or does not
+            pass the field's `ListField.itemCheck` method.
+        """
+        if x is None:
+            msg = "Item at position %d is None, which %s does not allow" % (i, _typeStr(self._field))
+            raise FieldValidationError(self._field, self._config, msg)
+        List.validateItem(self, i, x)
+        try:
+            array.array(self._field.typecode, (x,))
+        except OverflowError:
+            msg = "Item at position %d with value %s is out of range" % (i, x)
+            raise FieldValidationError(self._field, self._config, msg)
+
+    def _makeArray(self, i, values):
+        """Convert and validate new items (for internal use only).
+
+        Parameters
+        ----------
+        i : `int`
+            Index of the first item in the list, for error messages.
+        values : iterable
+            The items.
+
+        Returns
+        -------
+        items : `array.array`
+            The validated items.
+
+        Raises
+        ------
+        FieldValidationError
+            Raised if ``values`` is not a sequence or an item is not valid.
+        """
+        field = self._field
+        if isinstance(values, (str, bytes, bytearray)):
+            msg = "Value %s is of incorrect type %s. Sequence type expected" % (values, _typeStr(values))
+            raise FieldValidationError(field, self._config, msg)
+        try:
+            # converts and type-checks every item in C
+            items = array.array(field.typecode, values)
+        except (TypeError, OverflowError):
+            try:
+                values = list(values)
+            except TypeError:
+                msg = "Value %s is of incorrect type %s. Sequence type expected" % (values, _typeStr(values))
+                raise FieldValidationError(field, self._config, msg)
+            # find the offending item, for the error message
+            for j, x in enumerate(values):
+                self.validateItem(i + j, _autocast(x, field.itemtype))
+            raise
+        if field.itemCheck is not None:
+            for j, x in enumerate(items):
+                if not field.itemCheck(x):
+                    msg = "Item at position %d is not a valid value: %s" % (i + j, x)
+                    raise FieldValidationError(field, self._config, msg)
+        if field.itemsCheck is not None and not field.itemsCheck(memoryview(items).toreadonly()):
+            msg = "Items at positions %d to %d are not valid values" % (i, i + len(items) - 1)
+            raise FieldValidationError(field, self._config, msg)
+        return items
+
+    def list(self):
+        """A copy of the items contained by the `NumericList` (`list`).
+        """
+        return self._list.tolist()
+
+    def buffer(self):
+        """Get read-only access to the items without copying them.
+
+        Returns
+        -------
+        buffer : `memoryview`
+            A read-only view of the items, which can be passed to
+            `numpy.asarray` or any other consumer of the buffer protocol.
+
+        Notes
+        -----
+        The number of items cannot be changed while the view is in use;
+        call `memoryview.release` on it before inserting or deleting items.
+        """
+        return memoryview(self._list).toreadonly()
+
+    def __setitem__(self, i, x, at=None, label="setitem", setHistory=True):
+        if self._config._frozen:
+            raise FieldValidationError(self._field, self._config,
+                                       "Cannot modify a frozen Config")
+        if isinstance(i, slice):
+            x = self._makeArray(i.indices(len(self))[0], x)
+        else:
+            x = self._makeArray(i, (x,))[0]
+
+        self._list[i] = x
+        self._config._markModified()
+        self._recordChange("set", i, x, at, label, setHistory)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._list[i].tolist()
+        return self._list[i]
+
+    def __repr__(self):
+        return repr(self._list.tolist())
+
+    def __str__(self):
+        return str(self._list.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, NumericList):
+            return self._list == other._list
+        return List.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+class NumericListField(ListField):
+    """A configuration field (`~lsst.pex.config.Field` subclass) that contains
+    a list of numbers stored in an `array.array`.
+
+    Parameters
+    ----------
+    doc : `str`
+        A description of the field.
+    dtype : {`int`-type, `float`-type}
+        The data type of items in the list. Items are stored as 64-bit
+        signed integers or double precision floats.
+    default : sequence, optional
+        The default items for the field.
+    optional : `bool`, optional
+        Set whether the field is *optional*. When `False`,
+        `lsst.pex.config.Config.validate` will fail if the field's value is
+        `None`.
+    listCheck : callable, optional
+        A callable that validates the list as a whole.
+    itemCheck : callable, optional
+        A callable that validates individual items in the list.
+    itemsCheck : callable, optional
+        A callable that validates the items inserted into the list by one
+        assignment or insertion together. It is passed a read-only
+        `memoryview` of the new items and returns `True` if they are all
+        valid, so it can be vectorised, e.g.
+        ``lambda x: (numpy.asarray(x) > 0).all()``.
+    length : `int`, optional
+        If set, this field must contain exactly ``length`` number of items.
+    minLength : `int`, optional
+        If set, this field must contain *at least* ``minLength`` number of
+        items.
+    maxLength : `int`, optional
+        If set, this field must contain *no more than* ``maxLength`` number of
+        items.
+    deprecated : None or `str`, optional
+        A description of why this Field is deprecated, including removal date.
+        If not None, the string is appended to the docstring for this Field.
+
+    See also
+    --------
+    ChoiceField
+    ConfigChoiceField
+    ConfigDictField
+    ConfigField
+    ConfigurableField
+    DictField
+    Field
+    ListField
+    RangeField
+    RegistryField
+
+    Notes
+    -----
+    ``NumericListField`` behaves like a `ListField`, but is much faster for
+    long lists of numbers, such as coefficients or bin edges: each
+    assignment is converted and type checked in a single pass, items are
+    stored compactly, and configs are compared item by item only if they
+    are not exactly equal. Unlike `ListField`, items cannot be `None`, and
+    integers must fit in 64 bits.
+
+    The items are available without copying through the ``buffer`` method of
+    the field's value.
+    """
+
+    ListClass = NumericList
+
+    supportedTypes = {int: "q", float: "d"}
+    """The data types allowed by `NumericListField` instances, mapped to the
+    `array.array` type codes used to store them (`dict`).
+    """
+
+    def __init__(self, doc, dtype, default=None, optional=False,
+                 listCheck=None, itemCheck=None, itemsCheck=None,
+                 length=None, minLength=None, maxLength=None,
+                 deprecated=None):
+        if dtype not in self.supportedTypes:
+            raise ValueError("Unsupported NumericListField dtype %s" % _typeStr(dtype))
+        if itemsCheck is not None and not hasattr(itemsCheck, "__call__"):
+            raise ValueError("'itemsCheck' must be callable")
+        self.typecode = self.supportedTypes[dtype]
+        """`array.array` type code used to store the items (`str`).
+        """
+
+        self.itemsCheck = itemsCheck
+        """Callable used to validate the items inserted by each assignment
+        together.
+        """
+
+        ListField.__init__(self, doc, dtype, default=default, optional=optional,
+                           listCheck=listCheck, itemCheck=itemCheck,
+                           length=length, minLength=minLength, maxLength=maxLength,
+                           deprecated=deprecated)
+        self.source = getStackFrame()
+
+    def toDict(self, instance):
+        value = self.__get__(instance)
+        return value._list.tolist() if value is not None else None
+
+    def _compare(self, instance1, instance2, shortcut, rtol, atol, output):
+        l1 = getattr(instance1, self.name)
+        l2 = getattr(instance2, self.name)
+        if l1 is not None and l2 is not None and l1._list == l2._list:
+            return True
+        return ListField._compare(self, instance1, instance2, shortcut, rtol, atol, output)
@@ -0,0 +1,314 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+__all__ = ("OverridePlan",)
+
+import ast
+import copy
+
+from .callStack import StackFrame
+
+
+class OverridePlan:
+    """A config override file parsed into literal assignments, which can be
+    applied without executing them, and the code of its other statements.
+
+    Parameters
+    ----------
+    filename : `str`
+        Name of the file, as recorded in its compiled code.
+    steps : `tuple` or `None`
+        The statements of the file, or `None` if it has no literal
+        assignments to apply.
+    names : `frozenset` of `str`
+        Names of the root variables of the literal assignments and names
+        read by the other statements.
+    code : `types.CodeType`, optional
+        Code compiled from the whole file.
+    source : `str` or `bytes`, optional
+        Source of the file, compiled if ``code`` is needed but not provided.
+
+    Notes
+    -----
+    Most lines of an override file, including the files written by
+    `lsst.pex.config.Config.save`, assign a literal value to a field, such as
+    ``config.a.b = 1`` or ``config.c["x"].name = "foo"``: the target is an
+    attribute or item of the root config variable, reached through attributes
+    and literal keys, and the value is anything `ast.literal_eval` accepts.
+    `apply` sets those fields directly, capturing the call stack once for the
+    whole file instead of once per assignment. Consecutive statements of any
+    other kind are compiled together and executed in order between the
+    assignments, so imports, method calls and asserts behave exactly as in
+    `exec`.
+
+    Steps hold only literals and code objects, so plans can be cached on disk
+    with `marshal` (see `lsst.pex.config.CodeCache`).
+    """
+
+    __slots__ = ("filename", "steps", "names", "_code", "_source", "_frames")
+
+    def __init__(self, filename, steps, names, code=None, source=None):
+        self.filename = filename
+        self.steps = steps
+        self.names = frozenset(names)
+        self._code = code
+        self._source = source
+        self._frames = None
+
+    @classmethod
+    def fromSource(cls, source, filename="<string>", compileCode=True):
+        """Parse an override file.
+
+        Parameters
+        ----------
+        source : `str` or `bytes`
+            Source of the file.
+        filename : `str`, optional
+            Name of the file.
+        compileCode : `bool`, optional
+            If `True`, compile the code of the whole file now; otherwise it is
+            compiled if it is needed.
+
+        Returns
+        -------
+        plan : `OverridePlan`
+            The parsed file.
+
+        Raises
+        ------
+        SyntaxError
+            Raised if the file is not valid Python.
+        """
+        tree = ast.parse(source, filename=filename, mode="exec")
+        steps = []
+        names = set()
+        other = []
+        for stmt in tree.body:
+            step = _makeAssignment(stmt)
+            if step is None:
+                other.append(stmt)
+                names.update(node.id for node in ast.walk(stmt) if isinstance(node, ast.Name))
+                continue
+            if other:
+                steps.append(_makeCode(other, filename))
+                other = []
+            steps.append(step)
+            names.add(step[2])
+        if len(steps) == 0:
+            steps = None
+        else:
+            if other:
+                steps.append(_makeCode(other, filename))
+            steps = tuple(steps)
+        if compileCode:
+            return cls(filename, steps, names, code=compile(tree, filename, "exec"))
+        return cls(filename, steps, names, source=source)
+
+    @property
+    def code(self):
+        """Code compiled from the whole file (`types.CodeType`).
+        """
+        if self._code is None:
+            self._code = compile(self._source, self.filename, "exec")
+            self._source = None
+        return self._code
+
+    def canApply(self, root):
+        """Test whether the plan can be applied with a root config variable.
+
+        Parameters
+        ----------
+        root : `str`
+            Name of the root config variable.
+
+        Returns
+        -------
+        applicable : `bool`
+            `True` if the file has literal assignments, all to ``root``, and
+            does not otherwise use ``root`` instead of ``config`` (such files
+            are executed to report their deprecated use of ``root``).
+        """
+        if self.steps is None or (root != "root" and "root" in self.names):
+            return False
+        return all(step[2] == root for step in self.steps if step[0] == "set")
+
+    def apply(self, config, root, at=None):
+        """Apply the statements of the file to a config.
+
+        Parameters
+        ----------
+        config : `lsst.pex.config.Config`
+            Config to modify.
+        root : `str`
+            Name of the variable referring to ``config`` in the file.
+        at : `list` of `lsst.pex.config.callStack.StackFrame`, optional
+            The call stack of the caller, extended with the line of the file
+            for the history of each literal assignment. If `None`, history is
+            recorded as if the assignments were executed.
+
+        Returns
+        -------
+        imports : `set` of `str`
+            Modules imported by the file that were not imported before.
+
+        Raises
+        ------
+        Exception
+            Raised if a statement fails; the file name and line number of a
+            literal assignment that fails are added to the exception as a note.
+
+        Notes
+        -----
+        `canApply` must be `True`.
+        """
+        from .config import RecordingImporter
+        if self._frames is None:
+            self._frames = tuple(StackFrame(self.filename, step[1], "<module>") for step in self.steps)
+        methods = _getHistoryMethods()
+        globals_ = {}
+        local = {root: config}
+        imports = set()
+        for step, frame in zip(self.steps, self._frames):
+            if step[0] == "exec":
+                with RecordingImporter() as importer:
+                    exec(step[2], globals_, local)
+                imports.update(importer.getModules())
+                continue
+            _, lineno, _, path, value = step
+            if isinstance(value, (list, dict, set)):
+                # the plan is shared by every load of the file
+                value = copy.deepcopy(value)
+            try:
+                # earlier statements may have rebound the root variable
+                try:
+                    target = local[root]
+                except KeyError:
+                    raise NameError("name %r is not defined" % root) from None
+                for isItem, key in path[:-1]:
+                    target = target[key] if isItem else getattr(target, key)
+                isItem, key = path[-1]
+                setter = type(target).__setitem__ if isItem else type(target).__setattr__
+                if at is not None and setter in methods:
+                    setter(target, key, value, at=at + [frame])
+                elif isItem:
+                    target[key] = value
+                else:
+                    setattr(target, key, value)
+            except Exception as e:
+                _addNote(e, 'File "%s", line %d, in config override' % (self.filename, lineno))
+                raise
+        return imports
+
+
+_historyMethods = None
+
+
+def _getHistoryMethods():
+    """Get the methods that set a field or item and accept the call stack to
+    record in its history as an ``at`` keyword argument.
+    """
+    global _historyMethods
+    if _historyMethods is None:
+        from .config import Config
+        from .configChoiceField import ConfigInstanceDict
+        from .configDictField import ConfigDict
+        from .configurableField import ConfigurableInstance
+        from .dictField import Dict
+        from .listField import List
+        from .numericListField import NumericList
+        from .registry import RegistryInstanceDict
+        _historyMethods = frozenset((
+            Config.__setattr__,
+            ConfigInstanceDict.__setattr__,
+            ConfigInstanceDict.__setitem__,
+            RegistryInstanceDict.__setattr__,
+            ConfigurableInstance.__setattr__,
+            List.__setattr__,
+            List.__setitem__,
+            NumericList.__setitem__,
+            Dict.__setattr__,
+            Dict.__setitem__,
+            ConfigDict.__setitem__,
+        ))
+    return _historyMethods
+
+
+def _addNote(error, note):
+    """Add a note to an exception, to be shown with its traceback.
+    """
+    if hasattr(error, "add_note"):
+        error.add_note(note)
+    else:
+        # Python < 3.11
+        error.__notes__ = getattr(error, "__notes__", []) + [note]
+
+
+def _makeCode(statements, filename):
+    """Compile statements that are not literal assignments into an ``exec``
+    step.
+    """
+    module = ast.Module(body=statements, type_ignores=[])
+    return ("exec", statements[0].lineno, compile(module, filename, "exec"))
+
+
+def _makeAssignment(stmt):
+    """Convert a literal assignment into a ``set`` step.
+
+    Parameters
+    ----------
+    stmt : `ast.stmt`
+        Parsed statement.
+
+    Returns
+    -------
+    step : `tuple` or `None`
+        ``("set", lineno, root, path, value)``, where ``path`` is a sequence
+        of ``(isItem, key)`` pairs leading from the root variable to the
+        target, or `None` if the statement is not a literal assignment.
+    """
+    if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+        return None
+    try:
+        value = ast.literal_eval(stmt.value)
+    except (ValueError, TypeError):
+        return None
+    path = []
+    node = stmt.targets[0]
+    while not isinstance(node, ast.Name):
+        if isinstance(node, ast.Attribute):
+            path.append((False, node.attr))
+            node = node.value
+        elif isinstance(node, ast.Subscript):
+            index = node.slice
+            if type(index).__name__ == "Index":
+                # Python < 3.9
+                index = index.value
+            try:
+                key = ast.literal_eval(index)
+            except (ValueError, TypeError):
+                return None
+            path.append((True, key))
+            node = node.value
+        else:
+            return None
+    if not path:
+        return None
+    return ("set", stmt.lineno, node.id, tuple(reversed(path)), value)
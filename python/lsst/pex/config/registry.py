@@ -23,8 +23,9 @@ __all__ = ("Registry", "makeRegistry", "RegistryField", "registerConfig", "regis
 
 import collections.abc
 import copy
+import sys
 
-from .config import Config, FieldValidationError, _typeStr
+from .config import Config, FieldValidationError, _typeStr, _importTypeStr
 from .configChoiceField import ConfigInstanceDict, ConfigChoiceField
 
 
@@ -43,6 +44,56 @@ class ConfigurableWrapper:
         return self._target(*args, **kwargs)
 
 
+class _DeferredTarget:
+    """A target registered by import path, which is imported when it is
+    first looked up (for internal use only).
+
+    Parameters
+    ----------
+    target : `str` or obj
+        The target or its fully-qualified name.
+    ConfigClass : `str`, `lsst.pex.config.Config`-type or `None`
+        The config class or its fully-qualified name, or `None` to use the
+        target's ``ConfigClass`` attribute.
+    """
+
+    __slots__ = ("_target", "_ConfigClass")
+
+    def __init__(self, target, ConfigClass):
+        self._target = target
+        self._ConfigClass = ConfigClass
+
+
+def _getImported(typeString):
+    """Look up an object from a fully-qualified name like `_importTypeStr`,
+    but only in modules that are already imported (for internal use only).
+
+    Parameters
+    ----------
+    typeString : `str`
+        Fully-qualified name of the object.
+
+    Returns
+    -------
+    obj : object
+        The named object, or `None` if it is not found in an imported module.
+    """
+    parts = typeString.split(".")
+    if len(parts) == 1:
+        parts.insert(0, "builtins")
+    for i in range(len(parts) - 1, 0, -1):
+        obj = sys.modules.get(".".join(parts[:i]))
+        if obj is None:
+            continue
+        try:
+            for attr in parts[i:]:
+                obj = getattr(obj, attr)
+        except AttributeError:
+            continue
+        return obj
+    return None
+
+
 class Registry(collections.abc.Mapping):
     """A base class for global registries, which map names to configurables.
 
@@ -71,6 +122,14 @@ class Registry(collections.abc.Mapping):
       return a PSF matching class that has a ``psfMatch`` method with a
       particular call signature.
 
+    Each registration increments the registry's `version`, so anything
+    derived from the contents of a registry can be cached together with the
+    version it was derived from. The registry itself caches a read-only
+    `snapshot` and the indices used by `getNamesByTarget` and
+    `getNamesByConfigClass` until the next registration. Building these
+    indices does not import targets that were registered by name; they are
+    indexed once their modules have been imported.
+
     Examples
     --------
     This examples creates a configurable class ``Foo`` and adds it to a
@@ -112,6 +171,9 @@ class Registry(collections.abc.Mapping):
             raise TypeError("configBaseType=%s must be a subclass of Config" % _typeStr(configBaseType,))
         self._configBaseType = configBaseType
         self._dict = {}
+        self._version = 0
+        self._snapshot = None
+        self._index = None
 
     def register(self, name, target, ConfigClass=None):
         """Add a new configurable target to the registry.
@@ -122,12 +184,13 @@ class Registry(collections.abc.Mapping):
             Name that the ``target`` is registered under. The target can
             be accessed later with `dict`-like patterns using ``name`` as
             the key.
-        target : obj
-            A configurable type, usually a subclass of `lsst.pipe.base.Task`.
-        ConfigClass : `lsst.pex.config.Config`-type, optional
+        target : obj or `str`
+            A configurable type, usually a subclass of `lsst.pipe.base.Task`,
+            or its fully-qualified name (e.g. ``"lsst.meas.algorithms.Foo"``).
+        ConfigClass : `lsst.pex.config.Config`-type or `str`, optional
             A subclass of `lsst.pex.config.Config` used to configure the
-            configurable. If `None` then the configurable's ``ConfigClass``
-            attribute is used.
+            configurable, or its fully-qualified name. If `None` then the
+            configurable's ``ConfigClass`` attribute is used.
 
         Raises
         ------
@@ -136,15 +199,50 @@ class Registry(collections.abc.Mapping):
         AttributeError
             Raised if ``ConfigClass`` is `None` and ``target`` does not have
             a ``ConfigClass`` attribute.
+        TypeError
+            Raised if ``ConfigClass`` is not a subclass of the registry's
+            config base type.
 
         Notes
         -----
         If ``ConfigClass`` is provided then the ``target`` configurable is
         wrapped in a new object that forwards function calls to it. Otherwise
         the original ``target`` is stored.
+
+        If ``target`` or ``ConfigClass`` is given by name, its module is not
+        imported until the target is first looked up, for example when it is
+        selected in a `RegistryField`, so registering many targets does not
+        import all of their modules. Errors that would be raised here are
+        then raised by that lookup instead, as is `ImportError` if the name
+        cannot be imported.
         """
         if name in self._dict:
             raise RuntimeError("An item with name %r already exists" % name)
+        if isinstance(target, str) or isinstance(ConfigClass, str):
+            self._dict[name] = _DeferredTarget(target, ConfigClass)
+        else:
+            self._dict[name] = self._makeWrapper(target, ConfigClass)
+        self._version += 1
+        self._snapshot = None
+        self._index = None
+
+    def _makeWrapper(self, target, ConfigClass):
+        """Check a target and wrap it if it has a separate config class (for
+        internal use only).
+
+        Parameters
+        ----------
+        target : obj
+            A configurable type.
+        ConfigClass : `lsst.pex.config.Config`-type or `None`
+            The config class, or `None` to use the target's ``ConfigClass``
+            attribute.
+
+        Returns
+        -------
+        wrapper : obj
+            The target or a `ConfigurableWrapper` for it.
+        """
         if ConfigClass is None:
             wrapper = target
         else:
@@ -152,10 +250,22 @@ class Registry(collections.abc.Mapping):
         if not issubclass(wrapper.ConfigClass, self._configBaseType):
             raise TypeError("ConfigClass=%s is not a subclass of %r" %
                             (_typeStr(wrapper.ConfigClass), _typeStr(self._configBaseType)))
-        self._dict[name] = wrapper
+        return wrapper
 
     def __getitem__(self, key):
-        return self._dict[key]
+        wrapper = self._dict[key]
+        if type(wrapper) is _DeferredTarget:
+            target = wrapper._target
+            if isinstance(target, str):
+                target = _importTypeStr(target)
+            ConfigClass = wrapper._ConfigClass
+            if isinstance(ConfigClass, str):
+                ConfigClass = _importTypeStr(ConfigClass)
+            wrapper = self._makeWrapper(target, ConfigClass)
+            self._dict[key] = wrapper
+            # the indices may be missing this target
+            self._index = None
+        return wrapper
 
     def __len__(self):
         return len(self._dict)
@@ -166,7 +276,171 @@ class Registry(collections.abc.Mapping):
     def __contains__(self, key):
         return key in self._dict
 
-    def makeField(self, doc, default=None, optional=False, multi=False):
+    version = property(lambda x: x._version)
+    """The number of targets that have been registered (`int`, read-only).
+
+    The version increases with every registration, so it identifies the
+    contents of the registry.
+    """
+
+    def snapshot(self):
+        """Get a read-only copy of the current contents of the registry.
+
+        Returns
+        -------
+        snapshot : `Registry`
+            A registry with the targets that are currently registered, whose
+            `register` method raises `RuntimeError`.
+
+        Notes
+        -----
+        The snapshot is cached until another target is registered, so it is
+        cheap to take repeatedly. Frozen configs use snapshots so that they
+        are not affected by later registrations. The snapshot has the
+        `version` of the registry when it was taken.
+        """
+        if self._snapshot is None:
+            self._snapshot = _RegistrySnapshot(self)
+        return self._snapshot
+
+    def _getIndex(self):
+        """Get the indices of the names in the registry by target and by
+        config class (for internal use only).
+
+        Returns
+        -------
+        byTarget : `dict`
+            Mapping from each target to a `tuple` of the names it is
+            registered under. Wrapped targets are indexed by the original
+            target.
+        byConfigClass : `dict`
+            Mapping from each config class to a `tuple` of the names of the
+            targets that use it.
+        deferred : `tuple` of `str`
+            Names of the targets registered by name whose modules were not
+            imported when the indices were built.
+        nModules : `int`
+            Number of modules in `sys.modules` when ``deferred`` was last
+            checked.
+
+        Notes
+        -----
+        Building the indices does not import anything. Targets registered by
+        name are resolved if their modules are already imported; otherwise
+        they are only indexed by the target or config class given as an
+        object, if any. The indices are rebuilt once such a target can be
+        resolved, so they include every target that the caller could have
+        imported. Whether they can be resolved is only checked again once
+        the number of modules in `sys.modules` has changed.
+        """
+        index = self._index
+        if index is not None:
+            if index[3] == len(sys.modules):
+                return index
+            if not any(self._resolveImported(name) for name in index[2]):
+                self._index = index[:3] + (len(sys.modules),)
+                return self._index
+        byTarget = {}
+        byConfigClass = {}
+        deferred = []
+        for name in list(self._dict):
+            if type(self._dict[name]) is _DeferredTarget and not self._resolveImported(name):
+                deferred.append(name)
+                wrapper = self._dict[name]
+                if not isinstance(wrapper._target, str):
+                    byTarget[wrapper._target] = byTarget.get(wrapper._target, ()) + (name,)
+                ConfigClass = wrapper._ConfigClass
+                if ConfigClass is not None and not isinstance(ConfigClass, str):
+                    byConfigClass[ConfigClass] = byConfigClass.get(ConfigClass, ()) + (name,)
+                continue
+            wrapper = self._dict[name]
+            target = wrapper._target if isinstance(wrapper, ConfigurableWrapper) else wrapper
+            byTarget[target] = byTarget.get(target, ()) + (name,)
+            byConfigClass[wrapper.ConfigClass] = byConfigClass.get(wrapper.ConfigClass, ()) + (name,)
+        self._index = (byTarget, byConfigClass, tuple(deferred), len(sys.modules))
+        return self._index
+
+    def _resolveImported(self, name):
+        """Resolve a target registered by name if its modules are already
+        imported (for internal use only).
+
+        Parameters
+        ----------
+        name : `str`
+            Name of a target that was registered by name.
+
+        Returns
+        -------
+        resolved : `bool`
+            `True` if the target is now resolved, `False` if resolving it
+            would need an import or fails.
+        """
+        wrapper = self._dict[name]
+        if type(wrapper) is not _DeferredTarget:
+            return True
+        target = wrapper._target
+        if isinstance(target, str):
+            target = _getImported(target)
+            if target is None:
+                return False
+        ConfigClass = wrapper._ConfigClass
+        if isinstance(ConfigClass, str):
+            ConfigClass = _getImported(ConfigClass)
+            if ConfigClass is None:
+                return False
+        try:
+            self._dict[name] = self._makeWrapper(target, ConfigClass)
+        except (AttributeError, TypeError):
+            # reported when the target is looked up
+            return False
+        return True
+
+    def getNamesByTarget(self, target):
+        """Get the names that a target is registered under.
+
+        Parameters
+        ----------
+        target : obj
+            A configurable type, as passed to `register`.
+
+        Returns
+        -------
+        names : `tuple` of `str`
+            The names of the target in registration order; empty if the
+            target is not registered.
+
+        Notes
+        -----
+        Targets registered by name are not imported by this lookup. Those
+        whose modules have been imported, such as ``target`` itself, are
+        found; the others cannot be ``target``.
+        """
+        return self._getIndex()[0].get(target, ())
+
+    def getNamesByConfigClass(self, ConfigClass):
+        """Get the names of the targets that are configured by a config
+        class.
+
+        Parameters
+        ----------
+        ConfigClass : `lsst.pex.config.Config`-type
+            The config class. Targets configured by subclasses of it are not
+            included.
+
+        Returns
+        -------
+        names : `tuple` of `str`
+            The names of the targets in registration order; empty if no
+            target uses ``ConfigClass``.
+
+        Notes
+        -----
+        As for `getNamesByTarget`, targets registered by name are not
+        imported, and only those whose modules have been imported are found.
+        """
+        return self._getIndex()[1].get(ConfigClass, ())
+
+    def makeField(self, doc, default=None, optional=False, multi=False, saveAll=False):
         """Create a `RegistryField` configuration field from this registry.
 
         Parameters
@@ -181,13 +455,36 @@ class Registry(collections.abc.Mapping):
         multi : `bool`, optional
             A flag to allow multiple selections in the `RegistryField` if
             `True`.
+        saveAll : `bool`, optional
+            If `True`, saving includes the configs of every target in the
+            registry, not only those that have been accessed or selected.
 
         Returns
         -------
         field : `lsst.pex.config.RegistryField`
             `~lsst.pex.config.RegistryField` Configuration field.
         """
-        return RegistryField(doc, self, default, optional, multi)
+        return RegistryField(doc, self, default, optional, multi, saveAll=saveAll)
+
+
+class _RegistrySnapshot(Registry):
+    """Read-only copy of a `Registry`, made by `Registry.snapshot`.
+
+    Parameters
+    ----------
+    registry : `Registry`
+        The registry to copy.
+    """
+
+    def __init__(self, registry):
+        self._configBaseType = registry._configBaseType
+        self._dict = dict(registry._dict)
+        self._version = registry._version
+        self._snapshot = self
+        self._index = registry._index
+
+    def register(self, name, target, ConfigClass=None):
+        raise RuntimeError("Cannot register %r in a read-only snapshot of a registry" % name)
 
 
 class RegistryAdaptor(collections.abc.Mapping):
@@ -215,6 +512,10 @@ class RegistryAdaptor(collections.abc.Mapping):
     def __contains__(self, k):
         return k in self.registry
 
+    def _snapshot(self):
+        snapshot = self.registry.snapshot()
+        return self if snapshot is self.registry else RegistryAdaptor(snapshot)
+
 
 class RegistryInstanceDict(ConfigInstanceDict):
     """Dictionary of instantiated configs, used to populate a `RegistryField`.
@@ -227,6 +528,8 @@ class RegistryInstanceDict(ConfigInstanceDict):
         Configuration field.
     """
 
+    __slots__ = ("registry",)
+
     def __init__(self, config, field):
         ConfigInstanceDict.__init__(self, config, field)
         self.registry = field.registry
@@ -267,11 +570,11 @@ class RegistryInstanceDict(ConfigInstanceDict):
         else:
             return self._field.typemap.registry[self.name](*args, config=self[self.name], **kw)
 
-    def __setattr__(self, attr, value):
+    def __setattr__(self, attr, value, at=None, label="assignment"):
         if attr == "registry":
             object.__setattr__(self, attr, value)
         else:
-            ConfigInstanceDict.__setattr__(self, attr, value)
+            ConfigInstanceDict.__setattr__(self, attr, value, at=at, label=label)
 
 
 class RegistryField(ConfigChoiceField):
@@ -291,6 +594,10 @@ class RegistryField(ConfigChoiceField):
     multi : `bool`, optional
         If `True`, the field allows multiple selections. The default is
         `False`.
+    saveAll : `bool`, optional
+        If `True`, saving includes the configs of every target in the
+        registry, not only those that have been accessed or selected. The
+        default is `False`.
 
     See also
     --------
@@ -309,10 +616,10 @@ class RegistryField(ConfigChoiceField):
     """Class used to hold configurable instances in the field.
     """
 
-    def __init__(self, doc, registry, default=None, optional=False, multi=False):
+    def __init__(self, doc, registry, default=None, optional=False, multi=False, saveAll=False):
         types = RegistryAdaptor(registry)
         self.registry = registry
-        ConfigChoiceField.__init__(self, doc, types, default, optional, multi)
+        ConfigChoiceField.__init__(self, doc, types, default, optional, multi, saveAll=saveAll)
 
     def __deepcopy__(self, memo):
         """Customize deep-copying, want a reference to the original registry.
@@ -322,7 +629,7 @@ class RegistryField(ConfigChoiceField):
         """
         other = type(self)(doc=self.doc, registry=self.registry,
                            default=copy.deepcopy(self.default),
-                           optional=self.optional, multi=self.multi)
+                           optional=self.optional, multi=self.multi, saveAll=self.saveAll)
         other.source = self.source
         return other
 
@@ -241,7 +241,7 @@ def makeConfigClass(ctrl, name=None, base=Config, doc=None, module=None, cls=Non
         The ``__at``, ``__label``, and ``__reset`` arguments are for internal
         use only; they are used to remove internal calls from the history.
         """
-        if __at is None:
+        if __at is None and self._recordsHistory():
             __at = getCallStack()
         values = {}
         for k, f in fields.items():
@@ -26,6 +26,8 @@ import os
 import pickle
 import unittest
 
+import numpy
+
 import lsst.pex.config as pexConfig
 
 # Some tests depend on daf_base or pex_policy.
@@ -92,6 +94,32 @@ class Deprecation(pexConfig.Config):
     old = pexConfig.Field("Something.", int, default=10, deprecated="not used!")
 
 
+class CustomSaveField(pexConfig.Field):
+    def save(self, outfile, instance):
+        outfile.write(u"# custom save\n")
+        pexConfig.Field.save(self, outfile, instance)
+
+
+class CustomSave(pexConfig.Config):
+    f = CustomSaveField("custom save test", float, default=1.0)
+
+
+class CountDefaults(pexConfig.Config):
+    setDefaultsCalls = 0
+    f = pexConfig.Field("float test", float, default=1.0)
+
+    def setDefaults(self):
+        CountDefaults.setDefaultsCalls += 1
+        self.f = 2.0
+
+
+class InitState(pexConfig.Config):
+    f = pexConfig.Field("float test", float, default=1.0)
+
+    def __init__(self, **kwargs):
+        self.__dict__["initialized"] = True
+
+
 class ConfigTest(unittest.TestCase):
     def setUp(self):
         self.simple = Simple()
@@ -174,6 +202,50 @@ class ConfigTest(unittest.TestCase):
         self.comp.r = "BBB"
         self.comp.validate()
 
+    def testIncrementalValidate(self):
+        """Test that validate() skips configs unchanged since they were last
+        validated.
+        """
+        checked = []
+
+        class CheckedField(pexConfig.Field):
+            def validate(self, instance):
+                checked.append(self.__get__(instance))
+                pexConfig.Field.validate(self, instance)
+
+        class Checked(pexConfig.Config):
+            f = CheckedField("checked", float, default=1.0)
+
+        class Parent(pexConfig.Config):
+            a = pexConfig.ConfigField("a", Checked)
+            b = pexConfig.ConfigField("b", Checked)
+            c = pexConfig.ConfigDictField("c", str, Checked, default={})
+
+        parent = Parent()
+        parent.validate()
+        self.assertEqual(checked, [1.0, 1.0])
+        parent.validate()
+        self.assertEqual(checked, [1.0, 1.0])
+
+        parent.a.f = 2.0
+        parent.c["x"] = Checked(f=3.0)
+        parent.validate()
+        self.assertEqual(checked[2:], [2.0, 3.0])
+
+        parent.b.f = None
+        self.assertRaises(pexConfig.FieldValidationError, parent.validate)
+        self.assertRaises(pexConfig.FieldValidationError, parent.validate)
+        parent.b.f = 1.0
+        del checked[:]
+        parent.validate(force=True)
+        self.assertEqual(sorted(checked), [1.0, 2.0, 3.0])
+
+        # changing the selection of a choice field revalidates it
+        self.comp.r["BBB"].f = None
+        self.comp.validate()
+        self.comp.r = "BBB"
+        self.assertRaises(pexConfig.FieldValidationError, self.comp.validate)
+
     def testRangeFieldConstructor(self):
         """Test RangeField constructor's checking of min, max
         """
@@ -265,6 +337,119 @@ class ConfigTest(unittest.TestCase):
         self.assertEqual(self.comp.c.f, roundTrip.c.f)
         self.assertEqual(self.comp.r.name, roundTrip.r.name)
 
+    def testSaveWithoutRename(self):
+        """Test that saving neither renames the config nor modifies its
+        imports.
+        """
+        self.comp.c.f = 5.
+        names = [self.comp._name, self.comp.c._name, self.comp.r["AAA"]._name]
+        stream = io.StringIO()
+        self.comp.saveToStream(stream, root="saved")
+        self.assertEqual([self.comp._name, self.comp.c._name, self.comp.r["AAA"]._name], names)
+        self.assertRaises(AttributeError, object.__getattribute__, self.comp.c, "_imports")
+        self.assertIn("saved.c.f=5.0", stream.getvalue())
+        self.assertIn("saved.r['AAA'].f=", stream.getvalue())
+
+        roundTrip = Complex()
+        roundTrip.loadFromStream(stream.getvalue(), root="saved")
+        self.assertEqual(roundTrip.c.f, 5.)
+
+        # Fields that customize save are saved with the config renamed
+        custom = CustomSave(f=4.0)
+        stream = io.StringIO()
+        custom.saveToStream(stream)
+        self.assertIn("# custom save\n# custom save test\nconfig.f=4.0", stream.getvalue())
+        self.assertIsNone(custom._name)
+
+    def testSaveCompact(self):
+        """Test that compact files only hold the changes made to a new config.
+        """
+        self.comp.c.f = 5.
+        self.comp.r = "BBB"
+        self.comp.r["AAA"].ll = [4, 5]
+        self.comp.p["BBB"].f = 2.
+        stream = io.StringIO()
+        self.comp.saveToStream(stream, root="root", compact=True)
+        saved = stream.getvalue()
+        self.assertNotIn("#", saved)
+        self.assertIn("root.c.f=5.0\n", saved)
+        self.assertIn("root.r.name='BBB'\n", saved)
+        self.assertIn("root.r['AAA'].ll=[4, 5]\n", saved)
+        self.assertNotIn("root.r['AAA'].f", saved)
+        self.assertNotIn("root.p.name", saved)
+
+        full = io.StringIO()
+        self.comp.saveToStream(full, root="root")
+        self.assertLess(len(saved), len(full.getvalue()))
+
+        roundTrip = Complex()
+        roundTrip.loadFromStream(saved, root="root")
+        self.assertTrue(pexConfig.compareConfigs("comp", self.comp, roundTrip))
+        self.assertEqual(roundTrip.r["AAA"].ll, [4, 5])
+
+        # Fields set by setDefaults are compared with their new defaults
+        counted = CountDefaults()
+        stream = io.StringIO()
+        counted.saveToStream(stream, compact=True)
+        self.assertNotIn("config.f", stream.getvalue())
+        counted.f = 1.0
+        stream = io.StringIO()
+        counted.saveToStream(stream, compact=True)
+        self.assertIn("config.f=1.0", stream.getvalue())
+        roundTrip = CountDefaults()
+        roundTrip.loadFromStream(stream.getvalue())
+        self.assertEqual(roundTrip.f, 1.0)
+
+    def testSaveStructured(self):
+        self.comp.r = "BBB"
+        self.comp.p = "AAA"
+        self.comp.c.f = 5.
+        self.comp.r["AAA"].ll = [4, 5]
+        self.comp.r["AAA"].d = {"key": "v2", "other": "value"}
+        self.comp.r["AAA"].i = None
+        self.comp.r["AAA"].f = float("inf")
+        self.comp.saveStructured("roundtrip.test")
+
+        roundTrip = Complex()
+        roundTrip.loadStructured("roundtrip.test")
+        os.remove("roundtrip.test")
+        self.assertTrue(self.comp.compare(roundTrip))
+        self.assertEqual(roundTrip.r.name, "BBB")
+        self.assertEqual(roundTrip.r["AAA"].ll, [4, 5])
+        self.assertEqual(roundTrip.r["AAA"].f, float("inf"))
+
+        # non-exec round trip through a stream must agree with the exec one
+        stream = io.StringIO()
+        self.comp.saveStructuredToStream(stream)
+        roundTrip = Complex()
+        roundTrip.loadStructuredFromStream(stream.getvalue())
+        stream = io.StringIO()
+        self.comp.saveToStream(stream)
+        fromExec = Complex()
+        fromExec.loadFromStream(stream.getvalue())
+        self.assertTrue(fromExec.compare(roundTrip))
+
+        class ComplexValued(pexConfig.Config):
+            z = pexConfig.Field("complex test", complex, default=1j)
+            d = pexConfig.DictField("dict test", int, complex, default={1: 2 + 3j})
+            m = pexConfig.ConfigChoiceField("multi", typemap=GLOBAL_REGISTRY, multi=True, default=["AAA"])
+
+        config = ComplexValued(z=4 - 1j, d={2: 1j, -3: 0j})
+        config.m.names = ["AAA", "BBB"]
+        stream = io.StringIO()
+        config.saveStructuredToStream(stream)
+        roundTrip = ComplexValued()
+        roundTrip.loadStructuredFromStream(stream.getvalue())
+        self.assertEqual(roundTrip.z, 4 - 1j)
+        self.assertEqual(roundTrip.d, {2: 1j, -3: 0j})
+        self.assertEqual(set(roundTrip.m.names), {"AAA", "BBB"})
+
+        with self.assertRaises(TypeError):
+            self.simple.loadStructuredFromStream(stream.getvalue())
+        with self.assertRaises(KeyError):
+            self.simple.loadStructuredFromStream(
+                '{"type":"%s","imports":[],"values":{"bork":1}}' % pexConfig.config._typeStr(self.simple))
+
     def testDuplicateRegistryNames(self):
         self.comp.r["AAA"].f = 5.0
         self.assertEqual(self.comp.p["AAA"].f, 3.0)
@@ -404,6 +589,71 @@ except ImportError:
         comp = pickle.loads(pickle.dumps(self.comp))
         self.assertIsInstance(comp, Complex)
         self.assertEqual(self.comp.c.f, comp.c.f)
+        self.assertTrue(self.comp.compare(comp))
+
+        # Structured pickles do not run setDefaults
+        counted = CountDefaults(f=3.0)
+        self.assertIs(counted.__reduce__()[0], pexConfig.config.unreduceStructuredConfig)
+        calls = CountDefaults.setDefaultsCalls
+        counted = pickle.loads(pickle.dumps(counted))
+        self.assertEqual(CountDefaults.setDefaultsCalls, calls)
+        self.assertEqual(counted.f, 3.0)
+
+        # but they still run __init__
+        initState = InitState(f=3.0)
+        del initState.__dict__["initialized"]
+        initState = pickle.loads(pickle.dumps(initState))
+        self.assertTrue(initState.initialized)
+        self.assertEqual(initState.f, 3.0)
+
+        # Fields with a custom save fall back to exec
+        custom = CustomSave(f=4.0)
+        self.assertIs(custom.__reduce__()[0], pexConfig.config.unreduceConfig)
+        custom = pickle.loads(pickle.dumps(custom))
+        self.assertEqual(custom.f, 4.0)
+
+    def testFingerprint(self):
+        """Test that fingerprints track the contents of configs.
+        """
+        comp2 = Complex()
+        fingerprint = self.comp.fingerprint()
+        self.assertEqual(fingerprint, comp2.fingerprint())
+        self.assertIs(self.comp.fingerprint(), fingerprint)
+        self.assertNotEqual(fingerprint, Simple().fingerprint())
+
+        comp2.r["AAA"].ll.append(4)
+        self.assertNotEqual(comp2.fingerprint(), fingerprint)
+        del comp2.r["AAA"].ll[-1]
+        self.assertEqual(comp2.fingerprint(), fingerprint)
+        comp2.p = "AAA"
+        self.assertNotEqual(comp2.fingerprint(), fingerprint)
+        comp2.p = "BBB"
+        # selecting AAA instantiated it, so it is now saved with comp2
+        self.comp.p["AAA"]
+        self.assertEqual(comp2.fingerprint(), self.comp.fingerprint())
+
+        # matching fingerprints of frozen configs are a fast path for
+        # comparisons
+        self.comp.r["AAA"].ll = [1, 2]
+        self.comp.freeze()
+        comp2.r["AAA"].ll = [1, 2]
+        comp2.freeze()
+        self.assertEqual(self.comp.fingerprint(), comp2.fingerprint())
+        self.assertTrue(self.comp._fingerprint[2])
+        self.assertEqual(self.comp, comp2)
+        self.assertTrue(self.comp.compare(comp2))
+
+        # comparisons do not compute fingerprints that are not cached
+        comp3 = Complex()
+        comp3.r["AAA"].ll = [1, 2]
+        comp3.p["AAA"]
+        self.assertEqual(self.comp, comp3)
+        self.assertTrue(comp3.compare(self.comp))
+        frozen = Simple()
+        frozen.freeze()
+        self.assertEqual(frozen, Simple())
+        self.assertIsNone(comp3._fingerprint)
+        self.assertIsNone(frozen._fingerprint)
 
     def testCompare(self):
         comp2 = Complex()
@@ -457,6 +707,219 @@ except ImportError:
         # Before DM-16561, this raised.
         self.assertFalse(self.outer.compare(self.inner))
 
+    def testBulkUpdate(self):
+        """Test setting many fields, including in subconfigs, as one
+        update.
+        """
+        self.comp.bulkUpdate({"c.f": 2, "r": "BBB"})
+        self.assertEqual(self.comp.c.f, 2.0)
+        self.assertEqual(self.comp.r.name, "BBB")
+        self.outer.bulkUpdate({"f": 1, "i": {"f": 6}}, label="overrides")
+        self.assertEqual(self.outer.f, 1.0)
+        self.assertEqual(self.outer.i.f, 6.0)
+        self.assertEqual(self.outer.history["f"][-1][2], "overrides")
+        # One call stack is shared by every field set.
+        self.assertIs(self.outer.history["f"][-1][1], self.outer.i.history["f"][-1][1])
+
+        self.simple.bulkUpdate({"i": 4, "ll": [5, 6], "d": {"k": "v2"}})
+        self.assertEqual(self.simple.i, 4)
+        self.assertEqual(list(self.simple.ll), [5, 6])
+        self.assertEqual(dict(self.simple.d), {"k": "v2"})
+
+        # A failed update leaves the config unchanged, whether the failure is
+        # found before or while fields are set.
+        before = io.StringIO()
+        self.simple.saveToStream(before)
+        history = {k: list(v) for k, v in self.simple.history.items()}
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.simple.bulkUpdate({"i": 5, "f": "not a float"})
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.simple.bulkUpdate({"i": 5, "ll": [7, 8], "d": {"k": "bad"}})
+        self.assertEqual(self.simple.i, 4)
+        self.assertEqual(list(self.simple.ll), [5, 6])
+        self.assertEqual(dict(self.simple.d), {"k": "v2"})
+        self.assertEqual(self.simple.history, history)
+        after = io.StringIO()
+        self.simple.saveToStream(after)
+        self.assertEqual(after.getvalue(), before.getvalue())
+
+        # choice fields are updated in place, but are still unchanged by a
+        # failed update
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.comp.bulkUpdate({"c.f": 5, "p": "AAA", "r": "missing"})
+        self.assertEqual(self.comp.c.f, 2.0)
+        self.assertEqual(self.comp.p.name, "BBB")
+        self.assertEqual(self.comp.r.name, "BBB")
+
+        with self.assertRaises(KeyError):
+            self.comp.bulkUpdate({"c.missing": 1})
+        with self.assertRaises(KeyError):
+            self.comp.bulkUpdate({"missing.f": 1})
+        self.comp.freeze()
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.comp.bulkUpdate({"c.f": 3})
+
+    def testCopy(self):
+        """Test that copies match the original and that either can be
+        modified without affecting the other.
+        """
+        self.simple.ll.append(4)
+        self.comp.c.f = 2.0
+        self.comp.r.name = "BBB"
+        self.comp.r["AAA"].d["key"] = "v2"
+        for config in (self.simple, self.comp, self.outer):
+            with self.subTest(config=type(config).__name__):
+                for frozen in (False, True):
+                    if frozen:
+                        config.freeze()
+                    copy = config.copy()
+                    self.assertIs(type(copy), type(config))
+                    self.assertFalse(copy._frozen)
+                    self.assertEqual(copy, config)
+                    self.assertEqual(copy.history, config.history)
+                    self.assertEqual(copy.toDict(), config.toDict())
+
+        before = self.comp.toDict()
+        copy = self.comp.copy()
+        copy.c.f = 3.0
+        copy.r.name = "AAA"
+        copy.r["AAA"].ll.append(5)
+        copy.r["AAA"].d["key"] = "v3"
+        self.assertEqual(self.comp.toDict(), before)
+        self.assertNotEqual(copy.toDict(), before)
+        # Copies of a copy are independent too.
+        second = copy.copy()
+        second.r["AAA"].ll.append(6)
+        self.assertEqual(list(copy.r["AAA"].ll), [1, 2, 3, 5])
+        self.assertEqual(len(copy.history["c"]), len(self.comp.history["c"]))
+
+        copy = self.simple.copy()
+        copy.ll.append(5)
+        copy.i = 1
+        self.assertEqual(list(self.simple.ll), [1, 2, 3, 4])
+        self.assertIsNone(self.simple.i)
+        self.assertNotEqual(len(copy.history["ll"]), len(self.simple.history["ll"]))
+
+        # Copying an unfrozen config does not share its containers.
+        unfrozen = Simple()
+        copy = unfrozen.copy()
+        unfrozen.ll.append(4)
+        unfrozen.d["key"] = "v5"
+        self.assertEqual(list(copy.ll), [1, 2, 3])
+        self.assertEqual(copy.d["key"], "value")
+
+    def testSlots(self):
+        """Test that config state and the containers of field values do not
+        need per-instance dictionaries.
+        """
+        config = pexConfig.Config()
+        self.assertFalse(hasattr(config, "__dict__"))
+        with self.assertRaises(AttributeError):
+            config.notAField = 1
+        for value in (self.simple.ll, self.simple.d, self.comp.r):
+            self.assertFalse(hasattr(value, "__dict__"))
+        self.assertEqual(self.simple.ll.__doc__, Simple.ll.doc)
+        self.assertEqual(self.comp.r.__doc__, Complex.r.doc)
+        self.assertIn("list", pexConfig.listField.List.__doc__)
+        with pexConfig.history.historyLimit(0):
+            simple = Simple()
+        self.assertEqual(simple.history["f"], [])
+        self.assertEqual(simple.toDict(), self.simple.toDict())
+
+    def testCompareFloats(self):
+        """Test that floating-point comparisons match numpy.allclose, both
+        for scalars and for long float lists and dicts.
+        """
+        nan, inf = float("nan"), float("inf")
+        pairs = [(1.0, 1.0), (1.0, 1.0 + 1E-9), (1.0, 1.1), (0.0, 1E-9), (0.0, 1E-7), (nan, nan),
+                 (nan, 1.0), (inf, inf), (inf, -inf), (inf, 1.0), (1, 1.0), (1j, 1j + 1E-9),
+                 (1j, complex(nan, 0)), (complex(nan, 0), complex(0, nan))]
+        for v1, v2 in pairs:
+            with self.subTest(v1=v1, v2=v2):
+                expected = bool(numpy.allclose(v1, v2) or (numpy.isnan(v1) and numpy.isnan(v2)))
+                self.assertEqual(pexConfig.compareScalars("x", v1, v2, output=None, dtype=float), expected)
+                self.assertEqual(pexConfig.compareScalars("x", numpy.float64(v1.real), v2.real,
+                                                          output=None, dtype=float),
+                                 pexConfig.compareScalars("x", v1.real, v2.real, output=None, dtype=float))
+
+        class FloatConfig(pexConfig.Config):
+            ll = pexConfig.ListField("list", float, default=[])
+            d = pexConfig.DictField("dict", str, float, default={})
+
+        n = 1000
+        c1 = FloatConfig()
+        c2 = FloatConfig()
+        for c in (c1, c2):
+            c.ll = [float(i) for i in range(n)] + [nan]
+            c.d = {"k%d" % i: float(i) for i in range(n)}
+        self.assertTrue(c1.compare(c2))
+        c2.ll[5] += 1E-10
+        self.assertTrue(c1.compare(c2))
+        c2.ll[7] = 8.5
+        c2.ll[n] = 1.0
+        c2.d["k3"] = 4.5
+        outList = []
+        self.assertFalse(c1.compare(c2, shortcut=True, output=outList.append))
+        self.assertEqual(outList, ["Inequality in ll[7]: 7.0 != 8.5"])
+        del outList[:]
+        self.assertFalse(c1.compare(c2, shortcut=False, output=outList.append))
+        self.assertEqual(outList, ["Inequality in ll[7]: 7.0 != 8.5", "Inequality in ll[%d]: nan != 1.0" % n,
+                                   "Inequality in d['k3']: 3.0 != 4.5"])
+        c1.ll[1] = None
+        self.assertFalse(c1.compare(c2, shortcut=False, output=None))
+
+    def testDefaultsTemplate(self):
+        """Test that configs made from the cached defaults template match
+        those made without it and do not share mutable state.
+        """
+        class TemplateConfig(pexConfig.Config):
+            f = pexConfig.Field("float", float, default=1)
+            ll = pexConfig.ListField("list", int, default=[1, 2])
+            d = pexConfig.DictField("dict", str, int, default={"a": 1})
+            c = pexConfig.ConfigField("inner", InnerConfig)
+
+            def setDefaults(self):
+                self.ll.append(3)
+
+        first = TemplateConfig()
+        self.assertIsNotNone(TemplateConfig._defaultsTemplate)
+        first.ll.append(4)
+        first.d["b"] = 2
+        first.c.f = 2.0
+        second = TemplateConfig()
+        self.assertEqual(second.f, 1.0)
+        self.assertIsInstance(second.f, float)
+        self.assertEqual(list(second.ll), [1, 2, 3])
+        self.assertEqual(dict(second.d), {"a": 1})
+        self.assertEqual(second.c.f, 0.0)
+        self.assertEqual(list(second.keys()), list(TemplateConfig._fields.keys()))
+        self.assertEqual([h[0] for h in second.history["ll"]], [[1, 2], [1, 2, 3]])
+        self.assertEqual([h[2] for h in second.history["f"]], ["default"])
+        second.ll.append(5)
+        self.assertEqual(list(first.ll), [1, 2, 3, 4])
+
+        # Replacing a default, modifying a mutable default in place, or
+        # adding a field invalidates the template
+        TemplateConfig.f.default = 2.0
+        self.assertEqual(TemplateConfig().f, 2.0)
+        TemplateConfig.ll.default.append(10)
+        TemplateConfig.d.default["z"] = 26
+        third = TemplateConfig()
+        self.assertEqual(list(third.ll), [1, 2, 10, 3])
+        self.assertEqual(dict(third.d), {"a": 1, "z": 26})
+        self.assertEqual(list(TemplateConfig().ll), [1, 2, 10, 3])
+        TemplateConfig.g = pexConfig.Field("int", int, default=3)
+        self.assertIsNone(TemplateConfig._defaultsTemplate)
+        self.assertEqual(TemplateConfig().g, 3)
+
+        # Invalid defaults are still reported every time
+        class BadConfig(pexConfig.Config):
+            i = pexConfig.Field("int", int, default=1, check=lambda x: x > 1)
+
+        for _ in range(2):
+            with self.assertRaises(pexConfig.FieldValidationError):
+                BadConfig()
+
     def testLoadError(self):
         """Check that loading allows errors in the file being loaded to propagate
         """
@@ -475,6 +938,21 @@ except ImportError:
         for name in names:
             self.assertTrue(hasattr(self.simple, name))
 
+    def testWalk(self):
+        """Check that walk() yields the names, fields and values of nested
+        configs.
+        """
+        self.comp.r = "BBB"
+        entries = {name: (field, value) for name, field, value in self.comp.walk()}
+        self.assertEqual(list(entries), self.comp.names())
+        self.assertEqual(entries["c.f"], (InnerConfig.f, 0.0))
+        self.assertEqual(entries["r['AAA'].ll"], (Simple.ll, [1, 2, 3]))
+        self.assertEqual(entries["r.name"], (Complex.r, "BBB"))
+        self.assertEqual(entries["p.name"], (Complex.p, "BBB"))
+        # the alternatives of p that were never used are not visited
+        self.assertNotIn("p['AAA'].f", entries)
+        self.assertEqual(len(entries), 1 + (len(self.simple.names()) + 1 + 1) + (1 + 1))
+
 
 if __name__ == "__main__":
     unittest.main()
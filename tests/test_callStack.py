@@ -0,0 +1,146 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import copy
+import gc
+import pickle
+import threading
+import unittest
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config import callStack
+from lsst.pex.config.callStack import CallStack, StackFrame, getCallStack
+
+
+class SimpleConfig(pexConfig.Config):
+    i = pexConfig.Field("integer", int, default=1)
+
+
+def getStack():
+    return getCallStack(-1)
+
+
+class CallStackTest(unittest.TestCase):
+    def testLazy(self):
+        """Test that frames are only interpreted when the stack is inspected.
+        """
+        stack = getStack()
+        self.assertIsNone(stack._node._frame)
+        self.assertGreater(len(stack), 1)
+        stack.insert(0, StackFrame("head.py", 1, "head"))
+        stack.append(StackFrame("tail.py", 2, "tail"))
+        combined = [StackFrame("first.py", 0, "first")] + stack + [StackFrame("last.py", 3, "last")]
+        self.assertIsInstance(combined, CallStack)
+        self.assertIsNone(stack._node.parent._frame)
+
+        frames = list(combined)
+        self.assertEqual(len(frames), len(stack) + 2)
+        self.assertEqual([f.function for f in frames[:2]], ["first", "head"])
+        self.assertEqual([f.function for f in frames[-3:]], ["getStack", "tail", "last"])
+        self.assertEqual(frames[-4].function, "testLazy")
+
+    def testInterning(self):
+        """Test that stacks through the same frames share their nodes.
+        """
+        stacks = []
+        for _ in range(2):
+            stacks.append(getStack())
+        self.assertIs(stacks[0]._node, stacks[1]._node)
+        self.assertEqual(stacks[0], stacks[1])
+        self.assertIs(stacks[0][-1], stacks[1][-1])
+
+        # A stack captured from another line shares the nodes of its callers
+        other = getStack()
+        self.assertIsNot(other._node, stacks[0]._node)
+        self.assertIs(other._node.parent.parent, stacks[0]._node.parent.parent)
+
+        frame = StackFrame("tail.py", 2, "tail")
+        extended = [stack + [frame] for stack in stacks]
+        self.assertIs(extended[0]._node, extended[1]._node)
+        self.assertIs(extended[0]._node.parent, stacks[0]._node)
+        self.assertIs(extended[0][-1], frame)
+
+        # Modifying a stack does not affect stacks that share its nodes
+        del extended[0][0]
+        self.assertEqual(len(extended[0]), len(extended[1]) - 1)
+        self.assertEqual(extended[0][-1].function, "tail")
+        self.assertIs(copy.deepcopy(extended[1])._node, extended[1]._node)
+        self.assertEqual(pickle.loads(pickle.dumps(extended[1])), extended[1])
+
+    def testUnusedNodes(self):
+        """Test that nodes are released with the last stack using them.
+        """
+        tail = [StackFrame("unused.py", i, "unused") for i in range(100)]
+        stack = getStack() + tail
+        self.assertIn(("unused.py", 99, "unused", stack._node.parent), callStack._stackNodes)
+        del stack
+        gc.collect()
+        self.assertFalse(any(key[0] == "unused.py" for key in list(callStack._stackNodes.keys())))
+
+    def testThreads(self):
+        """Test that stacks captured concurrently are correct and shared.
+        """
+        stacks = []
+
+        def capture():
+            for _ in range(200):
+                stacks.append(getStack())
+
+        threads = [threading.Thread(target=capture) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({stack._node for stack in stacks}), 1)
+        self.assertEqual([frame.function for frame in stacks[0][-2:]], ["capture", "getStack"])
+
+    def testListCompatibility(self):
+        """Test that a CallStack behaves like a list of StackFrame.
+        """
+        stack = getStack()
+        frames = list(stack)
+        self.assertEqual(stack, frames)
+        self.assertEqual(stack[-1].function, "getStack")
+        del stack[-1]
+        self.assertEqual(stack[-1].function, "testListCompatibility")
+        stack += [StackFrame("tail.py", 2, "tail")]
+        self.assertEqual(stack[-1].function, "tail")
+        self.assertEqual(len(stack), len(frames))
+
+    def testHistory(self):
+        """Test that history records lazy stacks that format correctly.
+        """
+        config = SimpleConfig()
+        config.i = 2
+        stack = config.history["i"][-1][1]
+        self.assertIsInstance(stack, CallStack)
+        self.assertIsNone(stack._node._frame)
+        self.assertIn("config.i = 2", config.formatHistory("i"))
+        self.assertIsNotNone(stack._node._frame)
+
+        # Defaults are recorded with the stack of the constructor
+        defaults = [config.history["i"][0][1] for config in (SimpleConfig(), SimpleConfig())]
+        self.assertIs(defaults[0]._node, defaults[1]._node)
+
+
+if __name__ == "__main__":
+    unittest.main()
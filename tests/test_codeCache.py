@@ -0,0 +1,121 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import importlib.util
+import marshal
+import os
+import tempfile
+import unittest
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.overridePlan import OverridePlan
+
+
+class SimpleConfig(pexConfig.Config):
+    i = pexConfig.Field("integer", int, default=1)
+
+
+class CodeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "override.py")
+        self.writeOverride("config.i = 2\n")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def writeOverride(self, text):
+        with open(self.filename, "w") as f:
+            f.write(text)
+
+    def testMemory(self):
+        """Test that unchanged files are compiled once and edits are seen.
+        """
+        cache = pexConfig.CodeCache()
+        code = cache.getCode(self.filename)
+        self.assertIs(cache.getCode(self.filename), code)
+        self.assertEqual((cache.hits, cache.diskHits, cache.misses), (1, 0, 1))
+
+        self.writeOverride("config.i = 30\n")
+        config = SimpleConfig()
+        config.loadFromStream(cache.getCode(self.filename))
+        self.assertEqual(config.i, 30)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        cache.clear()
+        cache.getCode(self.filename)
+        self.assertEqual(cache.misses, 3)
+
+    def testDisk(self):
+        """Test that compiled code is shared through the on-disk cache.
+        """
+        directory = os.path.join(self.dir.name, "cache")
+        first = pexConfig.CodeCache(directory)
+        first.getCode(self.filename)
+        self.assertEqual(first.misses, 1)
+
+        second = pexConfig.CodeCache(directory)
+        config = SimpleConfig()
+        config.loadFromStream(second.getCode(self.filename))
+        self.assertEqual(config.i, 2)
+        self.assertEqual((second.hits, second.diskHits, second.misses), (0, 1, 0))
+
+        # corrupt entries are ignored
+        for name in os.listdir(directory):
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(b"bork")
+        third = pexConfig.CodeCache(directory)
+        third.getCode(self.filename)
+        self.assertEqual((third.diskHits, third.misses), (0, 1))
+        for payload in (marshal.dumps((1, 2, 3))[:-1], marshal.dumps((1, 2)), marshal.dumps((1, 2, 3)),
+                        marshal.dumps((third.getCode(self.filename), None, [[]])),
+                        marshal.dumps((third.getCode(self.filename), 5, ()))):
+            for name in os.listdir(directory):
+                with open(os.path.join(directory, name), "wb") as f:
+                    f.write(importlib.util.MAGIC_NUMBER + payload)
+            cache = pexConfig.CodeCache(directory)
+            cache.getCode(self.filename)
+            self.assertEqual((cache.diskHits, cache.misses), (0, 1))
+
+        # plans that cannot be marshalled are only cached in memory
+        plan = OverridePlan(self.filename, (("set", 1, "config", ((False, "i"),), object()),), ())
+        cache = pexConfig.CodeCache(os.path.join(self.dir.name, "unwritable"))
+        cache._writeDisk(("key",), plan)
+        self.assertFalse(os.path.exists(cache.directory))
+
+    def testLoad(self):
+        """Test that Config.load uses the process-wide cache.
+        """
+        cache = pexConfig.getCodeCache()
+        hits = cache.hits
+        for i in range(3):
+            config = SimpleConfig()
+            config.load(self.filename)
+            self.assertEqual(config.i, 2)
+        self.assertEqual(cache.hits, hits + 2)
+
+        self.writeOverride("config.i = \n")
+        self.assertRaises(SyntaxError, SimpleConfig().load, self.filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
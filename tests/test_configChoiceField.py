@@ -19,6 +19,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import os
 import unittest
 import lsst.pex.config as pexConfig
@@ -82,6 +83,32 @@ class ConfigChoiceFieldTest(unittest.TestCase):
         self.assertEqual(self.config.a["AAA"].f, roundtrip.a["AAA"].f)
         self.assertEqual(self.config.a["BBB"].f, roundtrip.a["BBB"].f)
 
+    def testSaveUsedOnly(self):
+        """Test that only the configs that were used are saved, unless the
+        field saves them all.
+        """
+        class SaveAll(pexConfig.Config):
+            a = pexConfig.ConfigChoiceField(doc="save all", typemap=TYPEMAP, default="AAA", saveAll=True)
+
+        self.config.a["BBB"].f = 2.0
+        self.assertEqual(set(self.config.toDict()["a"]["values"]), {"AAA", "BBB"})
+        self.assertEqual(set(self.config.toDict()["c"]["values"]), {"AAA"})
+        names = self.config.names()
+        self.assertIn("a['BBB'].f", names)
+        self.assertNotIn("a['CCC'].f", names)
+        roundtrip = Config3()
+        stream = io.StringIO()
+        self.config.saveToStream(stream)
+        roundtrip.loadFromStream(stream.getvalue())
+        self.assertEqual(roundtrip, self.config)
+        self.assertEqual(roundtrip.a["BBB"].f, 2.0)
+
+        # the selection is always saved, even if it has not been accessed
+        self.config.b = "CCC"
+        self.assertIn("b['CCC'].f", self.config.names())
+
+        self.assertEqual(set(SaveAll().toDict()["a"]["values"]), set(TYPEMAP))
+
     def testValidate(self):
         self.config.validate()
         self.config.a = "AAA"
@@ -99,6 +126,8 @@ class ConfigChoiceFieldTest(unittest.TestCase):
         self.config.freeze()
         self.assertRaises(pexConfig.FieldValidationError, setattr, self.config.a, "name", "AAA")
         self.assertRaises(pexConfig.FieldValidationError, setattr, self.config.a["AAA"], "f", "1")
+        # configs that are first used after freezing are frozen too
+        self.assertRaises(pexConfig.FieldValidationError, setattr, self.config.a["CCC"], "f", 1)
 
     def testNoArbitraryAttributes(self):
         self.assertRaises(pexConfig.FieldValidationError, setattr, self.config.a, "should", "fail")
@@ -19,6 +19,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import os
 import unittest
 import lsst.pex.config as pexConfig
@@ -95,6 +96,20 @@ class ConfigDictFieldTest(unittest.TestCase):
         c.d1["a"] = Config1(f=4)
         self.assertEqual(c.d1["a"].f, 4)
 
+    def testBulkModification(self):
+        c = Config2(d1={})
+        c.d1.update({"a": Config1(f=4), "b": Config1})
+        self.assertEqual(c.d1["a"].f, 4)
+        self.assertEqual(c.d1["b"].f, 3)
+        self.assertIn("Updated items at keys", c.history["d1"][-1][0])
+
+        self.assertRaises(pexConfig.FieldValidationError, c.d1.update, {"c": Config1, "d": 0})
+        self.assertNotIn("c", c.d1)
+
+        c.d1.clear()
+        self.assertEqual(len(c.d1), 0)
+        self.assertEqual(c.history["d1"][-1][0], "Removed all items")
+
     def testSave(self):
         c = Config2(d1={"a": Config1(f=4)})
         c.save("configDictTest.py")
@@ -112,6 +127,49 @@ class ConfigDictFieldTest(unittest.TestCase):
 
         self.assertIsNone(rt.d1)
 
+    def testSaveCompact(self):
+        c = Config2(d1={"a": Config1(f=4), "b": Config1})
+        stream = io.StringIO()
+        c.saveToStream(stream, compact=True)
+        self.assertIn("config.d1['b']=", stream.getvalue())
+        self.assertNotIn("config.d1['b'].f", stream.getvalue())
+
+        rt = Config2()
+        rt.loadFromStream(stream.getvalue())
+        self.assertEqual(rt.toDict(), c.toDict())
+
+        stream = io.StringIO()
+        Config3().saveToStream(stream, compact=True)
+        self.assertNotIn("config.field1", stream.getvalue())
+
+    def testSaveStructured(self):
+        c = Config2(d1={"a": Config1(f=4), "b": Config1})
+        c.saveStructured("configDictTest.json")
+
+        rt = Config2()
+        rt.loadStructured("configDictTest.json")
+        os.remove("configDictTest.json")
+        self.assertEqual(rt.toDict(), c.toDict())
+
+        c = Config2()
+        c.saveStructured("emptyConfigDictTest.json")
+        rt.loadStructured("emptyConfigDictTest.json")
+        os.remove("emptyConfigDictTest.json")
+
+        self.assertIsNone(rt.d1)
+
+    def testCopy(self):
+        c = Config2(d1={"a": Config1(f=4), "b": Config1})
+        for frozen in (False, True):
+            if frozen:
+                c.freeze()
+            copy = c.copy()
+            self.assertEqual(copy.toDict(), c.toDict())
+            copy.d1["a"].f = 5
+            copy.d1["c"] = Config1(f=6)
+            self.assertEqual(c.d1["a"].f, 4)
+            self.assertNotIn("c", c.d1)
+
     def testToDict(self):
         c = Config2(d1={"a": Config1(f=4), "b": Config1})
         dict_ = c.toDict()
@@ -19,7 +19,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import os
+import pickle
 import unittest
 import lsst.pex.config as pexConf
 
@@ -44,6 +46,17 @@ class Config2(pexConf.Config):
     c2 = pexConf.ConfigurableField("c2", target=Target2, ConfigClass=Config1, default=Config1(f=3))
 
 
+class OtherConfig(pexConf.Config):
+    y = pexConf.Field("y", dtype=int, default=1)
+
+
+class Config3(pexConf.Config):
+    c2 = pexConf.ConfigurableField("c2", target=Target2, ConfigClass=Config1)
+
+    def setDefaults(self):
+        self.c2.retarget(Target2, ConfigClass=OtherConfig)
+
+
 class ConfigurableFieldTest(unittest.TestCase):
     def testConstructor(self):
         try:
@@ -114,6 +127,42 @@ class ConfigurableFieldTest(unittest.TestCase):
 
         c.validate()
 
+    def testBulkUpdate(self):
+        c = Config2()
+        c.bulkUpdate({"c1.f": 2, "c2": {"f": 4}})
+        self.assertEqual(c.c1.f, 2.0)
+        self.assertEqual(c.c2.f, 4.0)
+        self.assertRaises(pexConf.FieldValidationError, c.bulkUpdate, {"c1.f": 6, "c2.f": 0})
+        self.assertEqual(c.c1.f, 2.0)
+
+        # configurable fields are updated in place, but are still unchanged
+        # by a failed update
+        self.assertRaises(pexConf.FieldValidationError, c.bulkUpdate, {"c1": Config1(f=7), "c2": "bad"})
+        self.assertEqual(c.c1.f, 2.0)
+        self.assertEqual(c.c1.history["f"][-1][0], 2.0)
+
+    def testDefaultModifiedInPlace(self):
+        Config2()
+        default = Config2.c2.default
+        try:
+            default.f = 4
+            self.assertEqual(Config2().c2.f, 4)
+        finally:
+            default.f = 3
+
+    def testCopy(self):
+        c = Config2()
+        c.c2.retarget(Target1)
+        c.c2.f = 10
+        c.freeze()
+        copy = c.copy()
+        self.assertTrue(copy.compare(c))
+        self.assertEqual(copy.c2.target, Target1)
+        copy.c1.f = 6
+        copy.c2.retarget(Target2, ConfigClass=Config1)
+        self.assertEqual(c.c1.f, 5)
+        self.assertEqual(c.c2.target, Target1)
+
     def testPersistence(self):
         c = Config2()
         c.c2.retarget(Target1)
@@ -127,6 +176,43 @@ class ConfigurableFieldTest(unittest.TestCase):
         self.assertEqual(c.c2.f, r.c2.f)
         self.assertEqual(c.c2.target, r.c2.target)
 
+        c.saveStructured("test.json")
+        r = Config2()
+        r.loadStructured("test.json")
+        os.remove("test.json")
+
+        self.assertEqual(c.c2.f, r.c2.f)
+        self.assertEqual(c.c2.target, r.c2.target)
+        self.assertEqual(c.c2.ConfigClass, r.c2.ConfigClass)
+
+    def testPickleRetargetedConfigClass(self):
+        c = Config3()
+        c.c2.y = 5
+        c2 = pickle.loads(pickle.dumps(c))
+        self.assertIs(c2.c2.ConfigClass, OtherConfig)
+        self.assertEqual(c2.c2.y, 5)
+
+    def testCompactPersistence(self):
+        c = Config2()
+        c.c2.retarget(Target1)
+        stream = io.StringIO()
+        c.saveToStream(stream, compact=True)
+        # Retargeting keeps the values of c2, so f is omitted
+        self.assertIn("config.c2.retarget(", stream.getvalue())
+        self.assertNotIn("config.c2.f", stream.getvalue())
+        self.assertNotIn("config.c1", stream.getvalue())
+
+        c.c2.f = 5
+        stream = io.StringIO()
+        c.saveToStream(stream, compact=True)
+        self.assertIn("config.c2.f=5.0", stream.getvalue())
+
+        r = Config2()
+        r.loadFromStream(stream.getvalue())
+        self.assertEqual(r.c2.f, 5)
+        self.assertEqual(r.c2.target, Target1)
+        self.assertTrue(pexConf.compareConfigs("c", c, r))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -103,6 +103,28 @@ class DictFieldTest(unittest.TestCase):
         c.d3[4] = 5
         self.assertEqual(c.d3, {4.: 5.})
 
+    def testBulkModification(self):
+        c = Config1()
+        nHistory = len(c.d1.history)
+        c.d1.update({"a": 1, "b": 2}, c=3)
+        self.assertEqual(c.d1, {"hi": 4, "a": 1, "b": 2, "c": 3})
+        self.assertEqual(len(c.d1.history), nHistory + 1)
+        self.assertEqual(c.d1.history[-1][0], c.d1)
+
+        # A bad item rejects the whole update
+        self.assertRaises(pexConfig.FieldValidationError, c.d1.update, {"d": 1, "e": 0})
+        self.assertRaises(pexConfig.FieldValidationError, c.d1.update, [(1, 1)])
+        self.assertNotIn("d", c.d1)
+
+        c.d1.clear()
+        self.assertEqual(c.d1, {})
+        self.assertEqual(c.d1.history[-1][0], {})
+        self.assertEqual(len(c.d1.history), nHistory + 2)
+
+        c.freeze()
+        self.assertRaises(pexConfig.FieldValidationError, c.d1.update, a=1)
+        self.assertRaises(pexConfig.FieldValidationError, c.d1.clear)
+
     def testNoArbitraryAttributes(self):
         c = Config1()
         self.assertRaises(pexConfig.FieldValidationError, setattr, c.d1, "should", "fail")
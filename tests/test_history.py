@@ -28,6 +28,16 @@ class PexTestConfig(pexConfig.Config):
     a = pexConfig.Field('Parameter A', float, default=1.0)
 
 
+class ContainerConfig(pexConfig.Config):
+    f = pexConfig.Field("float", float, default=1.0)
+    ll = pexConfig.ListField("list", int, default=[1])
+    d = pexConfig.DictField("dict", str, int, default={"a": 1})
+    c = pexConfig.ConfigField("config", PexTestConfig)
+    cd = pexConfig.ConfigDictField("config dict", str, PexTestConfig, default={})
+    r = pexConfig.ConfigChoiceField("choice", {"A": PexTestConfig}, default="A")
+    m = pexConfig.ConfigChoiceField("multi", {"A": PexTestConfig}, multi=True)
+
+
 class HistoryTest(unittest.TestCase):
     def testHistory(self):
         b = PexTestConfig()
@@ -73,5 +83,122 @@ class HistoryTest(unittest.TestCase):
     b.update(a=4.0)""", output)
 
 
+class HistoryLimitTest(unittest.TestCase):
+    def mutate(self, config):
+        config.f = 2.0
+        config.ll.append(2)
+        config.ll[0] = 3
+        config.d["b"] = 2
+        del config.d["a"]
+        config.c.a = 5.0
+        config.cd["x"] = PexTestConfig
+        del config.cd["x"]
+        config.r = "A"
+        config.m.names = ["A"]
+        config.m.names.discard("A")
+
+    def testOff(self):
+        with pexConfigHistory.historyLimit("off"):
+            self.assertEqual(pexConfigHistory.getHistoryLimit(), 0)
+            config = ContainerConfig()
+            self.mutate(config)
+            self.assertEqual(config.f, 2.0)
+            self.assertEqual(list(config.ll), [3, 2])
+            self.assertEqual(dict(config.d), {"b": 2})
+            self.assertEqual(config.c.a, 5.0)
+            for name in config:
+                self.assertEqual(config.history[name], [], name)
+            self.assertEqual(config.c.history["a"], [])
+            pexConfigHistory.Color.colorize(False)
+            self.assertEqual(config.formatHistory("f"), "f")
+        self.assertIsNone(pexConfigHistory.getHistoryLimit())
+
+        # History is recorded again once the context manager exits
+        config.f = 3.0
+        self.assertEqual([h[0] for h in config.history["f"]], [3.0])
+
+    def testUnknownName(self):
+        with pexConfigHistory.historyLimit("off"):
+            config = ContainerConfig()
+        self.assertEqual(config.history["f"], [])
+        for c in (config, config.copy()):
+            with self.assertRaises(KeyError):
+                c.history["bogus"]
+            self.assertNotIn("bogus", c.history)
+
+    def testLast(self):
+        with pexConfigHistory.historyLimit(2):
+            config = ContainerConfig()
+            self.mutate(config)
+            for i in range(5):
+                config.f = float(i)
+            self.assertEqual([h[0] for h in config.history["f"]], [3.0, 4.0])
+            self.assertEqual([h[0] for h in config.history["ll"]], [[1, 2], [3, 2]])
+            for name in config:
+                self.assertLessEqual(len(config.history[name]), 2)
+
+    def testContainerChanges(self):
+        """Test that changes to lists and dicts are recorded compactly and
+        replayed when the history is read.
+        """
+        config = ContainerConfig()
+        config.ll.append(2)
+        config.ll[0:1] = (5, 6)
+        del config.ll[-1]
+        config.d["b"] = 2
+        del config.d["a"]
+        values = [h[0] for h in config.history["ll"]]
+        self.assertEqual(values, [[1], [1, 2], [5, 6, 2], [5, 6]])
+        self.assertEqual([h[0] for h in config.ll.history], values)
+        self.assertEqual([h[0] for h in config.history["d"]], [{"a": 1}, {"a": 1, "b": 2}, {"b": 2}])
+        # only the first event holds a copy of the container
+        raw = config._history["ll"]
+        self.assertEqual([type(h[0]) for h in raw[1:]], [pexConfig.config._HistoryDelta]*3)
+        # replayed values are copies
+        config.history["ll"][-1][0].append(7)
+        self.assertEqual(config.history["ll"][-1][0], [5, 6])
+        self.assertIn("[5, 6, 2]", config.formatHistory("ll", writeSourceLine=False))
+
+        # changes to a list that no longer is the field's value, or that
+        # were not recorded, are followed by a copy of the whole list
+        old = config.ll
+        config.ll = [3]
+        old.append(4)
+        self.assertEqual(config.history["ll"][-1][0], [5, 6, 4])
+        with pexConfigHistory.historyLimit("off"):
+            config.ll.append(8)
+        config.ll.append(9)
+        self.assertEqual(config.history["ll"][-1][0], [3, 8, 9])
+
+        copy = config.copy()
+        copy.d["c"] = 3
+        self.assertEqual(copy.history["d"][-1][0], {"b": 2, "c": 3})
+        self.assertEqual(config.history["d"][-1][0], {"b": 2})
+
+        with pexConfigHistory.historyLimit(2):
+            config = ContainerConfig()
+            for i in range(5):
+                config.ll.append(i)
+            self.assertEqual([h[0] for h in config.history["ll"]], [[1, 0, 1, 2, 3], [1, 0, 1, 2, 3, 4]])
+            self.assertNotIsInstance(config._history["ll"][0][0], pexConfig.config._HistoryDelta)
+
+    def testPerClass(self):
+        with pexConfigHistory.historyLimit(0, PexTestConfig):
+            self.assertEqual(pexConfigHistory.getHistoryLimit(PexTestConfig), 0)
+            self.assertIsNone(pexConfigHistory.getHistoryLimit(ContainerConfig))
+            config = ContainerConfig()
+            config.c.a = 3.0
+            config.f = 3.0
+            self.assertEqual(config.c.history["a"], [])
+            self.assertEqual([h[0] for h in config.history["f"]], [1.0, 3.0])
+        self.assertIsNone(pexConfigHistory.getHistoryLimit(PexTestConfig))
+
+    def testInvalid(self):
+        for limit in (-1, "sometimes", 1.5):
+            with self.assertRaises(ValueError):
+                pexConfigHistory.setHistoryLimit(limit)
+        self.assertIsNone(pexConfigHistory.getHistoryLimit())
+
+
 if __name__ == "__main__":
     unittest.main()
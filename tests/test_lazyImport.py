@@ -0,0 +1,60 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import subprocess
+import sys
+import unittest
+
+import lsst.pex.config as pexConfig
+
+
+class LazyImportTestCase(unittest.TestCase):
+    """Test that expensive dependencies are only imported when used."""
+
+    def loadedModules(self, code):
+        """Run ``code`` in a fresh interpreter after importing
+        `lsst.pex.config` and return which heavy modules it loaded.
+        """
+        script = ("import sys\nimport lsst.pex.config as pexConfig\n%s\n"
+                  "print(' '.join(m for m in ('numpy', 'deprecated', 'lsst.pex.config.convert') "
+                  "if m in sys.modules))" % code)
+        result = subprocess.run([sys.executable, "-c", script], check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True)
+        return set(result.stdout.split())
+
+    def testImport(self):
+        self.assertEqual(self.loadedModules(""), set())
+
+    def testFirstUse(self):
+        self.assertIn("lsst.pex.config.convert", self.loadedModules("pexConfig.makePropertySet"))
+        self.assertIn("numpy", self.loadedModules("pexConfig.compareScalars('x', [1.0], [1.0], None, "
+                                                  "dtype=float)"))
+
+    def testAttributes(self):
+        self.assertIs(pexConfig.makePropertySet, pexConfig.convert.makePropertySet)
+        self.assertIn("makePolicy", dir(pexConfig))
+        self.assertIn("makePolicy", pexConfig.__all__)
+        with self.assertRaises(AttributeError):
+            pexConfig.notAnAttribute
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -133,6 +133,37 @@ class ListFieldTest(unittest.TestCase):
         c.l1.extend([4, 5, 6])
         self.assertEqual(c.l1, [1, 2, 20, 10, 30, 4, 5, 6])
 
+    def testBulkModification(self):
+        c = Config2()
+        nHistory = len(c.lf.history)
+        c.lf.extend(range(4, 100))
+        self.assertEqual(c.lf, [float(i) for i in range(1, 100)])
+        self.assertEqual(len(c.lf.history), nHistory + 1)
+        self.assertEqual(c.lf.history[-1][0], c.lf)
+
+        c.lf += [100]
+        self.assertEqual(len(c.lf), 100)
+        self.assertEqual(len(c.lf.history), nHistory + 2)
+        self.assertEqual(len(c.history["lf"]), len(c.lf.history))
+
+        # A bad item rejects the whole extension
+        self.assertRaises(pexConfig.FieldValidationError, c.lf.extend, [1.0, "bad"])
+        self.assertEqual(len(c.lf), 100)
+
+        # plain self-assignment is still recorded
+        c.lf = c.lf
+        self.assertEqual(len(c.lf.history), nHistory + 3)
+        self.assertEqual(c.history["lf"][-1][2], "assignment")
+        self.assertEqual(len(c.lf), 100)
+
+        c.lf.clear()
+        self.assertEqual(c.lf, [])
+        self.assertEqual(c.lf.history[-1][0], [])
+
+        c.freeze()
+        self.assertRaises(pexConfig.FieldValidationError, c.lf.extend, [1.0])
+        self.assertRaises(pexConfig.FieldValidationError, c.lf.clear)
+
     def testCastAndTypes(self):
         c = Config2()
         self.assertEqual(c.lf, [1., 2., 3.])
@@ -0,0 +1,138 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import array
+import io
+import math
+import unittest
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.numericListField import NumericList
+
+
+class NumericConfig(pexConfig.Config):
+    lf = pexConfig.NumericListField("lf", float, default=[1, 2, 3])
+    li = pexConfig.NumericListField("li", int, default=[1, 2, 3], itemCheck=lambda x: x > 0,
+                                    itemsCheck=lambda x: sum(x) < 100, maxLength=5)
+    ln = pexConfig.NumericListField("ln", float, default=None, optional=True)
+
+
+class NumericListFieldTest(unittest.TestCase):
+    def setUp(self):
+        self.config = NumericConfig()
+
+    def testConstructor(self):
+        with self.assertRaises(ValueError):
+            pexConfig.NumericListField("bad", str)
+        with self.assertRaises(ValueError):
+            pexConfig.NumericListField("bad", float, itemsCheck=1)
+        self.assertEqual(NumericConfig.lf.source.filename, __file__)
+
+    def testStorage(self):
+        self.assertIsInstance(self.config.lf, NumericList)
+        self.assertIsInstance(self.config.lf._list, array.array)
+        self.assertEqual(self.config.lf, [1.0, 2.0, 3.0])
+        self.assertIsInstance(self.config.lf[0], float)
+        self.assertEqual(self.config.lf[1:], [2.0, 3.0])
+        self.assertEqual(self.config.lf.list(), [1.0, 2.0, 3.0])
+        self.assertEqual(repr(self.config.li), "[1, 2, 3]")
+        self.assertIsNone(self.config.ln)
+
+        view = self.config.lf.buffer()
+        self.assertTrue(view.readonly)
+        self.assertEqual(view.tolist(), [1.0, 2.0, 3.0])
+        view.release()
+
+    def testModify(self):
+        self.config.lf[0] = 5
+        self.config.lf.append(6.5)
+        self.config.lf[1:3] = [7, 8, 9]
+        del self.config.lf[-1]
+        self.assertEqual(self.config.lf, [5.0, 7.0, 8.0, 9.0])
+        self.assertIn(7.0, self.config.lf)
+
+        self.config.li = range(1, 5)
+        self.assertEqual(self.config.li, [1, 2, 3, 4])
+        self.config.ln = [float("nan"), 1.0]
+        self.assertTrue(math.isnan(self.config.ln[0]))
+
+        self.config.freeze()
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.config.lf[0] = 1.0
+
+    def testValidation(self):
+        for value in (["a"], [1.5], [None], "abc", b"abcdefgh", 3, [-1], [2**70], [50, 50]):
+            with self.assertRaises(pexConfig.FieldValidationError, msg=repr(value)):
+                self.config.li = value
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.config.li.append(0)
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.config.li[0] = 1.0
+        self.assertEqual(self.config.li, [1, 2, 3])
+
+        self.config.li = [1, 2, 3, 4, 5, 6]
+        with self.assertRaises(pexConfig.FieldValidationError):
+            self.config.validate()
+
+    def testSaveAndCompare(self):
+        self.config.lf = [0.5, 1.5]
+        self.config.li = [4, 5]
+        stream = io.StringIO()
+        self.config.saveToStream(stream)
+        roundtrip = NumericConfig()
+        roundtrip.loadFromStream(stream.getvalue())
+        self.assertEqual(roundtrip, self.config)
+        self.assertEqual(roundtrip.toDict()["lf"], [0.5, 1.5])
+
+        stream = io.StringIO()
+        self.config.saveStructuredToStream(stream)
+        roundtrip = NumericConfig()
+        roundtrip.loadStructuredFromStream(stream.getvalue())
+        self.assertEqual(roundtrip, self.config)
+
+        roundtrip.lf[0] += 1e-12
+        self.assertNotEqual(roundtrip.lf, self.config.lf)
+        self.assertTrue(pexConfig.compareConfigs("test", roundtrip, self.config))
+        roundtrip.lf[0] = 2.0
+        self.assertFalse(pexConfig.compareConfigs("test", roundtrip, self.config))
+
+        copy = self.config.copy()
+        copy.lf.append(1.0)
+        self.assertEqual(self.config.lf, [0.5, 1.5])
+
+    def testHistory(self):
+        self.config.lf.append(4.0)
+        self.assertEqual(self.config.history["lf"][-1][0], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(NumericConfig().lf, [1.0, 2.0, 3.0])
+
+    def testSelfAssignment(self):
+        nHistory = len(self.config.lf.history)
+        self.config.lf += [4.0]
+        self.assertEqual(len(self.config.lf.history), nHistory + 1)
+        # plain self-assignment is still recorded
+        self.config.lf = self.config.lf
+        self.assertEqual(len(self.config.lf.history), nHistory + 2)
+        self.assertEqual(self.config.history["lf"][-1][2], "assignment")
+        self.assertEqual(self.config.lf, [1.0, 2.0, 3.0, 4.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
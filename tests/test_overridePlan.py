@@ -0,0 +1,227 @@
+# This file is part of pex_config.
+#
+# Developed for the LSST Data Management System.
+# This product includes software developed by the LSST Project
+# (http://www.lsst.org).
+# See the COPYRIGHT file at the top-level directory of this distribution
+# for details of code ownership.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import tempfile
+import traceback
+import unittest
+
+import lsst.pex.config as pexConfig
+from lsst.pex.config.overridePlan import OverridePlan
+
+
+class SubConfig(pexConfig.Config):
+    i = pexConfig.Field("integer", int, default=1)
+
+
+registry = pexConfig.makeRegistry("registry for override plan tests")
+
+
+@pexConfig.registerConfigurable("a", registry)
+class TargetA:
+    ConfigClass = SubConfig
+
+    def __init__(self, config):
+        self.config = config
+
+
+@pexConfig.registerConfigurable("b", registry)
+class TargetB(TargetA):
+    pass
+
+
+class PlanConfig(pexConfig.Config):
+    i = pexConfig.Field("integer", int, default=1)
+    f = pexConfig.Field("float", float, default=1.0)
+    s = pexConfig.Field("string", str, default="a")
+    c = pexConfig.Field("complex", complex, default=1j)
+    l = pexConfig.ListField("list", int, default=[1, 2])  # noqa: E741
+    d = pexConfig.DictField("dict", keytype=str, itemtype=float, default={"a": 1.0})
+    sub = pexConfig.ConfigField("subconfig", SubConfig)
+    choice = pexConfig.ConfigChoiceField("choice", {"x": SubConfig, "y": SubConfig}, default="x")
+    reg = registry.makeField("registry", default="a")
+
+
+OVERRIDES = """\"\"\"Overrides.\"\"\"
+import lsst.pex.config
+from lsst.pex.config import Field as F
+config.i = 5
+config.f = -2.5e3
+config.s = F.__name__
+config.c = 1 - 2j
+config.l = [3, 4, 5]
+config.l[0] = 1
+config.l.extend((6, 7))
+config.d = {"b": 2.0, "c": float("1.5")}
+config.d["a"] = abs(-3.0)
+config.sub.i = len(config.l)
+config.choice.name = "y"
+config.choice["y"].i = lsst.pex.config.Config.__name__.count("C")
+"""
+
+
+class OverridePlanTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dir.name, "override.py")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def writeOverride(self, text):
+        with open(self.filename, "w") as f:
+            f.write(text)
+
+    def testApply(self):
+        """Test that a plan gives the same config and history as executing the
+        file.
+        """
+        plan = OverridePlan.fromSource(OVERRIDES)
+        # literal assignments are applied, other statements are executed
+        self.assertEqual([(step[0], step[1]) for step in plan.steps],
+                         [("exec", 1), ("set", 4), ("set", 5), ("exec", 6), ("set", 7), ("set", 8),
+                          ("set", 9), ("exec", 10), ("set", 14), ("exec", 15)])
+        self.assertTrue(plan.canApply("config"))
+        self.assertFalse(plan.canApply("root"))
+
+        applied = PlanConfig()
+        applied.loadFromStream(OVERRIDES)
+        executed = PlanConfig()
+        executed.loadFromStream(plan.code)
+        self.assertEqual(applied.toDict(), executed.toDict())
+        self.assertEqual(applied.s, "Field")
+        self.assertEqual(applied.l, [1, 4, 5, 6, 7])
+        self.assertEqual(applied.sub.i, 5)
+        self.assertEqual(applied.choice["y"].i, 1)
+
+        self.writeOverride(OVERRIDES)
+        loaded = PlanConfig()
+        loaded.load(self.filename)
+        self.assertEqual(loaded.toDict(), executed.toDict())
+        for name, lineno in (("i", 4), ("l", 10), ("d", 12)):
+            frame = loaded.history[name][-1][1][-1]
+            self.assertEqual((frame.filename, frame.lineno, frame.function),
+                             (self.filename, lineno, "<module>"))
+        self.assertEqual(loaded.history["i"][-1][1][-1].content, "config.i = 5")
+        self.assertEqual(len(loaded.history["l"]), len(executed.history["l"]))
+
+    def testSelectionHistory(self):
+        """Test that the history of selections points to the override file.
+        """
+        text = "config.i = 2\nconfig.choice.name = 'y'\nconfig.reg.name = 'b'\n"
+        self.assertEqual([step[0] for step in OverridePlan.fromSource(text).steps], ["set"] * 3)
+        self.writeOverride(text)
+        config = PlanConfig()
+        config.load(self.filename)
+        self.assertEqual(config.reg.name, "b")
+        for name, lineno in (("choice", 2), ("reg", 3)):
+            value, at, label = config.history[name][-1]
+            self.assertEqual((at[-1].filename, at[-1].lineno), (self.filename, lineno))
+
+    def testErrorLocation(self):
+        """Test that errors give the line of the override file.
+        """
+        for text, error in (("import os\nconfig.i = 2\nconfig.i = 'bad'\n", pexConfig.FieldValidationError),
+                            ("config.i = 2\nimport os\nconfig.f = float('bad')\n", ValueError)):
+            self.writeOverride(text)
+            try:
+                PlanConfig().load(self.filename)
+            except error as e:
+                message = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+                message += "".join(getattr(e, "__notes__", []))
+            else:
+                self.fail("%s not raised" % error.__name__)
+            self.assertIn('File "%s", line 3' % self.filename, message)
+
+    def testRebinding(self):
+        """Test that literal assignments follow rebinding of the root
+        variable by executed statements.
+        """
+        text = "config = config.sub\nconfig.i = 5\n"
+        plan = OverridePlan.fromSource(text)
+        self.assertEqual([step[0] for step in plan.steps], ["exec", "set"])
+        config = PlanConfig()
+        config.loadFromStream(text)
+        self.assertEqual(config.sub.i, 5)
+        self.assertEqual(config.i, 1)
+        self.assertRaises(NameError, PlanConfig().loadFromStream, "del config\nconfig.i = 5\n")
+
+    def testFallback(self):
+        """Test that files without literal assignments are executed.
+        """
+        for text in ("for i in range(3):\n    config.i = i\n",
+                     "x = 2\nconfig.i = x\n",
+                     "config.i += 2\n",
+                     "config.l = [1, 2, 3][1:]\n",
+                     "config.l = [i for i in range(3)]\n"):
+            plan = OverridePlan.fromSource(text)
+            self.assertIsNone(plan.steps, text)
+            config = PlanConfig()
+            config.loadFromStream(text)
+            self.assertNotEqual(config.toDict(), PlanConfig().toDict(), text)
+
+        plan = OverridePlan.fromSource("config.i = undefined\n")
+        self.assertEqual(plan.names, {"config", "undefined"})
+        self.assertFalse(plan.canApply("config"))
+        self.assertRaises(NameError, PlanConfig().loadFromStream, "config.i = undefined\n")
+
+        # old files using "root" are still loaded
+        config = PlanConfig()
+        config.loadFromStream("root.i = 3\n")
+        self.assertEqual(config.i, 3)
+        config.loadFromStream("root.i = 4\n", root="root")
+        self.assertEqual(config.i, 4)
+
+    def testSaved(self):
+        """Test that saved configs are loaded from a plan.
+        """
+        config = PlanConfig()
+        config.loadFromStream(OVERRIDES)
+        for compact in (False, True):
+            config.save(self.filename, compact=compact)
+            cache = pexConfig.CodeCache()
+            self.assertTrue(cache.getPlan(self.filename).canApply("config"))
+            loaded = PlanConfig()
+            loaded.load(self.filename)
+            self.assertEqual(loaded.toDict(), config.toDict())
+        with self.assertRaisesRegex(AssertionError, "config is of type .*SubConfig instead of"):
+            SubConfig().load(self.filename)
+
+    def testDisk(self):
+        """Test that plans are shared through the on-disk code cache.
+        """
+        self.writeOverride(OVERRIDES)
+        directory = os.path.join(self.dir.name, "cache")
+        first = pexConfig.CodeCache(directory).getPlan(self.filename)
+        second = pexConfig.CodeCache(directory)
+        plan = second.getPlan(self.filename)
+        self.assertEqual(second.diskHits, 1)
+        self.assertEqual(plan.steps, first.steps)
+        self.assertEqual(plan.names, first.names)
+        self.assertEqual(plan.code.co_filename, self.filename)
+
+        config = PlanConfig()
+        config.loadFromStream(plan)
+        self.assertEqual(config.l, [1, 4, 5, 6, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()
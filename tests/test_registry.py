@@ -19,7 +19,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
+import os
+import sys
+import tempfile
+import textwrap
 import unittest
+import unittest.mock
 import lsst.pex.config as pexConfig
 
 
@@ -122,6 +128,139 @@ class ConfigTest(unittest.TestCase):
         c.r = "foo2"
         c.r.apply()
 
+    def testFreezeSnapshot(self):
+        """Test that frozen configs use a read-only snapshot of the registry
+        that is only taken once.
+        """
+        class C1(pexConfig.Config):
+            r = self.registry.makeField("registry field", default="foo1")
+
+        snapshot = self.registry.snapshot()
+        self.assertIs(self.registry.snapshot(), snapshot)
+        self.assertEqual(set(snapshot), set(self.registry))
+        self.assertIs(snapshot.snapshot(), snapshot)
+        with self.assertRaises(RuntimeError):
+            snapshot.register("foo3", self.fooAlg1Class)
+
+        C1().freeze()
+        typemap = C1.r.typemap
+        self.assertIs(typemap.registry, snapshot)
+        C1().freeze()
+        self.assertIs(C1.r.typemap, typemap)
+
+        # later registrations do not affect the frozen configs
+        self.registry.register("foo3", self.fooAlg1Class)
+        self.assertIsNot(self.registry.snapshot(), snapshot)
+        self.assertNotIn("foo3", C1.r.typemap)
+        self.assertNotIn("foo3", snapshot)
+
+        class C2(pexConfig.Config):
+            c = pexConfig.ConfigChoiceField("choice field", typemap={"foo1": self.fooConfig1Class},
+                                            default="foo1")
+
+        C2().freeze()
+        typemap = C2.c.typemap
+        C2().freeze()
+        self.assertIs(C2.c.typemap, typemap)
+        self.assertEqual(dict(typemap), {"foo1": self.fooConfig1Class})
+
+    def testVersionAndIndex(self):
+        """Test that the version, the snapshot and the indices follow
+        registrations.
+        """
+        self.assertEqual(self.registry.version, 3)
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot.version, 3)
+        self.assertEqual(self.registry.getNamesByTarget(self.fooAlg1Class), ("foo1",))
+        self.assertEqual(self.registry.getNamesByTarget(self.fooAlg2Class), ("foo2", "foo21"))
+        self.assertEqual(self.registry.getNamesByConfigClass(self.fooConfig1Class), ("foo1", "foo21"))
+        self.assertEqual(self.registry.getNamesByConfigClass(self.config1Class), ())
+
+        self.registry.register("foo3", self.fooAlg1Class, self.fooConfig2Class)
+        self.assertEqual(self.registry.version, 4)
+        self.assertEqual(self.registry.snapshot().version, 4)
+        self.assertEqual(self.registry.getNamesByTarget(self.fooAlg1Class), ("foo1", "foo3"))
+        self.assertEqual(self.registry.getNamesByConfigClass(self.fooConfig2Class), ("foo2", "foo3"))
+        self.assertEqual(snapshot.version, 3)
+        self.assertEqual(snapshot.getNamesByTarget(self.fooAlg1Class), ("foo1",))
+
+        with self.assertRaises(RuntimeError):
+            self.registry.register("foo3", self.fooAlg1Class)
+        self.assertEqual(self.registry.version, 4)
+
+    def testDeferredImport(self):
+        """Test that targets registered by name are only imported when they
+        are looked up.
+        """
+        with tempfile.TemporaryDirectory() as tempDir:
+            with open(os.path.join(tempDir, "deferredPlugin.py"), "w") as f:
+                f.write(textwrap.dedent("""
+                    import lsst.pex.config as pexConfig
+
+                    class PluginConfig(pexConfig.Config):
+                        f = pexConfig.Field("f", int, default=3)
+
+                    class Plugin:
+                        ConfigClass = PluginConfig
+
+                        def __init__(self, config):
+                            self.config = config
+                    """))
+            with open(os.path.join(tempDir, "deferredBroken.py"), "w") as f:
+                f.write("import deferredMissingDependency\n")
+            sys.path.insert(0, tempDir)
+            try:
+                registry = pexConfig.makeRegistry("deferred registry")
+                registry.register("eager", self.fooAlg1Class)
+                registry.register("lazy", "deferredPlugin.Plugin")
+                registry.register("wrapped", self.fooAlg1Class, "deferredPlugin.PluginConfig")
+                registry.register("missing", "deferredPlugin.Missing")
+                registry.register("broken", "deferredBroken.Plugin")
+
+                class C1(pexConfig.Config):
+                    r = registry.makeField("registry field", default="eager")
+
+                c = C1()
+                c.saveToStream(io.StringIO())
+                self.assertEqual(set(c.r), {"eager", "lazy", "wrapped", "missing", "broken"})
+                # reverse lookups do not import targets registered by name
+                self.assertEqual(registry.getNamesByTarget(self.fooAlg1Class), ("eager", "wrapped"))
+                self.assertEqual(registry.getNamesByConfigClass(self.fooConfig1Class), ("eager",))
+                self.assertNotIn("deferredPlugin", sys.modules)
+                # nor check them again until more modules are imported
+                with unittest.mock.patch.object(registry, "_resolveImported", side_effect=AssertionError):
+                    self.assertEqual(registry.getNamesByTarget(self.fooAlg1Class), ("eager", "wrapped"))
+
+                c.r = "lazy"
+                self.assertIn("deferredPlugin", sys.modules)
+                self.assertEqual(c.r.active.f, 3)
+                self.assertEqual(c.r.apply().config.f, 3)
+                self.assertIs(registry["wrapped"].ConfigClass, type(c.r.active))
+                # but find them once their modules are imported
+                import deferredPlugin
+                self.assertEqual(registry.getNamesByTarget(deferredPlugin.Plugin), ("lazy",))
+                self.assertEqual(registry.getNamesByConfigClass(deferredPlugin.PluginConfig),
+                                 ("lazy", "wrapped"))
+                registry.register("lazy2", "deferredPlugin.Plugin")
+                self.assertEqual(registry.getNamesByTarget(deferredPlugin.Plugin), ("lazy", "lazy2"))
+                self.assertNotIn("deferredBroken", sys.modules)
+                self.assertEqual(registry["wrapped"]._target, self.fooAlg1Class)
+                with self.assertRaises(ImportError):
+                    c.r = "missing"
+                # the error from a missing dependency of the plugin is kept
+                with self.assertRaises(ModuleNotFoundError) as cm:
+                    c.r = "broken"
+                self.assertEqual(cm.exception.name, "deferredMissingDependency")
+            finally:
+                sys.path.remove(tempDir)
+                sys.modules.pop("deferredPlugin", None)
+                sys.modules.pop("deferredBroken", None)
+
+        registry = pexConfig.makeRegistry("deferred registry", configBaseType=self.fooConfig1Class)
+        registry.register("bad", self.fooAlg2Class, "lsst.pex.config.Config")
+        with self.assertRaises(TypeError):
+            registry["bad"]
+
     def testExceptions(self):
         class C1(pexConfig.Config):
             r = self.registry.makeField("registry field", multi=True, default=[])